@@ -13,4 +13,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
+# ✅ Production isi se chalta hai (run_backend.sh: uvicorn backend.asgi:application).
+# Order tracking ka SSE stream (orders/views.py) async hai: har khula tracking page sirf
+# ek coroutine hai, WSGI ki tarah poora worker thread nahi.
 application = get_asgi_application()
+
+# ✅ Typeahead index (shop/suggest.py) worker start hote hi background me banna shuru,
+# pehli /suggest request ko build ka intezaar nahi
+from shop.suggest import suggest_index  # noqa: E402 (apps load hone ke baad)
+
+suggest_index.start()
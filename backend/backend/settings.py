@@ -2,6 +2,7 @@ import os
 import environ
 from pathlib import Path
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 # 1. Initialize Environment Variables
 env = environ.Env(DEBUG=(bool, False))
@@ -22,6 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # ✅ Full-text / trigram search ke liye
     
     # Third Party Apps
     'rest_framework',
@@ -40,7 +42,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # ✅ Async-capable WhiteNoise: poora stack ASGI par async rahe (SSE views thread nahi pakadte)
+    'backend.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -87,6 +90,11 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# ✅ Public media host (CDN ya origin), production me env se (e.g. https://www.nandanicollection.com).
+# Khali ho to relative URLs (/media/...) - local/staging production ka domain nahi dikhate (shop/media.py)
+MEDIA_BASE_URL = env('MEDIA_BASE_URL', default='')
+# Upload ke baad WebP/AVIF renditions banane wale background processes (shop/images.py)
+IMAGE_RENDITION_WORKERS = env.int('IMAGE_RENDITION_WORKERS', default=2)
 
 # 6. CORS & Other Settings
 CORS_ALLOW_ALL_ORIGINS = True
@@ -109,6 +117,22 @@ NINJA_JWT = {
 # 8. SOCIAL AUTH KEYS (इनको अपनी .env फाइल में डालना होगा)
 GOOGLE_CLIENT_ID = env('GOOGLE_CLIENT_ID', default='')
 WHATSAPP_API_KEY = env('WHATSAPP_API_KEY', default='')
+# Warehouse / marketplace stock sync ke keys (comma separated), header: X-API-Key (shop/inventory.py)
+INVENTORY_API_KEYS = env.list('INVENTORY_API_KEYS', default=[])
+# Online payment (UPI/card) wale pending order ka stock itne minute hold rehta hai (orders/reservations.py)
+STOCK_HOLD_MINUTES = env.int('STOCK_HOLD_MINUTES', default=30)
+# Next.js payment status route -> /orders/{id}/payment-confirmed, header: X-Payment-Secret
+PAYMENT_CONFIRM_SECRET = env('PAYMENT_CONFIRM_SECRET', default='')
+# UPI/card checkout. Band ho to sirf COD chalta hai (orders/api.py)
+ONLINE_PAYMENTS_ENABLED = env.bool('ONLINE_PAYMENTS_ENABLED', default=True)
+# PhonePe keys: hold expire hone par sweeper cancel se pehle PhonePe se payment status poochta hai (orders/phonepe.py)
+PHONEPE_CLIENT_ID = env('PHONEPE_CLIENT_ID', default='')
+PHONEPE_CLIENT_SECRET = env('PHONEPE_CLIENT_SECRET', default='')
+PHONEPE_CLIENT_VERSION = env('PHONEPE_CLIENT_VERSION', default='1')
+# ✅ Secret/keys na hon to startup nahi rukta: UPI/card checkout request par hi 400 (orders/phonepe.py
+# online_payments_ready), aur `manage.py check` warning deta hai (orders/checks.py)
+# Checkout Idempotency-Key ka stored response itne ghante rakhte hain (purge_idempotency_keys)
+IDEMPOTENCY_KEY_TTL_HOURS = env.int('IDEMPOTENCY_KEY_TTL_HOURS', default=24)
 
 CORS_ALLOWED_ORIGINS = [
     "https://nandanicollection.com",
@@ -122,4 +146,6 @@ CSRF_TRUSTED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+# ✅ Checkout retry/double-tap ke liye Idempotency-Key header (orders/idempotency.py)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 APPEND_SLASH = True
\ No newline at end of file
@@ -5,9 +5,12 @@ from django.conf.urls.static import static
 
 # ✅ IMPORT FIX: Relative import ('.') ki jagah pura naam likha hai taaki error na aaye
 from backend.api_main import api 
+from orders.views import order_events
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # ✅ Live order status (SSE) - api include se pehle, ASGI par chalta hai (backend/asgi.py)
+    path('api/orders/<int:order_id>/events', order_events),
     path('api/', api.urls), # ✅ Ab ye API chalegi
     path('nested_admin/', include('nested_admin.urls')), # ✅ Ye line DELETE NAHI KI HAI
 ]
@@ -1,11 +1,24 @@
-from django.contrib import admin
-from .models import Order, OrderItem
+from django.contrib import admin, messages
+from .models import Order, OrderItem, StockReservation
+from .reservations import HoldUnavailable
+from .transitions import bulk_transition
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
     extra = 0
     readonly_fields = ('product_name', 'price', 'quantity', 'size', 'color')
 
+# ✅ Online payment pending hai tab tak ke stock holds (sirf dekhne ke liye)
+class StockReservationInline(admin.TabularInline):
+    model = StockReservation
+    extra = 0
+    can_delete = False
+    readonly_fields = ('size_variant', 'quantity', 'expires_at')
+    fields = readonly_fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     # ✅ Invoice number aur location bhi add kar di hai
@@ -13,8 +26,10 @@ class OrderAdmin(admin.ModelAdmin):
     list_filter = ('status', 'payment_method', 'created_at')
     # Invoice no se bhi search kar payenge ab
     search_fields = ('invoice_no', 'full_name', 'phone_number', 'id')
-    inlines = [OrderItemInline]
+    inlines = [OrderItemInline, StockReservationInline]
+    # Row-wise edit bhi state machine se validate hota hai (Order.clean), bahut orders ke liye actions
     list_editable = ('status',)
+    actions = ('mark_confirmed', 'mark_shipped', 'mark_delivered', 'mark_returned', 'mark_cancelled')
 
     # Status badalte waqt asani ho isliye transitions
     fieldsets = (
@@ -23,4 +38,42 @@ class OrderAdmin(admin.ModelAdmin):
         ("Payment Info", {'fields': ('total_amount', 'discount_amount', 'payment_method', 'applied_coupon')}),
         ("Dates", {'fields': ('created_at',)}),
     )
-    readonly_fields = ('created_at', 'invoice_no')
\ No newline at end of file
+    readonly_fields = ('created_at', 'invoice_no')
+
+    # --- BULK STATUS ACTIONS (orders/transitions.py) ---
+    # ✅ Chune hue orders EK UPDATE me, restock/holds/events poore batch ke liye ek saath.
+    # Jinka transition legal nahi (e.g. delivered -> cancelled) wo chhod diye jaate hain.
+    def _bulk_transition(self, request, queryset, status):
+        ids = list(queryset.values_list('id', flat=True))
+        try:
+            changed = bulk_transition(ids, status)
+        except HoldUnavailable as e:
+            # Poora action rollback: jin orders ka hold expire hokar stock bik gaya unhe alag se cancel karo
+            self.message_user(request, str(e), messages.ERROR)
+            return
+        label = dict(Order.STATUS_CHOICES)[status]
+        self.message_user(request, f"✅ {len(changed)} orders '{label}' ho gaye.", messages.SUCCESS)
+        if len(changed) < len(ids):
+            self.message_user(
+                request, f"{len(ids) - len(changed)} orders skip hue (is status me nahi ja sakte).", messages.WARNING,
+            )
+
+    @admin.action(description="Mark selected orders as Confirmed")
+    def mark_confirmed(self, request, queryset):
+        self._bulk_transition(request, queryset, 'confirmed')
+
+    @admin.action(description="Mark selected orders as Shipped")
+    def mark_shipped(self, request, queryset):
+        self._bulk_transition(request, queryset, 'shipped')
+
+    @admin.action(description="Mark selected orders as Delivered")
+    def mark_delivered(self, request, queryset):
+        self._bulk_transition(request, queryset, 'delivered')
+
+    @admin.action(description="Mark selected orders as Returned & Refunded (restock)")
+    def mark_returned(self, request, queryset):
+        self._bulk_transition(request, queryset, 'returned')
+
+    @admin.action(description="Cancel selected orders (restock / release holds)")
+    def mark_cancelled(self, request, queryset):
+        self._bulk_transition(request, queryset, 'cancelled')
@@ -1,14 +1,24 @@
 from ninja import Router, Schema
 from typing import List, Optional
-from .schemas import OrderCreateSchema, OrderOutSchema 
+from .schemas import (
+    OrderCreateSchema, OrderOutSchema, OrderPageSchema, OrderSummaryPageSchema, QuoteRequestSchema, QuoteSchema,
+)
 from .models import Order, OrderItem
-from shop.models import SizeVariant
-from coupons.models import Coupon # ✅ Coupon model import kiya
+from shop.pagination import paginate_keyset, clamp_page_size, InvalidCursor
+from .checkout import CheckoutError, reserve_stock, create_order_items
+from .pricing import checkout_pricing, from_paise, price_cart, use_coupon
+from .phonepe import online_payments_ready
+from .reservations import ONLINE_PAYMENT_METHODS
+from .invoices import next_invoice_no
+from .transitions import confirm_payment
+from .events import EVENTS_TOKEN_TTL_SECONDS, events_token
+from .idempotency import MAX_KEY_LENGTH, IdempotencyConflict, claim_key, request_hash, save_response
 from django.db import transaction, models
 from django.contrib.auth import get_user_model
 from ninja_jwt.authentication import JWTAuth 
-from decimal import Decimal
-import datetime # ✅ Invoice no generate karne ke liye
+from ninja.security import APIKeyHeader
+from django.conf import settings
+import hmac
 
 User = get_user_model()
 router = Router()
@@ -18,49 +28,61 @@ class MessageSchema(Schema):
     success: bool
     message: str
 
+# ✅ Payment confirm sirf hamara Next.js server kar sakta hai (header: X-Payment-Secret)
+class PaymentSecretAuth(APIKeyHeader):
+    param_name = "X-Payment-Secret"
+
+    def authenticate(self, request, key):
+        secret = settings.PAYMENT_CONFIRM_SECRET
+        if secret and key and hmac.compare_digest(key.encode(), secret.encode()):
+            return True
+        return None
+
+# --- 0. POST: Checkout Quote (poora cart server par price, ek request) ---
+@router.post("/quote", response={200: QuoteSchema, 400: MessageSchema})
+def checkout_quote(request, data: QuoteRequestSchema):
+    # ✅ Line prices, stock, coupon aur shipping ek saath (paise me) + signed quote jo create_order leta hai
+    try:
+        return 200, price_cart(data.items, coupon_code=data.coupon_code)
+    except CheckoutError as e:
+        return 400, {"success": False, "message": str(e)}
+
 # --- 1. POST: Create Order (Guest & Login dono ke liye) ---
-@router.post("/create", response={200: dict, 400: MessageSchema, 404: MessageSchema})
+@router.post("/create", response={200: dict, 400: MessageSchema, 409: MessageSchema})
 def create_order(request, data: OrderCreateSchema):
+    # ✅ Retry / double-tap: same Idempotency-Key par pehla response hi wapas (orders/idempotency.py)
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+        return 400, {"success": False, "message": f"Idempotency-Key 1-{MAX_KEY_LENGTH} characters ka hona chahiye."}
+
+    # ✅ Online payments band hain (flag off ya secret/PhonePe keys set nahi) to sirf COD
+    if data.payment_method in ONLINE_PAYMENT_METHODS and not online_payments_ready():
+        return 400, {"success": False, "message": "Online payment abhi band hai, COD choose karein."}
+
     try:
         with transaction.atomic():
+            if idempotency_key:
+                replay = claim_key(idempotency_key, request_hash(request))
+                if replay is not None:
+                    return replay
+
             # --- GUEST CHECKOUT LOGIC (AUTO-SYNC) ---
             user_instance = None
             if data.phone_number:
                 user_instance = User.objects.filter(phone_number=data.phone_number).first()
 
-            # --- COUPON VALIDATION & CALCULATION (NEW) ---
-            coupon_instance = None
-            final_discount = Decimal('0.00')
-            
-            # Agar frontend se coupon_code aaya hai (Schema me coupon_code field hona chahiye)
-            coupon_code = getattr(data, 'coupon_code', None)
-            
-            if coupon_code:
-                try:
-                    coupon = Coupon.objects.get(code__iexact=coupon_code, active=True)
-                    is_valid, msg = coupon.is_valid()
-                    
-                    if is_valid:
-                        # Re-calculate discount on backend for security
-                        cart_total = Decimal(str(data.total_amount))
-                        
-                        if cart_total >= coupon.min_order_value:
-                            if coupon.coupon_type == 'FLAT':
-                                final_discount = coupon.discount_value
-                            else: # PERCENTAGE
-                                final_discount = (coupon.discount_value / Decimal('100')) * cart_total
-                                if coupon.max_discount_amount and final_discount > coupon.max_discount_amount:
-                                    final_discount = coupon.max_discount_amount
-                            
-                            coupon_instance = coupon
-                            # Coupon usage count badhao
-                            coupon.times_used += 1
-                            coupon.save()
-                except Coupon.DoesNotExist:
-                    pass # Galat coupon hai toh discount 0 rahega
+            # --- PRICING (orders/pricing.py) ---
+            # ✅ Client ka price/total/shipping nahi: signed quote (/orders/quote) ya abhi server par hisaab (paise)
+            lines, pricing = checkout_pricing(data.items, coupon_code=data.coupon_code, token=data.quote)
+
+            # Coupon usage count (ek UPDATE, daily tracking ke saath - orders/pricing.py)
+            if pricing["coupon"] and not use_coupon(pricing["coupon"]):
+                raise CheckoutError("Ye coupon sab khatam ho chuke hain.")
 
             # 1. Order Create Karo
+            # ✅ Invoice number isi INSERT me (financial year counter, orders/invoices.py)
             order = Order.objects.create(
+                invoice_no=next_invoice_no(),
                 user=user_instance,
                 full_name=data.full_name,
                 phone_number=data.phone_number,
@@ -69,20 +91,15 @@ def create_order(request, data: OrderCreateSchema):
                 pincode=data.pincode,
                 payment_method=data.payment_method,
                 
-                # Backend calculation use karein security ke liye
-                total_amount=data.total_amount, 
-                discount_amount=final_discount, # ✅ Saved backend calculated discount
-                applied_coupon=coupon_instance, # ✅ Link coupon model
+                # Backend calculation use karein security ke liye (paise -> rupees)
+                total_amount=from_paise(pricing["total"]),
+                discount_amount=from_paise(pricing["discount"]), # ✅ Saved backend calculated discount
+                applied_coupon_id=pricing["coupon"], # ✅ Link coupon model
                 
-                shipping_charges=data.shipping_charges,
+                shipping_charges=from_paise(pricing["shipping"]),
                 status='pending'
             )
 
-            # ✅ 1.5 INVOICE NUMBER GENERATION LOGIC (NEW)
-            current_year = datetime.date.today().year
-            order.invoice_no = f"NC-{current_year}-{order.id:04d}" 
-            order.save()
-
             # ⭐ NEW: AUTO-UPDATE USER PROFILE LOGIC ⭐
             # Agar user logged in hai ya phone se match ho gaya hai
             if user_instance:
@@ -105,90 +122,92 @@ def create_order(request, data: OrderCreateSchema):
                 if changed:
                     user_instance.save()
 
-            # 2. Items Process Karo
-            for item in data.items:
-                size_var = None
-
-                # --- SMART LOOKUP LOGIC ---
-                if hasattr(item, 'size_id') and item.size_id:
-                    size_var = SizeVariant.objects.select_related('variant__product').get(id=item.size_id)
-                
-                elif hasattr(item, 'variant_id') and item.variant_id:
-                     size_var = SizeVariant.objects.select_related('variant__product').get(
-                         variant_id=item.variant_id, 
-                         size=item.size
-                     )
-                
-                else:
-                    size_var = SizeVariant.objects.select_related('variant__product').filter(
-                        variant__product_id=item.product_id,
-                        size=item.size,
-                        variant__color_name=item.color
-                    ).first()
-
-                if not size_var:
-                    raise Exception(f"Product not found: {item.color} - {item.size}")
-
-                # Stock Check
-                if size_var.stock < item.quantity:
-                    raise Exception(f"Stock Issue: {size_var.variant.product.name} ({size_var.size}) khatam hai.")
-
-                # --- ORDER ITEM SAVE ---
-                OrderItem.objects.create(
-                    order=order,
-                    size_variant=size_var,
-                    product_name=size_var.variant.product.name,
-                    price=item.price if item.price > 0 else size_var.variant.product.base_price,
-                    quantity=item.quantity,
-                    size=item.size,
-                    color=item.color if item.color else size_var.variant.color_name
-                )
-
-                # 3. Inventory Update (Stock Kam Karo)
-                size_var.stock -= item.quantity
-                size_var.save()
-
-                if size_var.size == 'FREE':
-                    size_var.variant.stock -= item.quantity
-                    size_var.variant.save()
-
-            return 200, {"success": True, "order_id": order.id, "message": "Order placed successfully"}
+            # 2. Items Process Karo (orders/checkout.py)
+            # ✅ Lines upar pricing me resolve ho chuki, stock ek conditional UPDATE me (oversell nahi), items ek bulk_create me
+            # ✅ UPI/card: payment hone tak stock sirf hold (STOCK_HOLD_MINUTES), COD: seedha kam
+            reserve_stock(lines, order=order if order.payment_method in ONLINE_PAYMENT_METHODS else None)
+            create_order_items(order, lines, pricing["prices"])
+
+            # total_paise: payment gateway ko yahi amount jaana chahiye
+            response = {"success": True, "order_id": order.id, "total_paise": pricing["total"], "message": "Order placed successfully"}
+            if idempotency_key:
+                save_response(idempotency_key, 200, response)
+            return 200, response
             
-    except SizeVariant.DoesNotExist:
-        return 404, {"success": False, "message": "Selected product variant not found."}
-    except Exception as e:
+    # ✅ Sirf apne domain errors; baaki (DB/IntegrityError) 500 - internals leak nahi, transaction
+    # rollback se claim kiya hua Idempotency-Key bhi chhoot jaata hai, retry normal chalega
+    except CheckoutError as e:
         return 400, {"success": False, "message": str(e)}
+    except IdempotencyConflict as e:
+        return 409, {"success": False, "message": str(e)}
 
 
 # --- 2. GET: My Orders (Logged-in User ke liye) ---
-@router.get("/my-orders", response=List[OrderOutSchema], auth=JWTAuth())
-def get_my_orders(request):
-    user = request.auth 
+MY_ORDERS_PAGE_SIZE = 10
+
+def customer_orders(user):
+    """User ke orders: account se jude ya usi phone (+91 ke saath/bina) se guest checkout wale."""
     phone = str(user.phone_number)
-    
-    clean_phone_10 = phone[-10:] 
-    phone_with_prefix = f"+91{clean_phone_10}"
-    
-    print(f"--- FETCHING ORDERS FOR: {phone} OR {phone_with_prefix} ---")
-
-    orders = Order.objects.filter(
-        models.Q(user=user) | 
-        models.Q(phone_number=phone) | 
-        models.Q(phone_number=phone_with_prefix) |
-        models.Q(phone_number=clean_phone_10)
-    ).distinct().order_by('-created_at')
-
-    print(f"--- FOUND {orders.count()} ORDERS ---")
-    
-    return orders
-
-# ✅ --- 3. GET: Single Order Details ---
-@router.get("/{order_id}", response={200: OrderOutSchema, 404: MessageSchema})
-def get_order_detail(request, order_id: str):
+    clean_phone_10 = phone[-10:]
+    phones = {phone, f"+91{clean_phone_10}", clean_phone_10}
+    # Sirf Order table par filter (koi join nahi), isliye distinct() ki zarurat nahi
+    return Order.objects.filter(models.Q(user=user) | models.Q(phone_number__in=phones))
+
+def _order_page(orders, cursor, limit):
+    # ✅ Keyset pagination (created_at, id) - customer ke kitne bhi orders hon, ek page ki hi rows
+    page, next_cursor, has_more = paginate_keyset(orders, 'newest', cursor, limit or MY_ORDERS_PAGE_SIZE)
+    return {
+        "items": page,
+        "page_size": clamp_page_size(limit or MY_ORDERS_PAGE_SIZE),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+@router.get("/my-orders", response={200: OrderPageSchema, 400: MessageSchema}, auth=JWTAuth())
+def get_my_orders(request, cursor: str = None, limit: int = None):
+    # ✅ Fixed queries: orders ka ek page (coupon JOIN ke saath) + saare items ek prefetch query me
+    orders = customer_orders(request.auth).select_related('applied_coupon').prefetch_related('items')
+    try:
+        return 200, _order_page(orders, cursor, limit)
+    except InvalidCursor as e:
+        return 400, {"success": False, "message": str(e)}
+
+@router.get("/my-orders/summary", response={200: OrderSummaryPageSchema, 400: MessageSchema}, auth=JWTAuth())
+def get_my_orders_summary(request, cursor: str = None, limit: int = None):
+    # ✅ List page ke liye halka mode: items nahi, sirf unki ginti (ek hi query)
+    orders = customer_orders(request.auth).annotate(item_count=models.Count('items')).only(
+        'id', 'invoice_no', 'status', 'payment_method', 'total_amount', 'created_at',
+    )
     try:
-        order = Order.objects.get(id=order_id)
-        return 200, order
-    except Order.DoesNotExist:
+        return 200, _order_page(orders, cursor, limit)
+    except InvalidCursor as e:
+        return 400, {"success": False, "message": str(e)}
+
+@router.get("/my-orders/{order_id}", response={200: OrderOutSchema, 404: MessageSchema}, auth=JWTAuth())
+def get_my_order(request, order_id: int):
+    # ✅ Sirf apna order (dusre customer ka id daalne par 404), poori history download nahi
+    order = customer_orders(request.auth).select_related('applied_coupon').prefetch_related('items').filter(
+        id=order_id
+    ).first()
+    if order is None:
+        return 404, {"success": False, "message": "Order nahi mila."}
+    return 200, order
+
+@router.get("/my-orders/{order_id}/events-token", response={200: dict, 404: MessageSchema}, auth=JWTAuth())
+def get_order_events_token(request, order_id: int):
+    # ✅ Live status stream (orders/views.py) ke liye: sirf isi order ka chhota signed token, JWT URL me nahi
+    if not customer_orders(request.auth).filter(id=order_id).exists():
+        return 404, {"success": False, "message": "Order nahi mila."}
+    return 200, {"token": events_token(order_id), "expires_in": EVENTS_TOKEN_TTL_SECONDS}
+
+# ✅ --- 2.5 POST: Payment Confirmed (PhonePe status COMPLETED ke baad) ---
+@router.post("/{order_id}/payment-confirmed", response={200: MessageSchema, 404: MessageSchema, 409: MessageSchema}, auth=PaymentSecretAuth())
+def payment_confirmed(request, order_id: int):
+    # Pending order confirm -> stock holds permanent decrement (orders/transitions.py)
+    status = confirm_payment(order_id)
+    if status is None:
         return 404, {"success": False, "message": "Order nahi mila."}
-    except ValueError:
-        return 400, {"success": False, "message": "Invalid Order ID."}
\ No newline at end of file
+    if status == 'cancelled':
+        # Hold expire ho gaya tha aur stock kisi aur ko mil chuka - refund karna hoga
+        return 409, {"success": False, "message": "Order cancel ho chuka hai, payment refund karna hoga."}
+    return 200, {"success": True, "message": "Payment confirm ho gaya."}
@@ -5,4 +5,5 @@ class OrdersConfig(AppConfig):
     name = 'orders'
 
     def ready(self):
+        import orders.checks
         import orders.signals
\ No newline at end of file
@@ -0,0 +1,161 @@
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from shop.facets import held_quantity
+from shop.models import ProductVariant, SizeVariant
+from shop.summary import refresh_product_summaries
+
+from .models import OrderItem, StockReservation
+from .reservations import hold_expiry
+
+# --- CHECKOUT: cart lines -> stock -> order items ---
+# Har order me queries ki ginti fixed hai, cart me kitni bhi lines hon:
+# 1. Saari lines ek OR query se resolve (size_id / variant+size / product+colour+size)
+# 2. Size rows id ke order me lock (FOR UPDATE), isliye do checkouts ek dusre ka intezaar
+#    karte hain par deadlock nahi. Lock ke baad ek query se check: stock - live holds >= q.
+#    Kisi ek line ka stock kam pada to poora order rollback.
+# 3. COD: stock ek UPDATE se kam. UPI/card: stock sirf hold hota hai (orders/reservations.py),
+#    payment confirm hone par permanent decrement
+# 4. Order items ek bulk_create me
+
+
+class CheckoutError(Exception):
+    """Customer ko dikhane layak message (create_order 400 bhejta hai)."""
+
+
+def _line_lookup(item):
+    if getattr(item, 'size_id', None):
+        return Q(id=item.size_id)
+    if getattr(item, 'variant_id', None):
+        return Q(variant_id=item.variant_id, size=item.size)
+    return Q(variant__product_id=item.product_id, size=item.size, variant__color_name=item.color)
+
+
+def _matches(size_var, item):
+    if getattr(item, 'size_id', None):
+        return size_var.id == item.size_id
+    if getattr(item, 'variant_id', None):
+        return size_var.variant_id == item.variant_id and size_var.size == item.size
+    return (size_var.variant.product_id == item.product_id and size_var.size == item.size
+            and size_var.variant.color_name == item.color)
+
+
+def resolve_lines(items, with_available=False):
+    """
+    Cart items -> [(item, SizeVariant)] ek query me. Na mile to CheckoutError.
+    with_available: har SizeVariant par `available` (stock - live holds) bhi, usi query me.
+    """
+    if not items:
+        raise CheckoutError("Cart khali hai.")
+    lookup = Q()
+    for item in items:
+        if item.quantity < 1:
+            raise CheckoutError(f"Invalid quantity: {item.color} - {item.size}")
+        lookup |= _line_lookup(item)
+    queryset = SizeVariant.objects.filter(lookup).select_related('variant__product').order_by('id')
+    if with_available:
+        queryset = queryset.annotate(available=F('stock') - held_quantity('pk'))
+    candidates = list(queryset)
+
+    lines = []
+    for item in items:
+        # Pehle wala .first() jaisa: sabse chhoti id wali matching row
+        size_var = next((s for s in candidates if _matches(s, item)), None)
+        if size_var is None:
+            raise CheckoutError(f"Product not found: {item.color} - {item.size}")
+        lines.append((item, size_var))
+    return lines
+
+
+LOCK_SQL = "SELECT id FROM {size} WHERE id = ANY(%s) ORDER BY id FOR UPDATE"
+
+# Lock milne ke baad alag statement (naya snapshot), taaki dusre checkout ke holds bhi dikhein
+AVAILABLE_SQL = """
+    SELECT s.id
+    FROM {size} s
+    JOIN (VALUES {values}) AS x(id, qty) ON x.id = s.id
+    WHERE s.stock - COALESCE((
+        SELECT SUM(r.quantity) FROM {hold} r WHERE r.size_variant_id = s.id AND r.expires_at > NOW()
+    ), 0) >= x.qty
+"""
+
+DECREMENT_SQL = """
+    UPDATE {size} s SET stock = s.stock - x.qty
+    FROM (VALUES {values}) AS x(id, qty)
+    WHERE s.id = x.id
+"""
+
+# Suit/Saree (FREE size) me variant ka master stock bhi kam hota hai
+DECREMENT_VARIANT_SQL = """
+    UPDATE {variant} v SET stock = v.stock - x.qty
+    FROM (VALUES {values}) AS x(id, qty)
+    WHERE v.id = x.id
+"""
+
+
+def _values(pairs):
+    return ', '.join(['(%s::bigint, %s::integer)'] * len(pairs)), [p for pair in pairs for p in pair]
+
+
+def reserve_stock(lines, order=None):
+    """
+    Saari lines ka stock check karke kam karo (transaction.atomic ke andar call karo).
+    `order` diya (online payment) to stock kam nahi hota, uske holds bante hain.
+    Kisi line ka available stock kam ho to CheckoutError - caller ka transaction rollback ho jata hai.
+    """
+    quantities, variants = {}, {}
+    for item, size_var in lines:
+        quantities[size_var.id] = quantities.get(size_var.id, 0) + item.quantity
+        if size_var.size == 'FREE':
+            variants[size_var.variant_id] = variants.get(size_var.variant_id, 0) + item.quantity
+
+    tables = {
+        'size': SizeVariant._meta.db_table,
+        'variant': ProductVariant._meta.db_table,
+        'hold': StockReservation._meta.db_table,
+    }
+    values, params = _values(sorted(quantities.items()))
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_SQL.format(**tables), [sorted(quantities)])
+        cursor.execute(AVAILABLE_SQL.format(values=values, **tables), params)
+        available = {row[0] for row in cursor.fetchall()}
+        short = [size_var for _, size_var in lines if size_var.id not in available]
+        if short:
+            size_var = short[0]
+            raise CheckoutError(f"Stock Issue: {size_var.variant.product.name} ({size_var.size}) khatam hai.")
+
+        if order is None:
+            cursor.execute(DECREMENT_SQL.format(values=values, **tables), params)
+            if variants:
+                values, params = _values(sorted(variants.items()))
+                cursor.execute(DECREMENT_VARIANT_SQL.format(values=values, **tables), params)
+
+    if order is not None:
+        expires_at = hold_expiry()
+        StockReservation.objects.bulk_create([
+            StockReservation(order=order, size_variant_id=size_id, quantity=qty, expires_at=expires_at)
+            for size_id, qty in sorted(quantities.items())
+        ])
+
+    # Raw UPDATE signals nahi chalata: summary commit ke baad. Documents / catalog ETag nahi
+    # badalte (stock request par live, shop/cache.py) - checkout global version row nahi likhta
+    product_ids = list({size_var.variant.product_id for _, size_var in lines})
+    transaction.on_commit(lambda: refresh_product_summaries(product_ids))
+
+
+def create_order_items(order, lines, prices):
+    """Ek bulk_create (pehle har line ka alag INSERT tha). prices: {size_id: unit paise} (orders/pricing.py)."""
+    return OrderItem.objects.bulk_create([
+        OrderItem(
+            order=order,
+            size_variant=size_var,
+            product_name=size_var.variant.product.name,
+            price=Decimal(prices[size_var.id]) / 100,
+            quantity=item.quantity,
+            size=item.size,
+            color=item.color if item.color else size_var.variant.color_name,
+        )
+        for item, size_var in lines
+    ])
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .phonepe import online_payments_ready
+
+
+@register()
+def online_payments_check(app_configs, **kwargs):
+    """Flag on hai par keys nahi: startup chalta hai, UPI/card checkout 400 deta hai - batao to sahi."""
+    if settings.ONLINE_PAYMENTS_ENABLED and not online_payments_ready():
+        return [Warning(
+            "Online payments band hain: PAYMENT_CONFIRM_SECRET, PHONEPE_CLIENT_ID aur PHONEPE_CLIENT_SECRET set nahi.",
+            hint="Env me keys daalo, ya ONLINE_PAYMENTS_ENABLED=False (sirf COD).",
+            id='orders.W001',
+        )]
+    return []
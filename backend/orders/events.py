@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import json
+import logging
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# --- LIVE ORDER STATUS (Postgres LISTEN/NOTIFY -> SSE) ---
+# Order ka status badalte hi (signal / sweeper) usi transaction me pg_notify hota hai.
+# Postgres NOTIFY commit par hi deliver karta hai, rollback hua to koi event nahi jaata.
+# Har ASGI worker process me EK LISTEN connection (StatusBroker) hai jo event loop ke
+# reader se jagta hai - koi polling/thread nahi. Har SSE subscriber sirf ek asyncio.Queue
+# hai, isliye hazaaron idle tracking pages ka kharcha lagbhag kuch nahi.
+
+CHANNEL = 'order_status'
+
+# Iske baad status nahi badalta, stream band (delivered ke baad return_requested aa sakta hai)
+FINAL_STATUSES = ('returned', 'cancelled')
+
+# SSE ka URL token: raw JWT query string (uvicorn/proxy access logs) me nahi jaata, sirf ek
+# order ke liye chhota signed token (/orders/my-orders/{id}/events-token se milta hai)
+EVENTS_TOKEN_SALT = 'orders.events'
+EVENTS_TOKEN_TTL_SECONDS = 10 * 60
+
+NOTIFY_MANY_SQL = """
+    SELECT pg_notify(%s, json_build_object('id', id, 'status', %s)::text)
+    FROM unnest(%s::bigint[]) AS id
+"""
+
+
+def notify_status(order_id, status):
+    """Transaction ke andar call karo (signal), commit par hi subscribers tak jaata hai."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, json.dumps({"id": order_id, "status": status})])
+
+
+def notify_statuses(order_ids, status):
+    """Bulk status UPDATE (sweeper/admin actions) ke liye: saare orders ek statement me."""
+    if not order_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(NOTIFY_MANY_SQL, [CHANNEL, status, list(order_ids)])
+
+
+def events_token(order_id):
+    return signing.dumps({'order': order_id}, salt=EVENTS_TOKEN_SALT)
+
+
+def events_token_valid(token, order_id):
+    """Token isi order ka hai aur EVENTS_TOKEN_TTL_SECONDS se purana nahi."""
+    try:
+        payload = signing.loads(token, salt=EVENTS_TOKEN_SALT, max_age=EVENTS_TOKEN_TTL_SECONDS)
+    except signing.BadSignature:  # SignatureExpired bhi isi ka subclass
+        return False
+    return payload.get('order') == order_id
+
+
+class StatusBroker:
+    """Process-wide LISTEN connection; order_id -> subscribers (asyncio.Queue) ka map."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._conn = None
+        self._loop = None
+        self._lock = None
+
+    def _connect(self):
+        db = settings.DATABASES['default']
+        conn = psycopg2.connect(
+            dbname=db['NAME'], user=db['USER'], password=db['PASSWORD'],
+            host=db['HOST'] or None, port=db['PORT'] or None,
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    async def _ensure_listening(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Naya event loop (worker restart / tests): purana reader us loop ke saath gaya
+            self._close()
+            self._loop, self._lock = loop, asyncio.Lock()
+        async with self._lock:
+            if self._conn is None:
+                self._conn = await loop.run_in_executor(None, self._connect)
+                loop.add_reader(self._conn.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except psycopg2.Error:
+            logger.exception("Order status LISTEN connection toot gaya")
+            self._close()
+            # Subscribers ko batao: dobara connect karke DB se current status padh lein
+            for queues in self._subscribers.values():
+                for queue in queues:
+                    queue.put_nowait(None)
+            return
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            try:
+                event = json.loads(notify.payload)
+            except ValueError:
+                continue
+            for queue in self._subscribers.get(event.get('id'), ()):
+                queue.put_nowait(event)
+
+    def _close(self):
+        if self._conn is not None:
+            with contextlib.suppress(Exception):
+                self._loop.remove_reader(self._conn.fileno())
+            with contextlib.suppress(Exception):
+                self._conn.close()
+        self._conn = None
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, order_id):
+        """async with broker.subscribe(id) as queue: har status event queue me (None = reconnect hua)."""
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(order_id, set()).add(queue)
+        try:
+            await self._ensure_listening()
+            yield queue
+        finally:
+            queues = self._subscribers.get(order_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[order_id]
+
+    async def resubscribe(self):
+        await self._ensure_listening()
+
+
+broker = StatusBroker()
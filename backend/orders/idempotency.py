@@ -0,0 +1,83 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+# --- IDEMPOTENCY KEYS (checkout retry / double-tap) ---
+# Frontend har checkout attempt ke saath Idempotency-Key header bhejta hai. create_order ke
+# transaction ke shuru me key ka row INSERT ... ON CONFLICT DO NOTHING se claim hota hai:
+# - Naya key: order banta hai aur response usi transaction me key ke row me save
+# - Key pehle se committed: stored response wapas, transaction dobara nahi chalta
+# - Same key wala dusra request abhi chal raha hai: Postgres unique index par uske
+#   commit/rollback tak rukta hai (race nahi). Rollback hua (e.g. stock issue) to row bhi
+#   gaya, retry normal chalta hai
+# Purane keys purge_idempotency_keys command batches me delete karta hai.
+
+MAX_KEY_LENGTH = 64
+PURGE_BATCH_SIZE = 1000
+
+
+class IdempotencyConflict(Exception):
+    """Same key pehle kisi alag request body ke saath use ho chuka hai (create_order 409 bhejta hai)."""
+
+
+CLAIM_SQL = """
+    INSERT INTO {table} (key, request_hash, created_at) VALUES (%s, %s, NOW())
+    ON CONFLICT (key) DO NOTHING
+    RETURNING id
+"""
+
+PURGE_SQL = """
+    DELETE FROM {table}
+    WHERE id IN (
+        SELECT id FROM {table} WHERE created_at < %s ORDER BY id LIMIT %s
+    )
+"""
+
+
+def request_hash(request):
+    return hashlib.sha256(request.body).hexdigest()
+
+
+def claim_key(key, fingerprint):
+    """
+    transaction.atomic ke andar call karo.
+    Returns: None = key naya hai (request chalao, phir save_response),
+    warna (status_code, response) jo pehli baar bheja tha.
+    """
+    table = IdempotencyKey._meta.db_table
+    for _ in range(2):
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_SQL.format(table=table), [key, fingerprint])
+            if cursor.fetchone():
+                return None
+        # Conflict: pehla request commit ho chuka (naya statement = naya snapshot, row dikhega)
+        record = IdempotencyKey.objects.filter(key=key).values('request_hash', 'status_code', 'response').first()
+        if record is None:
+            continue  # Beech me purge ho gaya, dobara claim
+        if record['request_hash'] != fingerprint:
+            raise IdempotencyConflict("Ye Idempotency-Key kisi dusre order ke liye use ho chuka hai.")
+        return record['status_code'], record['response']
+    return None
+
+
+def save_response(key, status_code, response):
+    IdempotencyKey.objects.filter(key=key).update(status_code=status_code, response=response)
+
+
+def purge_expired_keys(batch_size=PURGE_BATCH_SIZE):
+    """IDEMPOTENCY_KEY_TTL_HOURS se purane keys, batch_size ke batches me (chhote locks). Returns: kitne delete hue."""
+    cutoff = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    table = IdempotencyKey._meta.db_table
+    deleted = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(PURGE_SQL.format(table=table), [cutoff, batch_size])
+            count = cursor.rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
@@ -0,0 +1,37 @@
+from django.db import connection
+from django.utils import timezone
+
+from .models import InvoiceCounter
+
+# --- INVOICE NUMBERING ---
+# Invoice number order ke INSERT ke saath hi jaata hai (pehle order save, phir dusra
+# UPDATE hota tha). Har financial year (April-March) ka ek counter row:
+#   INSERT ... ON CONFLICT DO UPDATE SET last_number = last_number + 1 RETURNING
+# Counter row ka lock order ke transaction ke commit/rollback tak rehta hai, isliye
+# rollback hone par number wapas mil jata hai (gap-free) aur kitne bhi workers/servers
+# ho, do orders ko ek number nahi milta. Postgres SEQUENCE rollback par gap chhodta hai,
+# isliye wo nahi.
+
+PREFIX = "NC"
+
+NEXT_NUMBER_SQL = """
+    INSERT INTO {counter} (financial_year, last_number) VALUES (%s, 1)
+    ON CONFLICT (financial_year) DO UPDATE SET last_number = {counter}.last_number + 1
+    RETURNING last_number
+"""
+
+
+def financial_year(day=None):
+    """1 April se naya saal: 2026-10-18 -> "2026-27", 2027-02-01 -> "2026-27"."""
+    day = day or timezone.localdate()
+    start = day.year if day.month >= 4 else day.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def next_invoice_no(day=None):
+    """Agla invoice number. Order create karne wale transaction.atomic ke andar hi call karo."""
+    year = financial_year(day)
+    with connection.cursor() as cursor:
+        cursor.execute(NEXT_NUMBER_SQL.format(counter=InvoiceCounter._meta.db_table), [year])
+        number = cursor.fetchone()[0]
+    return f"{PREFIX}-{year}-{number:04d}"
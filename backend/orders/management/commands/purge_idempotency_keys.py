@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from orders.idempotency import PURGE_BATCH_SIZE, purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = "IDEMPOTENCY_KEY_TTL_HOURS se purane checkout Idempotency-Keys delete karta hai - cron se ghante me ek baar"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE,
+                            help="Ek DELETE me kitne keys")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {deleted} purane idempotency keys delete hue"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.phonepe import PhonePeError
+from orders.reservations import SWEEP_BATCH_SIZE, release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Expire hue stock holds: PhonePe par paid order confirm, baaki pending order cancel + holds release - cron se har minute chalao"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE,
+                            help="Ek transaction me kitne orders/holds")
+
+    def handle(self, *args, **options):
+        try:
+            cancelled, confirmed, released = release_expired_holds(batch_size=options['batch_size'])
+        except PhonePeError as e:
+            # Status pata nahi to koi order cancel nahi hua - agla cron run dobara try karega
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {confirmed} paid orders confirm, {cancelled} pending orders cancel, {released} holds release hue"
+        ))
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_stock_reservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceCounter',
+            fields=[
+                ('financial_year', models.CharField(max_length=7, primary_key=True, serialize=False)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='invoice_no',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
@@ -49,14 +49,68 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     
     # ✅ New field for Invoice / Bill (Added here)
-    invoice_no = models.CharField(max_length=50, null=True, blank=True)
+    # Order INSERT ke saath hi assign hota hai (orders/invoices.py), format: NC-2026-27-0001
+    invoice_no = models.CharField(max_length=50, null=True, blank=True, unique=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # My Orders: (user OR phone) ke orders newest pehle, keyset pagination (created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_recent_idx'),
+            models.Index(fields=['phone_number', '-created_at', '-id'], name='order_phone_recent_idx'),
+        ]
     
     def __str__(self): 
         return f"Order #{self.id} - {self.full_name}"
 
+    # ✅ DB se load hua status yaad rakho: save par pichla status bina extra SELECT ke (orders/transitions.py)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')  # .only() me status deferred ho to None
+        return instance
+
+    def clean(self):
+        super().clean()
+        from .transitions import check_holds, check_transition  # transitions models ko import karta hai
+        previous_status = getattr(self, '_loaded_status', None)
+        check_transition(previous_status, self.status)
+        if self.pk and previous_status != self.status:
+            check_holds(self.pk, self.status)
+
+    def save(self, *args, **kwargs):
+        # Signals (orders/signals.py) _previous_status padhte hain; save ke baad naya status hi "loaded"
+        if self._state.adding:
+            self._previous_status = None
+        elif getattr(self, '_loaded_status', None) is None:
+            # Status deferred tha (.only()) ya object haath se bana: tabhi ek SELECT
+            self._previous_status = Order.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+        else:
+            self._previous_status = self._loaded_status
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+class InvoiceCounter(models.Model):
+    # ✅ Har financial year (April-March) ka aakhri invoice number - gap-free numbering (orders/invoices.py)
+    financial_year = models.CharField(max_length=7, primary_key=True)  # e.g. "2026-27"
+    last_number = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"FY {self.financial_year}: {self.last_number}"
+
+class IdempotencyKey(models.Model):
+    # ✅ Checkout ka Idempotency-Key -> pehla response (retry/double-tap par wahi order wapas, orders/idempotency.py)
+    key = models.CharField(max_length=64, unique=True)
+    request_hash = models.CharField(max_length=64)  # Request body ka sha256 - same key, alag body = 409
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True)
+    created_at = models.DateTimeField(db_index=True)  # TTL purge isi par
+
+    def __str__(self):
+        return f"{self.key} ({self.status_code})"
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, related_name='items', on_delete=models.CASCADE)
     size_variant = models.ForeignKey(SizeVariant, on_delete=models.SET_NULL, null=True) 
@@ -67,4 +121,23 @@ class OrderItem(models.Model):
     color = models.CharField(max_length=50, blank=True, null=True)
 
     def __str__(self): 
-        return f"{self.quantity} x {self.product_name} ({self.size})"
\ No newline at end of file
+        return f"{self.quantity} x {self.product_name} ({self.size})"
+
+class StockReservation(models.Model):
+    # ✅ Online payment pending hai tab tak stock sirf hold hota hai, kam nahi (orders/reservations.py)
+    order = models.ForeignKey(Order, related_name='reservations', on_delete=models.CASCADE)
+    size_variant = models.ForeignKey(SizeVariant, related_name='reservations', on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Available stock = stock - SUM(live holds): index-only aggregate (size, expires_at, quantity)
+            models.Index(fields=['size_variant', 'expires_at'], include=['quantity'], name='reservation_live_idx'),
+            # Sweeper: expire ho chuke holds
+            models.Index(fields=['expires_at'], name='reservation_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"Hold {self.quantity} x {self.size_variant_id} (Order #{self.order_id})"
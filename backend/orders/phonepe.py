@@ -0,0 +1,81 @@
+import logging
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# --- PHONEPE ORDER STATUS (server-side) ---
+# Next.js /payment/status redirect par confirm karta hai, par customer tab band kar de ya
+# confirm call fail ho to order pending reh jaata hai. Sweeper (orders/reservations.py) hold
+# expire hone par cancel se pehle yahan se PhonePe ka asli status poochta hai.
+# merchantOrderId = "NDN-<order id>" (frontend/app/checkout/page.tsx jaisa)
+
+AUTH_URL = "https://api.phonepe.com/apis/identity-manager/v1/oauth/token"
+STATUS_URL = "https://api.phonepe.com/apis/pg/checkout/v2/order/{merchant_order_id}/status"
+TIMEOUT_SECONDS = 10
+
+COMPLETED = 'COMPLETED'
+FAILED = 'FAILED'
+NOT_FOUND = 'NOT_FOUND'  # Customer PhonePe tak pahuncha hi nahi (payment shuru nahi hua)
+
+
+class PhonePeError(Exception):
+    """PhonePe se status nahi mila (network/auth) - order ko chhed mat karo, agle run me dekhenge."""
+
+
+def keys_configured():
+    return bool(settings.PHONEPE_CLIENT_ID and settings.PHONEPE_CLIENT_SECRET)
+
+
+def online_payments_ready():
+    """
+    UPI/card checkout chal sakta hai? Flag on ho aur confirm secret + PhonePe keys set hon.
+    Keys ke bina payment confirm 401 hota aur sweeper paid orders pehchaan nahi pata.
+    """
+    return bool(settings.ONLINE_PAYMENTS_ENABLED and settings.PAYMENT_CONFIRM_SECRET and keys_configured())
+
+
+def merchant_order_id(order_id):
+    return f"NDN-{order_id}"
+
+
+def _access_token(session):
+    try:
+        response = session.post(AUTH_URL, params={
+            'grant_type': 'client_credentials',
+            'client_id': settings.PHONEPE_CLIENT_ID,
+            'client_secret': settings.PHONEPE_CLIENT_SECRET,
+            'client_version': settings.PHONEPE_CLIENT_VERSION,
+        }, headers={'Content-Type': 'application/x-www-form-urlencoded'}, timeout=TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()['access_token']
+    except (requests.RequestException, ValueError, KeyError) as e:
+        raise PhonePeError(f"PhonePe auth fail: {e}") from e
+
+
+def payment_states(order_ids):
+    """
+    {order_id: state} - COMPLETED / FAILED / PENDING / NOT_FOUND. Ek auth token poore batch ke liye.
+    Jis order ka status nahi mila wo result me nahi hota (caller use chhod deta hai).
+    """
+    if not keys_configured():
+        raise PhonePeError("PHONEPE_CLIENT_ID / PHONEPE_CLIENT_SECRET set nahi hain.")
+    states = {}
+    with requests.Session() as session:
+        token = _access_token(session)
+        for order_id in order_ids:
+            try:
+                response = session.get(
+                    STATUS_URL.format(merchant_order_id=merchant_order_id(order_id)),
+                    headers={'accept': 'application/json', 'Authorization': f"O-Bearer {token}"},
+                    timeout=TIMEOUT_SECONDS,
+                )
+                if response.status_code == 404:
+                    states[order_id] = NOT_FOUND
+                    continue
+                response.raise_for_status()
+                states[order_id] = response.json()['state']
+            except (requests.RequestException, ValueError, KeyError):
+                logger.exception("PhonePe status nahi mila: order %s", order_id)
+    return states
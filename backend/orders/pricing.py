@@ -0,0 +1,173 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core import signing
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from coupons.models import Coupon
+
+from .checkout import CheckoutError, resolve_lines
+
+# --- PRICING ENGINE (cart -> quote) ---
+# Poora cart server par ek pass me price hota hai, /orders/quote aur create_order dono yahi
+# use karte hain. Client ka price/total/shipping sirf dikhane ke liye hai, bharosa nahi.
+# - Line price = product.base_price + size.price_adjustment (resolve_lines ki ek query)
+# - Available stock = stock - live holds (usi query me annotation)
+# - Coupon ek query, FLAT / PERCENTAGE (max cap ke saath)
+# - Saara hisaab integer paise me (float/Decimal rounding drift nahi), response me bhi paise
+# Quote signed token (django.core.signing) ke saath jaata hai: create_order use wapas
+# padh kar bina dobara calculate kiye order bana deta hai.
+
+FREE_SHIPPING_ABOVE_PAISE = 1499_00  # Subtotal isse zyada ho to shipping free
+SHIPPING_PAISE = 99_00
+QUOTE_TTL_SECONDS = 15 * 60
+QUOTE_SALT = 'orders.quote'
+
+
+class QuoteError(CheckoutError):
+    """Quote token galat / expire / cart se match nahi karta (create_order 400 bhejta hai)."""
+
+
+def to_paise(amount):
+    return int((Decimal(amount) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def from_paise(paise):
+    return Decimal(paise) / 100
+
+
+def shipping_for(subtotal_paise):
+    return 0 if subtotal_paise > FREE_SHIPPING_ABOVE_PAISE else SHIPPING_PAISE
+
+
+def coupon_discount(coupon, subtotal_paise):
+    """Returns: (discount paise, None) ya (0, customer ko dikhane layak wajah)."""
+    is_valid, msg = coupon.is_valid()
+    if not is_valid:
+        return 0, msg
+    if subtotal_paise < to_paise(coupon.min_order_value):
+        return 0, f"Bhai, kam se kam ₹{coupon.min_order_value} ki shopping karo is coupon ke liye."
+
+    if coupon.coupon_type == 'FLAT':
+        discount = to_paise(coupon.discount_value)
+    else:  # PERCENTAGE
+        discount = int((subtotal_paise * coupon.discount_value / 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+        if coupon.max_discount_amount:
+            discount = min(discount, to_paise(coupon.max_discount_amount))
+    return min(discount, subtotal_paise), None
+
+
+def use_coupon(coupon_id):
+    """
+    Order me coupon laga: times_used +1 (F(), parallel orders ki ginti na khoye), limit bachi ho tabhi.
+    Coupon.save() jaisa last_used_date aaj, naya din ho to today_usage_count 0 - sab isi ek UPDATE me.
+    Returns: False = limit khatam.
+    """
+    today = timezone.now().date()  # Coupon.save() bhi yahi date use karta hai
+    return bool(Coupon.objects.filter(
+        Q(total_usage_limit__isnull=True) | Q(total_usage_limit=0) | Q(times_used__lt=F('total_usage_limit')),
+        id=coupon_id,
+    ).update(
+        times_used=F('times_used') + 1,
+        today_usage_count=Case(When(last_used_date=today, then=F('today_usage_count')), default=Value(0)),
+        last_used_date=today,
+    ))
+
+
+def _price_cart(items, coupon_code=None):
+    """Cart items -> (quote dict (saari amounts paise me), resolved lines, token payload)."""
+    lines = resolve_lines(items, with_available=True)
+
+    quote_lines = []
+    subtotal = 0
+    for item, size_var in lines:
+        product = size_var.variant.product
+        unit = to_paise(product.base_price + (size_var.price_adjustment or 0))
+        subtotal += unit * item.quantity
+        quote_lines.append({
+            "size_id": size_var.id,
+            "product_name": product.name,
+            "size": size_var.size,
+            "color": size_var.variant.color_name,
+            "quantity": item.quantity,
+            "unit_price_paise": unit,
+            "line_total_paise": unit * item.quantity,
+            "available_stock": max(size_var.available, 0),
+            "in_stock": size_var.available >= item.quantity,
+        })
+
+    discount, coupon, coupon_message = 0, None, None
+    if coupon_code:
+        coupon = Coupon.objects.filter(code__iexact=coupon_code).first()
+        if coupon is None:
+            coupon_message = "Galat coupon code hai bhai."
+        else:
+            discount, coupon_message = coupon_discount(coupon, subtotal)
+            if coupon_message:
+                coupon = None
+
+    shipping = shipping_for(subtotal)
+    quote = {
+        "lines": quote_lines,
+        "subtotal_paise": subtotal,
+        "discount_paise": discount,
+        "shipping_paise": shipping,
+        "total_paise": subtotal - discount + shipping,
+        "coupon_code": coupon.code if coupon else None,
+        "coupon_message": coupon_message,
+        "in_stock": all(line["in_stock"] for line in quote_lines),
+    }
+    # Token me sirf wahi jo order banane ke liye chahiye: (size_id, qty, unit paise), totals, coupon id
+    payload = {
+        "lines": [[line["size_id"], line["quantity"], line["unit_price_paise"]] for line in quote_lines],
+        "subtotal": subtotal,
+        "discount": discount,
+        "shipping": shipping,
+        "total": quote["total_paise"],
+        "coupon": coupon.id if coupon else None,
+    }
+    quote["quote"] = signing.dumps(payload, salt=QUOTE_SALT, compress=True)
+    quote["expires_in"] = QUOTE_TTL_SECONDS
+    return quote, lines, _with_prices(payload)
+
+
+def _with_prices(payload):
+    payload["prices"] = {size_id: unit for size_id, _, unit in payload["lines"]}
+    return payload
+
+
+def price_cart(items, coupon_code=None):
+    """/orders/quote: cart ka poora hisaab (paise) + signed quote token."""
+    return _price_cart(items, coupon_code)[0]
+
+
+def checkout_pricing(items, coupon_code=None, token=None):
+    """
+    create_order ke liye: (lines, payload). Signed quote mila to wahi amounts (dobara hisaab nahi),
+    warna abhi price karo. payload: subtotal/discount/shipping/total (paise), coupon id, prices.
+    """
+    if token:
+        lines = resolve_lines(items)
+        return lines, load_quote(token, lines)
+    _, lines, payload = _price_cart(items, coupon_code)
+    return lines, payload
+
+
+def load_quote(token, lines):
+    """Signed quote padho aur check karo ki resolved cart lines wahi hain jinka quote bana tha."""
+    try:
+        payload = signing.loads(token, salt=QUOTE_SALT, max_age=QUOTE_TTL_SECONDS)
+    except signing.SignatureExpired:
+        raise QuoteError("Price quote expire ho gaya, checkout page refresh karein.")
+    except signing.BadSignature:
+        raise QuoteError("Invalid price quote.")
+
+    quoted = {}
+    for size_id, quantity, unit in payload["lines"]:
+        quoted[size_id] = quoted.get(size_id, 0) + quantity
+    ordered = {}
+    for item, size_var in lines:
+        ordered[size_var.id] = ordered.get(size_var.id, 0) + item.quantity
+    if quoted != ordered:
+        raise QuoteError("Cart badal gaya hai, price quote dobara lein.")
+    return _with_prices(payload)
@@ -0,0 +1,234 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from shop.models import ProductVariant, SizeVariant
+from shop.summary import refresh_product_summaries
+
+from .events import notify_statuses
+from .models import Order, StockReservation
+from .phonepe import COMPLETED, FAILED, NOT_FOUND, payment_states
+
+# --- STOCK RESERVATIONS (online payment holds) ---
+# UPI/card order 'pending' me banta hai aur PhonePe payment baad me hota hai. Us beech
+# stock kam karne ki jagah har line ka hold (StockReservation) STOCK_HOLD_MINUTES ke liye:
+# - Available stock = stock - SUM(live holds). Checkout aur shop API dono yahi padhte hain
+#   (shop/facets.held_quantity, index-only aggregate)
+# - Order confirm hua (payment mila / admin): holds ek UPDATE se permanent decrement ban jaate hain
+# - Order cancel hua: holds delete, stock wapas available (dono orders/transitions.py se)
+# - Hold expire hua: release_expired_holds command (cron, har minute) pehle PhonePe se status
+#   poochta hai (orders/phonepe.py) - paid to confirm, payment fail/shuru hi nahi hua to cancel
+# COD orders me pehle jaisa seedha decrement hota hai (orders/checkout.py).
+
+ONLINE_PAYMENT_METHODS = ('upi', 'card')
+SWEEP_BATCH_SIZE = 500
+
+
+def hold_expiry():
+    return timezone.now() + timedelta(minutes=settings.STOCK_HOLD_MINUTES)
+
+
+def _tables():
+    return {
+        'size': SizeVariant._meta.db_table,
+        'variant': ProductVariant._meta.db_table,
+        'order': Order._meta.db_table,
+        'hold': StockReservation._meta.db_table,
+    }
+
+
+class HoldUnavailable(Exception):
+    """Hold expire ho gaya aur beech me stock kisi aur ne le liya: convert nahi hoga (refund karna hoga)."""
+
+
+# Checkout (LOCK_SQL) aur restock jaisa: holds wale size rows id ke order me lock, deadlock nahi
+LOCK_HELD_SQL = """
+    SELECT id FROM {size}
+    WHERE id IN (SELECT size_variant_id FROM {hold} WHERE order_id = ANY(%(orders)s))
+    ORDER BY id
+    FOR UPDATE
+"""
+
+# Lock ke baad (naya snapshot): jin sizes par stock - dusron ke live holds < in orders ka hold.
+# Live hold to checkout ne pehle hi gin liya tha; expired hold ka stock beech me bik sakta hai.
+SHORT_HOLDS_SQL = """
+    SELECT h.id
+    FROM (
+        SELECT size_variant_id AS id, SUM(quantity) AS qty
+        FROM {hold} WHERE order_id = ANY(%(orders)s)
+        GROUP BY size_variant_id
+    ) h
+    JOIN {size} s ON s.id = h.id
+    WHERE s.stock - COALESCE((
+        SELECT SUM(r.quantity) FROM {hold} r
+        WHERE r.size_variant_id = h.id AND r.expires_at > NOW() AND r.order_id <> ALL(%(orders)s)
+    ), 0) < h.qty
+"""
+
+# Orders ke holds (size-wise SUM) -> stock me permanent decrement
+CONVERT_SQL = """
+    UPDATE {size} s SET stock = s.stock - h.qty
+    FROM (
+        SELECT size_variant_id AS id, SUM(quantity) AS qty
+        FROM {hold} WHERE order_id = ANY(%(orders)s)
+        GROUP BY size_variant_id
+    ) h
+    WHERE s.id = h.id
+    RETURNING s.id, s.size, s.variant_id, h.qty
+"""
+
+# Suit/Saree (FREE size) me variant ka master stock bhi kam hota hai
+CONVERT_VARIANT_SQL = """
+    UPDATE {variant} v SET stock = v.stock - x.qty
+    FROM (VALUES {values}) AS x(id, qty)
+    WHERE v.id = x.id
+"""
+
+# Expired holds wale pending orders (id ke keyset se, PhonePe PENDING wale agle batch me dobara nahi)
+EXPIRED_ORDERS_SQL = """
+    SELECT o.id FROM {order} o
+    WHERE o.status = 'pending' AND o.id > %s AND EXISTS (
+        SELECT 1 FROM {hold} r WHERE r.order_id = o.id AND r.expires_at <= NOW()
+    )
+    ORDER BY o.id
+    LIMIT %s
+"""
+
+# PhonePe ne FAILED / order hi nahi bataya: ek UPDATE me cancel (SKIP LOCKED - jis order ka
+# payment abhi confirm ho raha hai use chhod do, agle run me dekhenge)
+CANCEL_ORDERS_SQL = """
+    UPDATE {order} o SET status = 'cancelled', updated_at = NOW()
+    WHERE o.id IN (
+        SELECT o2.id FROM {order} o2
+        WHERE o2.id = ANY(%s) AND o2.status = 'pending'
+        ORDER BY o2.id
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING o.id
+"""
+
+# Expired holds jinka order ab pending nahi (e.g. .update() se badla). Pending order ka
+# expired hold rehta hai, warna confirm par convert karne ko kuch nahi bachega.
+DELETE_ORPHAN_HOLDS_SQL = """
+    DELETE FROM {hold}
+    WHERE id IN (
+        SELECT r.id FROM {hold} r
+        JOIN {order} o ON o.id = r.order_id
+        WHERE r.expires_at <= NOW() AND o.status <> 'pending'
+        ORDER BY r.id
+        LIMIT %s
+    )
+    RETURNING size_variant_id
+"""
+
+
+def stock_changed(size_ids):
+    """
+    Raw SQL signals nahi chalata: product summary (total_stock / in_stock) commit ke baad.
+    Documents aur catalog ETag nahi - stock har request par live padha jata hai (shop/cache.py).
+    """
+    product_ids = list(set(
+        SizeVariant.objects.filter(id__in=set(size_ids)).values_list('variant__product_id', flat=True)
+    ))
+    if product_ids:
+        transaction.on_commit(lambda: refresh_product_summaries(product_ids))
+
+
+def short_holds(order_ids):
+    """
+    Orders ke jin sizes par ab hold jitna stock nahi (hold expire hua aur beech me bik gaya).
+    Bina lock ke check (admin form validation); convert_holds lock ke baad yahi dobara dekhta hai.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(SHORT_HOLDS_SQL.format(**_tables()), {'orders': list(order_ids)})
+        return [row[0] for row in cursor.fetchall()]
+
+
+def convert_holds(order_ids):
+    """
+    Orders confirm: saare holds -> permanent decrement (ek UPDATE), phir holds delete.
+    Kisi size ka stock ab hold jitna nahi bacha to HoldUnavailable (caller ka transaction rollback).
+    """
+    tables = _tables()
+    order_ids = list(order_ids)
+    params = {'orders': order_ids}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(LOCK_HELD_SQL.format(**tables), params)
+            short = short_holds(order_ids)
+            if short:
+                raise HoldUnavailable(f"Stock khatam ho chuka hai (sizes {short}), order confirm nahi ho sakta.")
+            cursor.execute(CONVERT_SQL.format(**tables), params)
+            converted = cursor.fetchall()
+            if not converted:
+                return 0
+            variants = {}
+            for _, size, variant_id, qty in converted:
+                if size == 'FREE':
+                    variants[variant_id] = variants.get(variant_id, 0) + qty
+            if variants:
+                values = ', '.join(['(%s::bigint, %s::integer)'] * len(variants))
+                cursor.execute(
+                    CONVERT_VARIANT_SQL.format(values=values, **tables),
+                    [p for pair in sorted(variants.items()) for p in pair],
+                )
+        StockReservation.objects.filter(order_id__in=order_ids).delete()
+        stock_changed([row[0] for row in converted])
+    return len(converted)
+
+
+def release_holds(order_ids):
+    """Orders cancel: holds hata do, stock phir se available."""
+    holds = StockReservation.objects.filter(order_id__in=list(order_ids))
+    with transaction.atomic():
+        size_ids = list(holds.values_list('size_variant_id', flat=True))
+        if size_ids:
+            holds.delete()
+            stock_changed(size_ids)
+    return len(size_ids)
+
+
+def release_expired_holds(batch_size=SWEEP_BATCH_SIZE):
+    """
+    Sweeper: expired holds wale pending orders ka PhonePe status dekho. Paid (COMPLETED) to
+    confirm, FAILED / payment shuru hi nahi hua to cancel + holds delete, PENDING ya status na
+    mila to chhod do. batch_size ke batches, har batch apna transaction.
+    Returns: (cancelled orders, confirmed orders, released holds). PhonePe auth fail = PhonePeError.
+    """
+    from .transitions import confirm_payment  # transitions is module ko import karta hai
+
+    tables = _tables()
+    cancelled = confirmed = released = 0
+    last_id = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(EXPIRED_ORDERS_SQL.format(**tables), [last_id, batch_size])
+            order_ids = [row[0] for row in cursor.fetchall()]
+
+        if order_ids:
+            last_id = order_ids[-1]
+            states = payment_states(order_ids)
+            for order_id, state in states.items():
+                if state == COMPLETED and confirm_payment(order_id) == 'confirmed':
+                    confirmed += 1
+            unpaid = [order_id for order_id, state in states.items() if state in (FAILED, NOT_FOUND)]
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(CANCEL_ORDERS_SQL.format(**tables), [unpaid])
+                    cancelled_ids = [row[0] for row in cursor.fetchall()]
+                notify_statuses(cancelled_ids, 'cancelled')  # .update() signals nahi chalata
+                released += release_holds(cancelled_ids)
+            cancelled += len(cancelled_ids)
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(DELETE_ORPHAN_HOLDS_SQL.format(**tables), [batch_size])
+                size_ids = [row[0] for row in cursor.fetchall()]
+            if size_ids:
+                stock_changed(size_ids)
+        released += len(size_ids)
+
+        if len(order_ids) < batch_size and len(size_ids) < batch_size:
+            return cancelled, confirmed, released
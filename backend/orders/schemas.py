@@ -39,6 +39,33 @@ class OrderOutSchema(Schema):
     # ✅ ये लाइन लिस्ट दिखाने के लिए सबसे ज़रूरी है
     items: List[OrderItemOutSchema]
 
+    @staticmethod
+    def resolve_applied_coupon_code(obj):
+        # select_related('applied_coupon') ke saath extra query nahi
+        return obj.applied_coupon.code if obj.applied_coupon_id else None
+
+class OrderSummarySchema(Schema):
+    """My Orders list ka halka card (items ke bina, sirf ginti)"""
+    id: int
+    invoice_no: Optional[str] = None
+    status: str
+    payment_method: str
+    total_amount: float
+    item_count: int
+    created_at: datetime
+
+class OrderPageSchema(Schema):
+    items: List[OrderOutSchema]
+    page_size: int
+    next_cursor: Optional[str] = None # Agla page laane ke liye opaque token
+    has_more: bool
+
+class OrderSummaryPageSchema(Schema):
+    items: List[OrderSummarySchema]
+    page_size: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
 # ==========================================
 # 2. ORDER INPUT SCHEMAS (For Creation)
 # ==========================================
@@ -49,7 +76,7 @@ class OrderItemCreateSchema(Schema):
     variant_id: Optional[int] = None
     size_id: Optional[int] = None
     quantity: int
-    price: float
+    price: float = 0 # Sirf display ke liye, order server ke price par banta hai (orders/pricing.py)
     size: str
     color: str
 
@@ -61,15 +88,48 @@ class OrderCreateSchema(Schema):
     address: str
     pincode: str
     payment_method: str
-    total_amount: float
-    shipping_charges: float
+    # Purane clients ke liye, ignore hote hain - total/shipping server calculate karta hai
+    total_amount: Optional[float] = None
+    shipping_charges: Optional[float] = None
     
     # ✅ Coupon Logic Input
     # Jab user coupon apply karega toh ye code backend pe jayega
     coupon_code: Optional[str] = None 
+
+    # ✅ /orders/quote ka signed token: ho to wahi amounts (dobara hisaab nahi)
+    quote: Optional[str] = None
     
     items: List[OrderItemCreateSchema]
 
+class QuoteRequestSchema(Schema):
+    """Checkout page: cart + coupon -> server ka price quote"""
+    items: List[OrderItemCreateSchema]
+    coupon_code: Optional[str] = None
+
+class QuoteLineSchema(Schema):
+    size_id: int
+    product_name: str
+    size: str
+    color: str
+    quantity: int
+    unit_price_paise: int
+    line_total_paise: int
+    available_stock: int
+    in_stock: bool
+
+class QuoteSchema(Schema):
+    """Saari amounts integer paise me (₹1 = 100)"""
+    lines: List[QuoteLineSchema]
+    subtotal_paise: int
+    discount_paise: int
+    shipping_paise: int
+    total_paise: int
+    coupon_code: Optional[str] = None
+    coupon_message: Optional[str] = None # Coupon laga nahi to wajah
+    in_stock: bool
+    quote: str # Signed token, create_order me bhejo
+    expires_in: int # Seconds
+
 # ==========================================
 # 3. UTILITY SCHEMAS (For Error Handling)
 # ==========================================
@@ -1,31 +1,14 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import Order
+from .transitions import status_changed
 
-@receiver(pre_save, sender=Order)
-def track_status_change(sender, instance, **kwargs):
-    if instance.id:
-        try:
-            instance._previous_status = Order.objects.get(id=instance.id).status
-        except Order.DoesNotExist:
-             instance._previous_status = None
-    else:
-        instance._previous_status = None
+# Pichla status Order.save() khud set karta hai (from_db wala loaded status), yahan koi SELECT nahi
 
 @receiver(post_save, sender=Order)
-def update_inventory_on_return(sender, instance, created, **kwargs):
-    # Check agar status 'returned' hua hai aur pehle nahi tha
-    if hasattr(instance, '_previous_status') and \
-       instance._previous_status != 'returned' and \
-       instance.status == 'returned':
-        
-        for item in instance.items.all():
-            if item.size_variant:
-                # 1. SizeVariant ka stock badhao
-                item.size_variant.stock += item.quantity
-                item.size_variant.save()
-                
-                # 2. Agar Suit/Saree hai (FREE size), toh Variant ka stock bhi badhao
-                if item.size_variant.size == 'FREE':
-                    item.size_variant.variant.stock += item.quantity
-                    item.size_variant.variant.save()
\ No newline at end of file
+def apply_status_change(sender, instance, created, **kwargs):
+    # ✅ Status badla to state machine ke side effects: holds convert/release, restock (return/cancel),
+    # bestseller buckets, SSE event - sab orders/transitions.py me, set-based
+    if created:
+        return
+    status_changed({instance.id: getattr(instance, '_previous_status', None)}, instance.status)
@@ -1,3 +1,699 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from coupons.models import Coupon
+from ninja_jwt.tokens import RefreshToken
+
+from shop.models import CatalogVersion, Category, Product, ProductVariant, SizeVariant
+
+from . import views
+from .events import events_token
+from .invoices import financial_year, next_invoice_no
+from .models import IdempotencyKey, Order, OrderItem, StockReservation
+from .phonepe import COMPLETED, FAILED, NOT_FOUND, PhonePeError
+from .pricing import QUOTE_SALT, QUOTE_TTL_SECONDS, coupon_discount, shipping_for, to_paise, use_coupon
+from .reservations import HoldUnavailable, convert_holds, release_expired_holds
+from .transitions import bulk_transition, check_transition, confirm_payment
+
+
+# UPI/card checkout ke liye flag + confirm secret + PhonePe keys (orders/phonepe.py online_payments_ready)
+online_payments = override_settings(
+    ONLINE_PAYMENTS_ENABLED=True, PAYMENT_CONFIRM_SECRET="confirm-secret",
+    PHONEPE_CLIENT_ID="client-id", PHONEPE_CLIENT_SECRET="client-secret",
+)
+
+
+class CheckoutFixtures:
+    """Checkout tests ke liye chhote helpers: ek product line aur /orders/create ka body."""
+
+    def make_line(self, name="Cotton Kurti", price=999, size="M", stock=5, variant_stock=10):
+        category, _ = Category.objects.get_or_create(name="Kurti Sets", defaults={"has_size": True})
+        product = Product.objects.create(category=category, name=name, description="Daily wear", base_price=price)
+        variant = ProductVariant.objects.create(
+            product=product, color_name="Red", color_code="#ff0000", stock=variant_stock
+        )
+        return SizeVariant.objects.create(variant=variant, size=size, stock=stock)
+
+    def order_body(self, lines, payment_method="cod", **extra):
+        return json.dumps({
+            "full_name": "Asha", "phone_number": "+919111111111", "address": "MG Road", "pincode": "110001",
+            "payment_method": payment_method,
+            "items": [
+                {"product_id": s.variant.product_id, "size_id": s.id, "quantity": qty, "size": s.size, "color": "Red"}
+                for s, qty in lines
+            ],
+            **extra,
+        })
+
+    def post_order(self, body, key=None, client=None):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        return (client or self.client).post("/api/orders/create", body, content_type="application/json", **headers)
+
+
+class CheckoutTests(CheckoutFixtures, TestCase):
+    """Stock check, FREE size ka master stock, COD decrement vs online hold."""
+
+    def test_insufficient_stock_changes_nothing(self):
+        enough = self.make_line(name="Enough", stock=5)
+        short = self.make_line(name="Short", stock=1)
+        response = self.post_order(self.order_body([(enough, 2), (short, 2)]))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Short", response.json()["message"])
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertEqual(OrderItem.objects.count(), 0)
+        enough.refresh_from_db()
+        short.refresh_from_db()
+        self.assertEqual((enough.stock, short.stock), (5, 1))
+
+    def test_free_size_decrements_variant_master_stock(self):
+        size = self.make_line(name="Silk Saree", size="FREE", stock=5, variant_stock=10)
+        response = self.post_order(self.order_body([(size, 2)]))
+
+        self.assertEqual(response.status_code, 200)
+        size.refresh_from_db()
+        size.variant.refresh_from_db()
+        self.assertEqual(size.stock, 3)
+        self.assertEqual(size.variant.stock, 8)
+
+    def test_same_size_in_two_lines_is_checked_together(self):
+        size = self.make_line(stock=3)
+        response = self.post_order(self.order_body([(size, 2), (size, 2)]))
+
+        self.assertEqual(response.status_code, 400)
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 3)
+
+    @override_settings(ONLINE_PAYMENTS_ENABLED=True, PHONEPE_CLIENT_ID="", PHONEPE_CLIENT_SECRET="")
+    def test_online_checkout_rejected_without_keys(self):
+        size = self.make_line(stock=5)
+        response = self.post_order(self.order_body([(size, 1)], payment_method="upi"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertEqual(self.post_order(self.order_body([(size, 1)])).status_code, 200)  # COD chalta hai
+
+    @online_payments
+    def test_online_holds_and_cod_decrements(self):
+        size = self.make_line(stock=5)
+
+        online = self.post_order(self.order_body([(size, 3)], payment_method="upi"))
+        self.assertEqual(online.status_code, 200)
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 5)  # Online: sirf hold, stock nahi
+        hold = StockReservation.objects.get()
+        self.assertEqual((hold.order_id, hold.size_variant_id, hold.quantity), (online.json()["order_id"], size.id, 3))
+
+        # Hold ke baad 2 hi bache: COD 3 nahi le sakta, 2 le sakta hai
+        self.assertEqual(self.post_order(self.order_body([(size, 3)])).status_code, 400)
+        cod = self.post_order(self.order_body([(size, 2)]))
+        self.assertEqual(cod.status_code, 200)
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 3)
+        self.assertFalse(StockReservation.objects.filter(order_id=cod.json()["order_id"]).exists())
+
+
+class IdempotencyTests(CheckoutFixtures, TestCase):
+    """Same Idempotency-Key par dobara order nahi banna chahiye."""
+
+    def setUp(self):
+        self.size = self.make_line(stock=5)
+
+    def test_replay_returns_first_response(self):
+        body = self.order_body([(self.size, 1)])
+        first = self.post_order(body, key="checkout-1")
+        second = self.post_order(body, key="checkout-1")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(Order.objects.count(), 1)
+        self.size.refresh_from_db()
+        self.assertEqual(self.size.stock, 4)
+
+    def test_same_key_different_body_conflicts(self):
+        self.post_order(self.order_body([(self.size, 1)]), key="checkout-1")
+        response = self.post_order(self.order_body([(self.size, 2)]), key="checkout-1")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_attempt_releases_key(self):
+        # Stock kam tha: 400, rollback me key ka claim bhi gaya - stock aane par wahi key chalti hai
+        body = self.order_body([(self.size, 6)])
+        self.assertEqual(self.post_order(body, key="checkout-1").status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.filter(key="checkout-1").exists())
+
+        SizeVariant.objects.filter(id=self.size.id).update(stock=10)
+        self.assertEqual(self.post_order(body, key="checkout-1").status_code, 200)
+
+    def test_key_too_long_rejected(self):
+        response = self.post_order(self.order_body([(self.size, 1)]), key="k" * 65)
+        self.assertEqual(response.status_code, 400)
+
+
+class ConcurrentIdempotencyTests(CheckoutFixtures, TransactionTestCase):
+    """Do parallel requests same key ke saath: ek hi order, dono ko wahi response."""
+
+    def test_concurrent_claim_creates_one_order(self):
+        size = self.make_line(stock=5)
+        body = self.order_body([(size, 1)])
+        barrier = threading.Barrier(2)
+        responses = []
+
+        def checkout():
+            try:
+                barrier.wait()
+                response = self.post_order(body, key="double-tap", client=Client())
+                responses.append((response.status_code, response.json()))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=checkout) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([status for status, _ in responses], [200, 200])
+        self.assertEqual(responses[0][1]["order_id"], responses[1][1]["order_id"])
+        self.assertEqual(Order.objects.count(), 1)
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 4)
+
+
+class PricingTests(CheckoutFixtures, TestCase):
+    """Paise ka hisaab, free shipping boundary, quote token aur coupon ki daily ginti."""
+
+    def quote(self, lines, coupon_code=None):
+        body = {"items": json.loads(self.order_body(lines))["items"], "coupon_code": coupon_code}
+        return self.client.post("/api/orders/quote", json.dumps(body), content_type="application/json")
+
+    def make_coupon(self, **fields):
+        return Coupon.objects.create(
+            code="SAVE", discount_value=10, valid_until=timezone.now() + timedelta(days=1), **fields
+        )
+
+    def test_to_paise_rounds_half_up(self):
+        self.assertEqual(to_paise(Decimal("10.005")), 1001)
+        self.assertEqual(to_paise(Decimal("10.004")), 1000)
+        self.assertEqual(to_paise("999.99"), 99999)
+
+    def test_percentage_discount_rounds_half_up(self):
+        # 12.5% of ₹999 = 12487.5 paise -> 12488
+        coupon = self.make_coupon(coupon_type='PERCENTAGE')
+        coupon.discount_value = Decimal("12.5")
+        self.assertEqual(coupon_discount(coupon, 999_00), (12488, None))
+
+    def test_shipping_free_only_above_1499(self):
+        self.assertEqual(shipping_for(1499_00), 99_00)
+        self.assertEqual(shipping_for(1499_01), 0)
+
+        at_boundary = self.quote([(self.make_line(name="Boundary", price=1499), 1)]).json()
+        self.assertEqual(at_boundary["shipping_paise"], 99_00)
+        self.assertEqual(at_boundary["total_paise"], 1598_00)
+
+        above = self.quote([(self.make_line(name="Above", price=Decimal("1499.01")), 1)]).json()
+        self.assertEqual(above["shipping_paise"], 0)
+        self.assertEqual(above["total_paise"], 1499_01)
+
+    def test_tampered_quote_rejected(self):
+        size = self.make_line(stock=5)
+        token = self.quote([(size, 1)]).json()["quote"]
+        payload = signing.loads(token, salt=QUOTE_SALT)
+        payload["total"] = 1_00
+        forged = signing.dumps(payload, salt=QUOTE_SALT, compress=True, key="not-the-secret")
+
+        for bad in (forged, token[:-2] + "xx"):
+            response = self.post_order(self.order_body([(size, 1)], quote=bad))
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()["message"], "Invalid price quote.")
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_expired_quote_rejected(self):
+        size = self.make_line(stock=5)
+        issued_at = time.time() - QUOTE_TTL_SECONDS - 60
+        with mock.patch("django.core.signing.time.time", return_value=issued_at):
+            token = self.quote([(size, 1)]).json()["quote"]
+
+        response = self.post_order(self.order_body([(size, 1)], quote=token))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("expire", response.json()["message"])
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_order_uses_quoted_amounts(self):
+        size = self.make_line(price=999, stock=5)
+        token = self.quote([(size, 1)]).json()["quote"]
+        response = self.post_order(self.order_body([(size, 1)], quote=token))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Order.objects.get().total_amount, Decimal("1098.00"))
+
+    def test_coupon_use_resets_daily_count_on_new_day(self):
+        coupon = self.make_coupon(coupon_type='FLAT')
+        yesterday = timezone.now().date() - timedelta(days=1)
+        Coupon.objects.filter(id=coupon.id).update(last_used_date=yesterday, today_usage_count=5)
+
+        size = self.make_line(stock=5)
+        response = self.post_order(self.order_body([(size, 1)], coupon_code="SAVE"))
+
+        self.assertEqual(response.status_code, 200)
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.times_used, 1)
+        self.assertEqual(coupon.last_used_date, timezone.now().date())
+        self.assertEqual(coupon.today_usage_count, 0)
+
+    def test_coupon_use_keeps_todays_count(self):
+        coupon = self.make_coupon(coupon_type='FLAT')
+        Coupon.objects.filter(id=coupon.id).update(today_usage_count=3)
+
+        size = self.make_line(stock=5)
+        self.post_order(self.order_body([(size, 1)], coupon_code="SAVE"))
+
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.times_used, 1)
+        self.assertEqual(coupon.today_usage_count, 3)
+
+    def test_coupon_total_limit_exhausted(self):
+        # Quote ke baad parallel order ne aakhri use le liya: UPDATE kuch nahi badalta
+        coupon = self.make_coupon(coupon_type='FLAT', total_usage_limit=1)
+        Coupon.objects.filter(id=coupon.id).update(times_used=1)
+
+        self.assertFalse(use_coupon(coupon.id))
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.times_used, 1)
+
+
+class TransitionTests(CheckoutFixtures, TestCase):
+    """Status state machine: galat moves rukte hain, restock / holds sahi orders par."""
+
+    def place(self, lines, payment_method="cod"):
+        response = self.post_order(self.order_body(lines, payment_method=payment_method))
+        self.assertEqual(response.status_code, 200)
+        return Order.objects.get(id=response.json()["order_id"])
+
+    def test_check_transition_rejects_illegal_moves(self):
+        for previous, status in [('pending', 'shipped'), ('delivered', 'pending'), ('cancelled', 'confirmed'),
+                                 ('returned', 'delivered')]:
+            with self.assertRaises(ValidationError) as raised:
+                check_transition(previous, status)
+            self.assertIn('status', raised.exception.message_dict)
+
+        check_transition('pending', 'confirmed')
+        check_transition('shipped', 'shipped')
+        check_transition(None, 'pending')
+
+    def test_clean_rejects_illegal_move(self):
+        order = self.place([(self.make_line(stock=5), 1)])
+        order = Order.objects.get(id=order.id)
+        order.status = 'delivered'
+        with self.assertRaises(ValidationError):
+            order.clean()
+
+    def test_bulk_transition_skips_illegal_rows(self):
+        size = self.make_line(stock=10)
+        pending = self.place([(size, 1)])
+        shipped = self.place([(size, 1)])
+        Order.objects.filter(id=shipped.id).update(status='shipped')
+
+        changed = bulk_transition([pending.id, shipped.id], 'confirmed')
+
+        self.assertEqual(changed, {pending.id: 'pending'})
+        self.assertEqual(
+            dict(Order.objects.values_list('id', 'status')),
+            {pending.id: 'confirmed', shipped.id: 'shipped'},
+        )
+
+    def test_cancel_restocks_summed_lines_of_same_size(self):
+        size = self.make_line(stock=5)
+        saree = self.make_line(name="Silk Saree", size="FREE", stock=4, variant_stock=6)
+        order = self.place([(size, 2), (size, 1), (saree, 1), (saree, 2)])
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 2)
+
+        bulk_transition([order.id], 'cancelled')
+
+        size.refresh_from_db()
+        saree.refresh_from_db()
+        saree.variant.refresh_from_db()
+        self.assertEqual((size.stock, saree.stock, saree.variant.stock), (5, 4, 6))
+
+    @online_payments
+    def test_cancel_of_held_order_releases_holds_without_restock(self):
+        size = self.make_line(stock=5)
+        order = self.place([(size, 2)], payment_method="upi")
+
+        bulk_transition([order.id], 'cancelled')
+
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 5)
+        self.assertFalse(StockReservation.objects.exists())
+
+    @online_payments
+    def test_returned_with_unconverted_holds_does_not_restock(self):
+        # Status seedha save (transition check sirf clean() me): holds kabhi convert nahi hue
+        size = self.make_line(stock=5)
+        order = Order.objects.get(id=self.place([(size, 2)], payment_method="upi").id)
+        order.status = 'returned'
+        order.save()
+
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 5)
+        self.assertFalse(StockReservation.objects.exists())
+
+    @online_payments
+    def test_return_after_confirm_restocks(self):
+        size = self.make_line(stock=5)
+        order = self.place([(size, 2)], payment_method="upi")
+        for status in ('confirmed', 'shipped', 'delivered', 'return_requested', 'returned'):
+            bulk_transition([order.id], status)
+
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 5)
+        self.assertFalse(StockReservation.objects.exists())
+
+
+class LiveStockTests(CheckoutFixtures, TestCase):
+    """Checkout / holds product document ya catalog ETag nahi badalte, stock request par live aata hai."""
+
+    def product_stock(self, size):
+        response = self.client.get(f"/api/shop/products/{size.variant.product_id}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["variants"][0]["sizes"][0]["stock"]
+
+    def test_checkout_leaves_catalog_version_and_document_alone(self):
+        size = self.make_line(stock=5)
+        self.assertEqual(self.product_stock(size), 5)  # Document ab cache me
+        version = CatalogVersion.objects.filter(id=1).values_list('version', flat=True).first()
+        updated_at = Product.objects.get(id=size.variant.product_id).updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.post_order(self.order_body([(size, 1)])).status_code, 200)
+
+        self.assertEqual(CatalogVersion.objects.filter(id=1).values_list('version', flat=True).first(), version)
+        self.assertEqual(Product.objects.get(id=size.variant.product_id).updated_at, updated_at)
+        self.assertEqual(self.product_stock(size), 4)
+
+    @online_payments
+    def test_expired_hold_frees_stock_without_sweeper(self):
+        size = self.make_line(stock=5)
+        self.post_order(self.order_body([(size, 3)], payment_method="upi"))
+        self.assertEqual(self.product_stock(size), 2)
+
+        StockReservation.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self.product_stock(size), 5)
+
+
+@online_payments
+class ReservationTests(CheckoutFixtures, TestCase):
+    """Online order ke holds: confirm par convert, expire ke baad stock bik gaya to cancel, sweeper."""
+
+    def place_online(self, size, qty):
+        response = self.post_order(self.order_body([(size, qty)], payment_method="upi"))
+        self.assertEqual(response.status_code, 200)
+        return response.json()["order_id"]
+
+    def expire(self, *order_ids):
+        StockReservation.objects.filter(order_id__in=order_ids).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+    def test_convert_holds_decrements_stock(self):
+        size = self.make_line(stock=5)
+        saree = self.make_line(name="Silk Saree", size="FREE", stock=4, variant_stock=4)
+        order_id = self.post_order(self.order_body([(size, 2), (saree, 1)], payment_method="upi")).json()["order_id"]
+
+        self.assertEqual(convert_holds([order_id]), 2)
+
+        size.refresh_from_db()
+        saree.refresh_from_db()
+        saree.variant.refresh_from_db()
+        self.assertEqual((size.stock, saree.stock, saree.variant.stock), (3, 3, 3))
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_expired_hold_sold_elsewhere_cannot_convert(self):
+        size = self.make_line(stock=3)
+        order_id = self.place_online(size, 2)
+        self.expire(order_id)
+        self.assertEqual(self.post_order(self.order_body([(size, 2)])).status_code, 200)  # COD ne le liya
+
+        with self.assertRaises(HoldUnavailable):
+            convert_holds([order_id])
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 1)
+
+    def test_confirm_payment_cancels_when_stock_gone(self):
+        size = self.make_line(stock=3)
+        order_id = self.place_online(size, 2)
+        self.expire(order_id)
+        self.post_order(self.order_body([(size, 2)]))
+
+        with self.assertLogs('orders.transitions', 'WARNING'):
+            self.assertEqual(confirm_payment(order_id), 'cancelled')
+        self.assertEqual(Order.objects.get(id=order_id).status, 'cancelled')
+        self.assertFalse(StockReservation.objects.filter(order_id=order_id).exists())
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 1)  # Na negative, na restock
+
+    def test_admin_rejects_confirm_when_stock_gone(self):
+        size = self.make_line(stock=3)
+        order_id = self.place_online(size, 2)
+        self.expire(order_id)
+        self.post_order(self.order_body([(size, 2)]))
+
+        order = Order.objects.get(id=order_id)
+        order.status = 'confirmed'
+        with self.assertRaises(ValidationError) as raised:
+            order.full_clean()
+        self.assertIn('status', raised.exception.message_dict)
+
+        # Admin change form: field error, koi "changed successfully" / LogEntry nahi
+        admin_user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        url = f"/admin/orders/order/{order_id}/change/"
+        context = self.client.get(url).context
+        data = {
+            name: "" if value is None else value
+            for name, value in context["adminform"].form.initial.items()
+            if name in context["adminform"].form.fields
+        }
+        for inline in context["inline_admin_formsets"]:
+            formset = inline.formset
+            management = formset.management_form
+            data.update({management.add_prefix(name): value for name, value in management.initial.items()})
+            for form in formset.forms:
+                data.update({form.add_prefix(name): "" if value is None else value for name, value in form.initial.items()})
+                data[form.add_prefix("id")] = form.instance.pk
+                data[form.add_prefix(formset.fk.name)] = order_id
+        data["status"] = "confirmed"
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)  # Redirect nahi, form dobara dikha
+        self.assertIn("status", response.context["adminform"].form.errors)
+        self.assertEqual([str(m) for m in response.context["messages"]], [])
+        self.assertEqual(Order.objects.get(id=order_id).status, 'pending')
+        self.assertFalse(LogEntry.objects.exists())
+
+    def test_confirm_payment(self):
+        size = self.make_line(stock=3)
+        order_id = self.place_online(size, 2)
+        self.assertEqual(confirm_payment(order_id), 'confirmed')
+        self.assertEqual(confirm_payment(order_id), 'confirmed')  # Dobara call: kuch nahi badla
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 1)
+        self.assertIsNone(confirm_payment(999999))
+
+    def test_sweeper_follows_phonepe_state(self):
+        size = self.make_line(stock=10)
+        paid, failed, abandoned, waiting, live = (self.place_online(size, 1) for _ in range(5))
+        orphan = self.place_online(size, 1)
+        self.expire(paid, failed, abandoned, waiting, orphan)
+        Order.objects.filter(id=orphan).update(status='cancelled')  # .update(): signals nahi, hold bacha
+
+        states = {paid: COMPLETED, failed: FAILED, abandoned: NOT_FOUND, waiting: 'PENDING'}
+        def payment_states(order_ids):
+            return {order_id: states[order_id] for order_id in order_ids if order_id in states}
+
+        with mock.patch("orders.reservations.payment_states", side_effect=payment_states) as phonepe:
+            self.assertEqual(release_expired_holds(batch_size=2), (2, 1, 3))
+
+        asked = [order_id for call in phonepe.call_args_list for order_id in call.args[0]]
+        self.assertEqual(asked, [paid, failed, abandoned, waiting])  # Live hold wala order nahi poocha
+        self.assertEqual(dict(Order.objects.values_list('id', 'status')), {
+            paid: 'confirmed', failed: 'cancelled', abandoned: 'cancelled', waiting: 'pending', live: 'pending',
+            orphan: 'cancelled',
+        })
+        self.assertEqual(
+            sorted(StockReservation.objects.values_list('order_id', flat=True)), [waiting, live]
+        )
+        size.refresh_from_db()
+        self.assertEqual(size.stock, 9)  # Sirf paid order convert hua
+
+    def test_sweeper_leaves_orders_when_phonepe_down(self):
+        size = self.make_line(stock=5)
+        order_id = self.place_online(size, 1)
+        self.expire(order_id)
+
+        with mock.patch("orders.reservations.payment_states", side_effect=PhonePeError("down")):
+            with self.assertRaises(PhonePeError):
+                release_expired_holds()
+        self.assertEqual(Order.objects.get(id=order_id).status, 'pending')
+        self.assertTrue(StockReservation.objects.filter(order_id=order_id).exists())
+
+
+class InvoiceNumberTests(CheckoutFixtures, TestCase):
+    """Financial year (April-March) ke hisaab se gap-free invoice numbers."""
+
+    def test_financial_year_boundaries(self):
+        self.assertEqual(financial_year(date(2026, 3, 31)), "2025-26")
+        self.assertEqual(financial_year(date(2026, 4, 1)), "2026-27")
+        self.assertEqual(financial_year(date(2027, 2, 1)), "2026-27")
+        self.assertEqual(financial_year(date(2099, 12, 31)), "2099-00")
+
+    def test_sequence_and_year_rollover(self):
+        march, april = date(2026, 3, 31), date(2026, 4, 1)
+        self.assertEqual(next_invoice_no(march), "NC-2025-26-0001")
+        self.assertEqual(next_invoice_no(march), "NC-2025-26-0002")
+        self.assertEqual(next_invoice_no(april), "NC-2026-27-0001")  # Naya saal, naya counter
+        self.assertEqual(next_invoice_no(march), "NC-2025-26-0003")
+
+    def test_rollback_returns_number(self):
+        day = date(2026, 10, 18)
+        self.assertEqual(next_invoice_no(day), "NC-2026-27-0001")
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.assertEqual(next_invoice_no(day), "NC-2026-27-0002")
+                raise RuntimeError("order fail")
+        self.assertEqual(next_invoice_no(day), "NC-2026-27-0002")
+
+    def test_failed_checkout_leaves_no_gap(self):
+        size = self.make_line(stock=1)
+        first = self.post_order(self.order_body([(size, 1)])).json()["order_id"]
+        self.assertEqual(self.post_order(self.order_body([(size, 1)])).status_code, 400)  # Stock khatam
+        SizeVariant.objects.filter(id=size.id).update(stock=1)
+        second = self.post_order(self.order_body([(size, 1)])).json()["order_id"]
+
+        numbers = [Order.objects.get(id=order_id).invoice_no for order_id in (first, second)]
+        self.assertEqual([int(n.rsplit("-", 1)[1]) for n in numbers], [1, 2])
+
+
+class CustomerOrderTests(CheckoutFixtures, TestCase):
+    """My orders: account se jude ya usi phone ke guest orders, dusre customer ka order kabhi nahi."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="asha", password="secret", phone_number="+919111111111"
+        )
+        self.size = self.make_line(stock=20)
+        self.linked = self.place("+919111111111")  # Phone match par user se jud jaata hai
+        self.guest = self.place("9111111111")  # Guest checkout, +91 ke bina
+        self.other_phone = self.place("+919333333333")
+        Order.objects.filter(id=self.other_phone).update(user=self.user)  # Account se juda, phone alag
+        self.stranger = self.place("+919222222222")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    def place(self, phone):
+        response = self.post_order(self.order_body([(self.size, 1)], phone_number=phone))
+        self.assertEqual(response.status_code, 200)
+        return response.json()["order_id"]
+
+    def test_my_orders_match_user_or_phone(self):
+        data = self.client.get("/api/orders/my-orders/summary", **self.auth).json()
+        self.assertEqual(
+            [item["id"] for item in data["items"]], [self.other_phone, self.guest, self.linked]  # Naya pehle
+        )
+        self.assertEqual(Order.objects.get(id=self.linked).user_id, self.user.id)
+
+    def test_order_detail_only_for_owner(self):
+        self.assertEqual(self.client.get(f"/api/orders/my-orders/{self.guest}", **self.auth).status_code, 200)
+        self.assertEqual(self.client.get(f"/api/orders/my-orders/{self.stranger}", **self.auth).status_code, 404)
+        self.assertEqual(
+            self.client.get(f"/api/orders/my-orders/{self.stranger}/events-token", **self.auth).status_code, 404
+        )
+        self.assertEqual(self.client.get(f"/api/orders/my-orders/{self.guest}").status_code, 401)
+
+    def test_public_order_detail_removed(self):
+        # Pehle bina login GET /orders/{id} se kisi ka bhi naam / phone / address dikh jaata tha
+        response = self.client.get(f"/api/orders/{self.stranger}")
+        self.assertEqual(response.status_code, 404)
+
+
+class FakeBroker:
+    """LISTEN connection ki jagah: subscribe par pehle se rakhe events queue me."""
+
+    def __init__(self, *events):
+        self.events = events
+        self.resubscribed = 0
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, order_id):
+        queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        yield queue
+
+    async def resubscribe(self):
+        self.resubscribed += 1
+
+
+class StatusStreamTests(SimpleTestCase):
+    """SSE stream: pehla status DB se, phir sirf naye statuses, final status par band."""
+
+    def stream(self, broker, *db_statuses):
+        async def collect():
+            return [chunk async for chunk in views._status_stream(7)]
+
+        fetch = mock.AsyncMock(side_effect=db_statuses)
+        with mock.patch.object(views, "broker", broker), mock.patch.object(views, "_fetch_status", fetch):
+            return asyncio.run(asyncio.wait_for(collect(), 5))
+
+    def statuses(self, chunks):
+        return [json.loads(chunk.split("data: ")[1])["status"] for chunk in chunks if chunk.startswith("event:")]
+
+    def test_final_status_ends_stream_immediately(self):
+        chunks = self.stream(FakeBroker({"status": "shipped"}), "cancelled")
+        self.assertEqual(self.statuses(chunks), ["cancelled"])
+
+    def test_pushes_changes_until_final_and_drops_duplicates(self):
+        broker = FakeBroker({"status": "pending"}, {"status": "confirmed"}, {"status": "confirmed"},
+                            {"status": "cancelled"}, {"status": "pending"})
+        chunks = self.stream(broker, "pending")
+        self.assertEqual(self.statuses(chunks), ["pending", "confirmed", "cancelled"])
+
+    def test_reconnect_rereads_status(self):
+        broker = FakeBroker(None, {"status": "returned"})
+        chunks = self.stream(broker, "delivered", "return_requested")
+        self.assertEqual(self.statuses(chunks), ["delivered", "return_requested", "returned"])
+        self.assertEqual(broker.resubscribed, 1)
+
+    def test_heartbeat_while_idle(self):
+        class SlowBroker(FakeBroker):
+            @contextlib.asynccontextmanager
+            async def subscribe(self, order_id):
+                queue = asyncio.Queue()
+                asyncio.get_running_loop().call_later(0.05, queue.put_nowait, {"status": "cancelled"})
+                yield queue
+
+        with mock.patch.object(views, "HEARTBEAT_SECONDS", 0.01):
+            chunks = self.stream(SlowBroker(), "pending")
+        self.assertIn(": ping\n\n", chunks)
+        self.assertEqual(self.statuses(chunks), ["pending", "cancelled"])
+
+    def test_unknown_order_sends_nothing(self):
+        self.assertEqual(self.stream(FakeBroker(), None), [])
+
+    def test_endpoint_requires_order_token(self):
+        self.assertEqual(self.client.get("/api/orders/7/events").status_code, 401)
+        self.assertEqual(self.client.get(f"/api/orders/7/events?token={events_token(8)}").status_code, 401)
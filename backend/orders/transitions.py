@@ -0,0 +1,174 @@
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+
+from shop.models import ProductVariant, SizeVariant
+from shop.sales import orders_status_changed
+
+from .events import notify_statuses
+from .models import Order, OrderItem, StockReservation
+from .reservations import HoldUnavailable, convert_holds, release_holds, short_holds, stock_changed
+
+logger = logging.getLogger(__name__)
+
+# --- ORDER STATUS STATE MACHINE ---
+# Status kahan se kahan ja sakta hai, aur badalne par kya hota hai - ek jagah.
+# - Pichla status: Order.from_db load hote waqt yaad rakhta hai (save par extra SELECT nahi)
+# - Single save (API / admin form): orders/signals.py -> status_changed({id: pichla}, naya)
+# - Admin bulk actions: bulk_transition() - saare orders EK UPDATE, phir wahi status_changed
+#   poore batch ke liye: holds convert/release, restock, bestseller buckets, SSE events
+#   har kaam ek set-based statement (orders kitne bhi hon)
+# Restock: return / cancel hua aur stock pehle kam ho chuka tha (COD / confirmed).
+# Jis order ke holds abhi bhi hain (online, payment confirm nahi hua) uska stock kabhi kam hua
+# hi nahi tha - return / cancel par sirf holds release, restock nahi.
+
+TRANSITIONS = {
+    'pending': ('confirmed', 'cancelled'),
+    'confirmed': ('shipped', 'cancelled'),
+    'shipped': ('delivered',),
+    'delivered': ('return_requested',),
+    'return_requested': ('returned', 'delivered'),  # Return reject hua to wapas delivered
+    'returned': (),
+    'cancelled': (),
+}
+
+BULK_UPDATE_SQL = """
+    UPDATE {order} o SET status = %s, updated_at = NOW()
+    FROM {order} old
+    WHERE old.id = o.id AND o.id = ANY(%s) AND o.status = ANY(%s)
+    RETURNING o.id, old.status
+"""
+
+
+def can_transition(previous_status, status):
+    """Same status (kuch nahi badla) ya naya order hamesha theek."""
+    return previous_status is None or previous_status == status or status in TRANSITIONS.get(previous_status, ())
+
+
+def check_transition(previous_status, status):
+    """Galat transition par ValidationError (admin form isse field error dikhata hai)."""
+    if not can_transition(previous_status, status):
+        labels = dict(Order.STATUS_CHOICES)
+        raise ValidationError(
+            {'status': f"Order '{labels.get(previous_status, previous_status)}' se "
+                       f"'{labels.get(status, status)}' nahi ho sakta."}
+        )
+
+
+def check_holds(order_id, status):
+    """
+    Pending online order aage badha to uske holds convert honge - stock bacha hai? Nahi to
+    ValidationError (admin form field error dikhata hai, save hi nahi hota).
+    """
+    if status in ('pending', 'cancelled', 'returned'):
+        return
+    if short_holds([order_id]):
+        raise ValidationError(
+            {'status': "Hold expire ho gaya aur stock bik chuka - order confirm nahi ho sakta, cancel karke refund karein."}
+        )
+
+
+def sources_for(status):
+    """Kin statuses se `status` me aa sakte hain."""
+    return [previous for previous, targets in TRANSITIONS.items() if status in targets]
+
+
+def restock(order_ids):
+    """
+    Orders ki saari lines ka stock wapas - size rows par ek F() + SUM subquery UPDATE (FREE size
+    ke liye variant par ek aur), item-by-item save nahi. Returns: restock hue size rows.
+    """
+    items = OrderItem.objects.filter(order_id__in=list(order_ids), size_variant__isnull=False)
+    with transaction.atomic():
+        # Checkout jaisa: size rows id ke order me lock, parallel checkout se deadlock nahi
+        size_ids = list(
+            SizeVariant.objects.select_for_update().filter(id__in=items.values('size_variant_id'))
+            .order_by('id').values_list('id', flat=True)
+        )
+        if not size_ids:
+            return 0
+
+        size_qty = items.filter(size_variant_id=OuterRef('pk')).values('size_variant_id').annotate(
+            total=Sum('quantity')
+        ).values('total')
+        SizeVariant.objects.filter(id__in=size_ids).update(stock=F('stock') + Subquery(size_qty))
+
+        # Suit/Saree (FREE size) me variant ka master stock bhi
+        free_items = items.filter(size_variant__size='FREE')
+        variant_qty = free_items.filter(size_variant__variant_id=OuterRef('pk')).values(
+            'size_variant__variant_id'
+        ).annotate(total=Sum('quantity')).values('total')
+        ProductVariant.objects.filter(id__in=free_items.values('size_variant__variant_id')).update(
+            stock=F('stock') + Subquery(variant_qty)
+        )
+
+        stock_changed(size_ids)
+        return len(size_ids)
+
+
+def status_changed(previous_statuses, status):
+    """
+    {order_id: pichla status} ke saare orders `status` me aa chuke (isi transaction me):
+    holds, stock, bestseller buckets aur live events ek-ek batch me.
+    """
+    previous_statuses = {
+        order_id: previous for order_id, previous in previous_statuses.items()
+        if previous is not None and previous != status
+    }
+    if not previous_statuses:
+        return
+
+    with_holds = set(
+        StockReservation.objects.filter(order_id__in=list(previous_statuses)).values_list('order_id', flat=True)
+        .distinct()
+    )
+
+    if status in ('cancelled', 'returned'):
+        if with_holds:
+            release_holds(with_holds)
+        restock([order_id for order_id in previous_statuses if order_id not in with_holds])
+    elif with_holds:
+        convert_holds(with_holds)
+
+    orders_status_changed(previous_statuses, status)
+    # Tracking page ke SSE subscribers ko (pg_notify commit par hi deliver hota hai)
+    notify_statuses(list(previous_statuses), status)
+
+
+def bulk_transition(order_ids, status):
+    """
+    Admin bulk action: jin orders ka transition legal hai unka status EK UPDATE me, baaki skip.
+    Returns: {order_id: pichla status} jo badle.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                BULK_UPDATE_SQL.format(order=Order._meta.db_table),
+                [status, list(order_ids), sources_for(status)],
+            )
+            changed = dict(cursor.fetchall())
+        status_changed(changed, status)
+    return changed
+
+
+def confirm_payment(order_id):
+    """
+    Payment mil gaya (PhonePe COMPLETED): pending -> confirmed, holds convert.
+    Hold expire hokar stock beech me bik gaya to order cancel (refund karna hoga).
+    Returns: order ka ab ka status, ya None (order nahi mila).
+    """
+    try:
+        with transaction.atomic():
+            order = Order.objects.select_for_update().filter(id=order_id).first()
+            if order is None:
+                return None
+            if order.status == 'pending':
+                order.status = 'confirmed'
+                order.save(update_fields=['status', 'updated_at'])
+            return order.status
+    except HoldUnavailable:
+        logger.warning("Paid order %s ka stock bik chuka, cancel karke refund karna hoga", order_id)
+        bulk_transition([order_id], 'cancelled')
+        return 'cancelled'
@@ -1,3 +1,58 @@
-from django.shortcuts import render
+import asyncio
+import json
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+
+from .events import FINAL_STATUSES, broker, events_token_valid
+from .models import Order
+
+# --- SSE: /api/orders/<id>/events?token=<signed order token> ---
+# Ninja router ke bahar plain async view, kyunki response ek lamba stream hai (ASGI par
+# har subscriber sirf ek coroutine). EventSource header nahi bhej sakta, isliye token query me -
+# JWT nahi, /orders/my-orders/{id}/events-token ka chhota signed token (orders/events.py).
+
+HEARTBEAT_SECONDS = 25  # Proxy/idle timeout se connection na kate
+
+
+def _event(order_id, status):
+    return f"event: status\ndata: {json.dumps({'id': order_id, 'status': status})}\n\n"
+
+
+async def _status_stream(order_id):
+    # Pehle LISTEN, phir DB se status: beech me commit hua transition bhi queue me milega
+    async with broker.subscribe(order_id) as queue:
+        status = await _fetch_status(order_id)
+        if status is None:
+            return
+        yield _event(order_id, status)
+        while status not in FINAL_STATUSES:
+            try:
+                event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is None:
+                # LISTEN connection dobara bana, beech ka event chhoot gaya ho sakta hai: DB se padho
+                await broker.resubscribe()
+                event = {'status': await _fetch_status(order_id)}
+            # Jo status bhej chuke (e.g. subscribe aur DB read ke beech wala event) dobara nahi
+            if event['status'] and event['status'] != status:
+                status = event['status']
+                yield _event(order_id, status)
+
+
+@sync_to_async
+def _fetch_status(order_id):
+    return Order.objects.filter(id=order_id).values_list('status', flat=True).first()
+
+
+async def order_events(request, order_id):
+    """Order tracking page: status badalte hi push (Server-Sent Events)."""
+    if not events_token_valid(request.GET.get('token', ''), order_id):
+        return JsonResponse({"success": False, "message": "Login required."}, status=401)
+
+    response = StreamingHttpResponse(_status_stream(order_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Nginx buffer na kare
+    return response
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from shop.summary import schedule_summary_refresh
+from .models import Review
+
+# ✅ Review add/edit/delete -> product ka rating summary (count, average, histogram) update
+@receiver([post_save, post_delete], sender=Review)
+def review_changed(sender, instance, **kwargs):
+    schedule_summary_refresh(instance.product_id)
@@ -1,4 +1,5 @@
 #!/bin/bash
 cd /home/ubuntu/nandani-collection-live/backend
 # Yahan 'python' ke baad '-u' laga diya
-/home/ubuntu/nandani-collection-live/venv/bin/python -u manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# ✅ ASGI (uvicorn): live order tracking ka SSE stream idle connections ko sasta rakhta hai
+/home/ubuntu/nandani-collection-live/venv/bin/python -u -m uvicorn backend.asgi:application --host 0.0.0.0 --port 8000
\ No newline at end of file
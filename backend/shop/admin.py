@@ -1,5 +1,11 @@
+import io
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.urls import path
 import nested_admin  # Ye library zaroori hai 3-level hierarchy ke liye
+from .catalog_io import CatalogImportError, export_catalog, import_catalog
 from .models import (
     Category, Banner, Announcement, 
     Product, ProductVariant, ProductImage, SizeVariant
@@ -51,6 +57,37 @@ class ProductAdmin(nested_admin.NestedModelAdmin):
     
     # Isse wo "Inline Adding" feature chalu ho jayega
     inlines = [ProductVariantInline]
+    actions = ['export_csv']
+
+    # ✅ Bahut saare products ek saath: CSV export / import (shop/catalog_io.py)
+    @admin.action(description="Export selected products as CSV")
+    def export_csv(self, request, queryset):
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="catalog.csv"'
+        export_catalog(response, queryset)
+        return response
+
+    def get_urls(self):
+        urls = [
+            path('import-csv/', self.admin_site.admin_view(self.import_csv_view), name='shop_product_import_csv'),
+        ]
+        return urls + super().get_urls()
+
+    def import_csv_view(self, request):
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            raise PermissionDenied
+        context = {**self.admin_site.each_context(request), 'opts': self.model._meta, 'title': "Import catalog CSV"}
+
+        if request.method == 'POST' and request.FILES.get('sheet'):
+            dry_run = bool(request.POST.get('dry_run'))
+            try:
+                stream = io.TextIOWrapper(request.FILES['sheet'].file, encoding='utf-8-sig', newline='')
+                plan, applied = import_catalog(stream, dry_run=dry_run)
+                context.update(summary=plan.summary(), changes=plan.changes[:500],
+                               hidden=max(len(plan.changes) - 500, 0), applied=applied, dry_run=dry_run)
+            except (CatalogImportError, UnicodeDecodeError) as e:
+                context['errors'] = getattr(e, 'errors', [str(e)])
+        return render(request, 'admin/shop/product/import_csv.html', context)
 
 # --- 3. Individual Admin (Debugging ke liye) ---
 # Agar kabhi seedha Stock check karna ho bina Product khole
@@ -1,8 +1,28 @@
-from ninja import Router # ✅ NinjaAPI की जगह Router लिया ताकि api_main में जुड़ सके
+from ninja import Router, Query # ✅ NinjaAPI की जगह Router लिया ताकि api_main में जुड़ सके
 from django.shortcuts import get_object_or_404
+from ninja.decorators import decorate_view
 from typing import List, Optional
 from .models import Product, Category, Banner, Announcement, ProductVariant
-from .schemas import ProductSchema
+from .schemas import (
+    ProductSchema, ProductPageSchema, ProductCardPageSchema, ProductFilterSchema, ProductFacetsSchema,
+    ProductBatchSchema, RelatedProductsSchema, StorefrontSchema, SuggestSchema,
+    StockBatchSchema, StockBatchResultSchema,
+)
+from .pagination import paginate_keyset, clamp_page_size, cursor_sort, InvalidCursor
+from .search import apply_search, SEARCH_SORTS
+from .facets import apply_facet_filters, compute_facets
+from .cache import get_product_documents, category_id_for
+from .cards import card_queryset, build_cards
+from .versioning import catalog_conditional
+from .bootstrap import storefront_etag, storefront_response
+from .suggest import suggest
+from .media import media_url
+from .images import srcset
+from .summary import SUMMARY_ONLY, apply_summary_sort, with_summaries
+from .recommendations import related_product_ids, TOP_K
+from .sales import apply_sales_sort
+from .inventory import InventoryKeyAuth, apply_stock_changes, MAX_ITEMS
+from django.views.decorators.http import condition
 # ❌ orders_router यहाँ से हटा दिया क्योंकि ये api_main में handle होगा
 
 # 1. Main Router Instance (Ise hi hum api_main me use karenge)
@@ -11,23 +31,27 @@ router = Router() # ✅ Iska naam 'router' hi rakhna taaki backend/api_main ise
 # --- HELPER ENDPOINTS ---
 
 @router.get("/announcements")
+@decorate_view(catalog_conditional)
 def list_announcements(request):
     data = Announcement.objects.filter(is_active=True)
     return list(data.values('text', 'link', 'background_color', 'text_color'))
 
 @router.get("/banners")
+@decorate_view(catalog_conditional)
 def list_banners(request):
     banners = Banner.objects.filter(is_active=True).order_by('-id')
     return [
         {
             "id": b.id, 
             "title": b.title, 
-            "image": request.build_absolute_uri(b.image.url) if b.image else ""
+            "image": media_url(b.image),
+            "srcset": srcset(b.renditions)
         } 
         for b in banners
     ]
 
 @router.get("/categories")
+@decorate_view(catalog_conditional)
 def list_categories(request):
     categories = Category.objects.all()
     return [
@@ -36,90 +60,158 @@ def list_categories(request):
             "name": c.name, 
             "has_size": c.has_size, 
             "slug": c.slug, 
-            "image": request.build_absolute_uri(c.image.url) if c.image else ""
+            "image": media_url(c.image),
+            "srcset": srcset(c.renditions)
         } 
         for c in categories
     ]
 
-# --- MAIN PRODUCT LOGIC (Safe Mode) ---
+@router.get("/bootstrap", response=StorefrontSchema)
+@decorate_view(condition(etag_func=storefront_etag))
+def storefront_bootstrap(request):
+    """Categories (active product counts ke saath) + announcements + banners, ek precomputed row se."""
+    return storefront_response(request)
 
-def serialize_product(request, p):
+@router.get("/suggest", response=SuggestSchema)
+def suggest_products(request, q: str = "", limit: int = None):
+    """Typeahead: in-memory prefix index se top suggestions (DB query nahi)."""
+    return {"items": suggest(q, limit)}
+
+# --- PRODUCT ENDPOINTS ---
+
+def filter_products(products, category=None, filters=None):
+    """Listing aur facets dono ke liye common category + facet filters."""
+    if category:
+        # ✅ Slug/naam ek baar id me resolve (cached), phir seedha category_id par filter
+        category_id = category_id_for(category)
+        if category_id is None:
+            return products.none()
+        products = products.filter(category_id=category_id)
+    if filters:
+        facet_filters = filters.dict()
+        min_rating = facet_filters.pop('min_rating', None)
+        if min_rating is not None:
+            products = products.filter(summary__avg_rating__gte=min_rating)
+        products = apply_facet_filters(products, **facet_filters)
+    return products
+
+def product_page(products, filters, category=None, search=None, sort=None, cursor=None, limit=None):
     """
-    Helper function jo Product Model ko JSON data mein convert karta hai.
-    Sare Images ko build_absolute_uri ke saath fix karta hai.
+    Listing ka common flow: filters + search + keyset page.
+    Returns: (page, next_cursor, has_more). Galat cursor par InvalidCursor.
     """
-    variants_data = []
-    
-    for v in p.variants.all():
-        sizes_data = []
-        
-        # 1. Size Logic
-        if v.sizes.exists():
-            for s in v.sizes.all():
-                sizes_data.append({
-                    "id": s.id,
-                    "size": s.size,
-                    "stock": s.stock,
-                    "price": float(p.base_price + (s.price_adjustment or 0)),
-                    "sku": s.sku or "" 
-                })
-        
-        # 2. Variant Data Pack karna
-        variants_data.append({
-            "id": v.id,
-            "color_name": v.color_name,
-            "color_code": v.color_code,
-            "thumbnail": request.build_absolute_uri(v.thumbnail.url) if v.thumbnail else "",
-            "video": request.build_absolute_uri(v.video.url) if v.video else None,
-            "stock": v.stock,
-            "images": [
-                request.build_absolute_uri(img.image.url) 
-                for img in v.images.all() if img.image
-            ],
-            "sizes": sizes_data
-        })
-
-    return {
-        "id": p.id,
-        "name": p.name,
-        "category_name": p.category.name if p.category else "Uncategorized",
-        "description": p.description or "",
-        "fabric": p.fabric or "",
-        "base_price": float(p.base_price),
-        "original_price": float(p.original_price) if p.original_price else None,
-        "has_size": p.category.has_size if p.category else False,
-        "variants": variants_data
-    }
+    products = filter_products(products, category, filters)
 
-# --- PRODUCT ENDPOINTS ---
+    if sort in SEARCH_SORTS:
+        sort = None # Relevance/similarity search mode khud tay karta hai
+
+    if search:
+        # Full-text (GIN) + typo-tolerant trigram fallback, rank ke hisaab se sorted
+        products, sort = apply_search(products, search, sort, cursor_sort(cursor))
+    products = apply_summary_sort(products, sort) # rating / reviews
+    products = apply_sales_sort(products, sort) # bestselling
+    # ✅ Keyset pagination: sirf ek page ke products hi DB se aur memory me aate hain
+    return paginate_keyset(products, sort or 'id', cursor, limit)
 
-@router.get("/products", response=List[ProductSchema])
-def list_products(request, category: str = None, search: str = None, sort: str = None):
-    products = Product.objects.filter(is_active=True).prefetch_related(
-        'variants', 
-        'variants__sizes', 
-        'variants__images'
+@router.get("/products", response={200: ProductPageSchema, 400: dict})
+@decorate_view(catalog_conditional)
+def list_products(request, filters: Query[ProductFilterSchema], category: str = None, search: str = None,
+                  sort: str = None, cursor: str = None, limit: int = None):
+    # Yahan sirf ids + version chahiye, poora data cache se aayega
+    products = Product.objects.filter(is_active=True).select_related('summary').only(
+        'id', 'updated_at', 'created_at', 'base_price', *SUMMARY_ONLY
     )
+    try:
+        page, next_cursor, has_more = product_page(products, filters, category, search, sort, cursor, limit)
+    except InvalidCursor as e:
+        return 400, {"success": False, "message": str(e)}
 
-    if category:
-        products = products.filter(category__slug__iexact=category) | products.filter(category__name__iexact=category)
-    
+    return 200, {
+        "items": with_summaries(get_product_documents(page), page),
+        "page_size": clamp_page_size(limit),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+@router.get("/products/cards", response={200: ProductCardPageSchema, 400: dict})
+@decorate_view(catalog_conditional)
+def list_product_cards(request, filters: Query[ProductFilterSchema], category: str = None, search: str = None,
+                       sort: str = None, cursor: str = None, limit: int = None):
+    """Same filters/sort/cursor as /products, par sirf card fields (grid pages ke liye)."""
+    products = card_queryset(Product.objects.filter(is_active=True))
+    try:
+        page, next_cursor, has_more = product_page(products, filters, category, search, sort, cursor, limit)
+    except InvalidCursor as e:
+        return 400, {"success": False, "message": str(e)}
+
+    return 200, {
+        "items": build_cards(page),
+        "page_size": clamp_page_size(limit),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+@router.get("/products/facets", response=ProductFacetsSchema)
+@decorate_view(catalog_conditional)
+def product_facets(request, filters: Query[ProductFilterSchema], category: str = None, search: str = None):
+    """Filter sidebar ke counts: price buckets, fabric, colour, size, in-stock (ek aggregated query)."""
+    products = filter_products(Product.objects.filter(is_active=True), category, filters)
     if search:
-        products = products.filter(name__icontains=search)
+        products, _ = apply_search(products, search)
+    return compute_facets(products, in_stock=filters.in_stock)
 
-    if sort == 'newest':
-        products = products.order_by('-created_at')
-    elif sort == 'price_low':
-        products = products.order_by('base_price')
-    elif sort == 'price_high':
-        products = products.order_by('-base_price')
+MAX_BATCH_IDS = 300
 
-    return [serialize_product(request, p) for p in products]
+# Batch (cart) aur detail par catalog ETag nahi: stock live hai (checkout version nahi badalta),
+# 304 purana stock dikha deta
+@router.get("/products/batch", response={200: ProductBatchSchema, 400: dict})
+def get_products_batch(request, ids: str):
+    """
+    Cart/Wishlist ke liye: ?ids=3,7,12 -> ek hi request me saare product documents.
+    Har id ke saath status: 'ok', 'not_found' ya 'inactive'.
+    """
+    try:
+        id_list = list(dict.fromkeys(int(i) for i in ids.split(',') if i.strip()))
+    except ValueError:
+        return 400, {"success": False, "message": "ids must be comma separated integers"}
+    if len(id_list) > MAX_BATCH_IDS:
+        return 400, {"success": False, "message": f"Maximum {MAX_BATCH_IDS} ids allowed"}
+
+    # Ek id__in query (sirf id/version/status), documents cache se ya ek prefetch query se
+    products = Product.objects.filter(id__in=id_list).select_related('summary')
+    found = {p.id: p for p in products.only('id', 'updated_at', 'is_active', *SUMMARY_ONLY)}
+    active = [found[pid] for pid in id_list if pid in found and found[pid].is_active]
+    docs = {doc["id"]: doc for doc in with_summaries(get_product_documents(active), active)}
+
+    items = []
+    for pid in id_list:
+        if pid in docs:
+            items.append({"id": pid, "status": "ok", "product": docs[pid]})
+        else:
+            items.append({"id": pid, "status": "inactive" if pid in found else "not_found"})
+    return 200, {"items": items}
 
 @router.get("/products/{product_id}", response=ProductSchema)
 def get_product_detail(request, product_id: int):
-    p = get_object_or_404(
-        Product.objects.prefetch_related('variants', 'variants__sizes', 'variants__images'), 
-        id=product_id
-    )
-    return serialize_product(request, p)
\ No newline at end of file
+    p = get_object_or_404(Product.objects.select_related('summary').only('id', 'updated_at', *SUMMARY_ONLY), id=product_id)
+    return with_summaries(get_product_documents([p]), [p])[0]
+
+@router.get("/products/{product_id}/related", response=RelatedProductsSchema)
+@decorate_view(catalog_conditional)
+def get_related_products(request, product_id: int, limit: int = 8):
+    """"Frequently bought together": nightly batch ki precomputed list (ek PK lookup) + cards."""
+    product = get_object_or_404(Product.objects.only('id', 'category_id'), id=product_id)
+    ids, source = related_product_ids(product, max(1, min(limit, TOP_K)))
+    # Batch ke baad inactive hue products hata do, order wahi rakho
+    cards = {p.id: p for p in card_queryset(Product.objects.filter(id__in=ids, is_active=True))}
+    return {"source": source, "items": build_cards([cards[pid] for pid in ids if pid in cards])}
+
+@router.post("/inventory/bulk", auth=InventoryKeyAuth(), response={200: StockBatchResultSchema, 400: dict})
+def bulk_stock_update(request, data: StockBatchSchema):
+    """Warehouse/marketplace sync: hazaaron SKUs ka delta ya absolute stock ek transaction me."""
+    if not data.items:
+        return 400, {"success": False, "message": "items cannot be empty"}
+    if len(data.items) > MAX_ITEMS:
+        return 400, {"success": False, "message": f"Maximum {MAX_ITEMS} items allowed"}
+    results = apply_stock_changes([item.dict() for item in data.items])
+    return 200, {"updated": sum(r["status"] == "ok" for r in results), "items": results}
@@ -0,0 +1,91 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .images import srcset
+from .media import media_url
+from .models import Announcement, Banner, Category, StorefrontSnapshot
+
+# --- STOREFRONT BOOTSTRAP ---
+# Home page ko categories, announcements aur banners ek saath chahiye.
+# Teen alag queries + serialization har render par karne ki jagah ek row me
+# poora JSON pehle se bana rehta hai (Category/Banner/Announcement/Product save
+# par rebuild). Request par sirf wo row padhi jaati hai, version hash ETag banta hai.
+
+SNAPSHOT_ID = 1
+SNAPSHOT_FORMAT = 3  # build_payload ka shape badle to badha do (purani row apne aap rebuild hogi)
+
+
+def build_payload():
+    categories = Category.objects.annotate(
+        active_products=Count('products', filter=Q(products__is_active=True))
+    ).order_by('id')
+    banners = Banner.objects.filter(is_active=True).order_by('-id')
+    announcements = Announcement.objects.filter(is_active=True)
+
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "categories": [
+            {
+                "id": c.id,
+                "name": c.name,
+                "has_size": c.has_size,
+                "slug": c.slug,
+                "image": media_url(c.image),
+                "srcset": srcset(c.renditions),
+                "active_products": c.active_products,
+            }
+            for c in categories
+        ],
+        "announcements": list(announcements.values('text', 'link', 'background_color', 'text_color')),
+        "banners": [
+            {"id": b.id, "title": b.title, "image": media_url(b.image), "srcset": srcset(b.renditions)}
+            for b in banners
+        ],
+    }
+
+
+def rebuild_storefront_snapshot():
+    """Payload dobara banao. Row lock ke baad padhte hain taaki do rebuild aapas me purana data na likhein."""
+    with transaction.atomic():
+        snapshot, _ = StorefrontSnapshot.objects.select_for_update().get_or_create(id=SNAPSHOT_ID)
+        payload = build_payload()
+        raw = json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder)
+        version = hashlib.sha1(raw.encode()).hexdigest()[:16]
+        if version != snapshot.version:
+            snapshot.payload = payload
+            snapshot.version = version
+            snapshot.save()
+    return snapshot
+
+
+def schedule_storefront_rebuild():
+    transaction.on_commit(rebuild_storefront_snapshot)
+
+
+def get_storefront_snapshot(request):
+    # ETag aur body dono ke liye ek hi query (request par cache)
+    if not hasattr(request, '_storefront_snapshot'):
+        snapshot = StorefrontSnapshot.objects.filter(id=SNAPSHOT_ID).first()
+        if snapshot is None or snapshot.payload.get("format") != SNAPSHOT_FORMAT:
+            snapshot = rebuild_storefront_snapshot()  # Pehli request (fresh deploy)
+        request._storefront_snapshot = snapshot
+    return request._storefront_snapshot
+
+
+def storefront_etag(request, *args, **kwargs):
+    return get_storefront_snapshot(request).version
+
+
+def storefront_response(request):
+    snapshot = get_storefront_snapshot(request)
+    payload = snapshot.payload
+    return {
+        "version": snapshot.version,
+        "categories": payload["categories"],
+        "announcements": payload["announcements"],
+        "banners": payload["banners"],
+    }
@@ -0,0 +1,137 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .facets import held_quantity
+from .models import Category, Product, ProductVariant
+from .serializers import serialize_product
+
+# --- PRODUCT DOCUMENT CACHE ---
+# Har product ka serialized JSON ek baar banta hai aur cache me rehta hai.
+# Key me product ka content version (updated_at) hai, isliye koi bhi change hote hi
+# nayi key banti hai aur purana document apne aap bekaar ho jata hai -
+# saare gunicorn workers me bina kisi manual delete ke.
+# Stock document me cache nahi hota: checkout / holds / sweeper har minute stock badalte
+# hain, isliye har request par ek query se abhi ka stock (live holds minus) jodte hain
+# (with_live_stock). Checkout product ka version ya catalog ETag nahi badalta.
+
+PRODUCT_DOC_TIMEOUT = 60 * 60 * 24  # 1 din
+PRODUCT_DOC_FORMAT = 5  # serialize_product ka shape badle to ise badha do
+
+
+def _product_prefetch():
+    return ('variants', 'variants__sizes', 'variants__images')
+
+
+CATEGORY_MAP_KEY = "shop:category_map"
+CATEGORY_MAP_TIMEOUT = 60 * 5  # Dusre workers ka map bhi 5 min me taaza ho jaye
+
+
+def _content_version(updated_at):
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+def product_doc_key(product_id, updated_at):
+    # Media URLs MEDIA_BASE_URL se bante hain (request host se nahi), isliye key me host nahi
+    return f"shop:product:{PRODUCT_DOC_FORMAT}:{product_id}:{_content_version(updated_at)}"
+
+
+def get_product_documents(products):
+    """
+    `products` me sirf id aur updated_at loaded hona kaafi hai.
+    Ek hi cache.get_many() se saare documents laata hai, jo miss hue
+    unhe ek prefetch query se bana kar cache me daal deta hai.
+    Order wahi rehta hai jo `products` ka hai. Stock abhi ka (with_live_stock).
+    """
+    products = list(products)
+    if not products:
+        return []
+
+    keys = {p.id: product_doc_key(p.id, p.updated_at) for p in products}
+    cached = cache.get_many(keys.values())
+
+    docs = {}
+    missing = []
+    for pid, key in keys.items():
+        if key in cached:
+            docs[pid] = cached[key]
+        else:
+            missing.append(pid)
+
+    if missing:
+        fresh = {}
+        products_qs = Product.objects.filter(id__in=missing).select_related('category')
+        for p in products_qs.prefetch_related(*_product_prefetch()):
+            docs[p.id] = serialize_product(p)
+            fresh[product_doc_key(p.id, p.updated_at)] = docs[p.id]
+        cache.set_many(fresh, PRODUCT_DOC_TIMEOUT)
+
+    return with_live_stock([docs[p.id] for p in products if p.id in docs])
+
+
+def with_live_stock(docs):
+    """
+    Documents me variants/sizes ka abhi ka stock - sizes ka stock live holds minus
+    (orders/reservations.py). Saare documents ke liye ek query, cached document nahi badalta.
+    """
+    variant_ids = [v["id"] for doc in docs for v in doc["variants"]]
+    if not variant_ids:
+        return docs
+    variant_stock, size_stock = {}, {}
+    rows = ProductVariant.objects.filter(id__in=variant_ids).annotate(
+        size_stock=F('sizes__stock') - held_quantity('sizes__id'),
+    ).values_list('id', 'stock', 'sizes__id', 'size_stock')
+    for variant_id, stock, size_id, available in rows:
+        variant_stock[variant_id] = stock
+        if size_id is not None:
+            size_stock[size_id] = max(available, 0)
+
+    return [
+        {**doc, "variants": [
+            {**v, "stock": variant_stock.get(v["id"], v["stock"]), "sizes": [
+                {**s, "stock": size_stock.get(s["id"], s["stock"])} for s in v["sizes"]
+            ]}
+            for v in doc["variants"]
+        ]}
+        for doc in docs
+    ]
+
+
+def touch_products(**lookup):
+    """
+    Product ka content version aage badhata hai (ek UPDATE query).
+    Variant/Size/Image/Category change hone par signals isko call karte hain.
+    """
+    return Product.objects.filter(**lookup).update(updated_at=timezone.now())
+
+
+# --- CATEGORY SLUG/NAME -> ID ---
+# Listing URL me category slug ya naam aata hai. Har request par JOIN + OR
+# (slug__iexact | name__iexact) ki jagah ek chhota cached map se id nikal kar
+# seedha category_id par filter karte hain (composite index use hota hai).
+
+def _category_map():
+    mapping = cache.get(CATEGORY_MAP_KEY)
+    if mapping is None:
+        mapping = {}
+        for cid, name, slug in Category.objects.values_list('id', 'name', 'slug'):
+            mapping.setdefault(name.lower(), cid)
+            mapping[slug.lower()] = cid  # Slug unique hai, naam se pehle match ho
+        cache.set(CATEGORY_MAP_KEY, mapping, CATEGORY_MAP_TIMEOUT)
+    return mapping
+
+
+def category_id_for(value):
+    """Slug ya naam (case-insensitive) -> category id. Na mile to None."""
+    key = value.strip().lower()
+    cid = _category_map().get(key)
+    if cid is None:
+        # Nayi category (map abhi purana hai) ke liye DB se confirm karo
+        category = Category.objects.filter(slug__iexact=key).only('id').first() \
+            or Category.objects.filter(name__iexact=key).only('id').first()
+        cid = category.id if category else None
+    return cid
+
+
+def clear_category_map():
+    cache.delete(CATEGORY_MAP_KEY)
@@ -0,0 +1,61 @@
+from django.db.models import Exists
+
+from .facets import product_lines
+from .images import srcset
+from .media import media_url
+from .models import ProductVariant
+from .summary import SUMMARY_ONLY, summary_data
+
+# --- PRODUCT CARD PROJECTION ---
+# Category/search grid ko sirf naam, price, thumbnail, colour swatches aur
+# in-stock flag chahiye. Poora ProductSchema (gallery, video, har size ka SKU)
+# yahan bekaar ka payload hai, isliye cards sirf zaroori columns se bante hain:
+# ek query page ke products ki (category + summary JOIN ke saath), ek query swatches ki.
+
+CARD_FIELDS = (
+    'id', 'name', 'base_price', 'original_price', 'created_at',
+    'category__name', 'category__has_size',
+)
+
+
+def card_queryset(queryset):
+    """Listing queryset ko card columns + in_stock (EXISTS) tak seemit karta hai."""
+    return queryset.select_related('category', 'summary').only(*CARD_FIELDS, *SUMMARY_ONLY).annotate(
+        in_stock=Exists(product_lines().filter(line_stock__gt=0))
+    )
+
+
+def build_cards(products):
+    """Page ke products (card_queryset se) ko card dicts me badalta hai. Swatches ek values() query se."""
+    products = list(products)
+    if not products:
+        return []
+
+    swatches = {}
+    variants = ProductVariant.objects.filter(product_id__in=[p.id for p in products]).order_by('id')
+    for v in variants.values('id', 'product_id', 'color_name', 'color_code', 'thumbnail', 'renditions'):
+        swatches.setdefault(v['product_id'], []).append({
+            "id": v['id'],
+            "color_name": v['color_name'],
+            "color_code": v['color_code'],
+            "thumbnail": media_url(v['thumbnail']),
+            "thumbnail_srcset": srcset(v['renditions']),
+        })
+
+    cards = []
+    for p in products:
+        first = next((s for s in swatches.get(p.id, []) if s['thumbnail']), None)
+        cards.append({
+            "id": p.id,
+            "name": p.name,
+            "category_name": p.category.name if p.category else "Uncategorized",
+            "base_price": float(p.base_price),
+            "original_price": float(p.original_price) if p.original_price else None,
+            "has_size": p.category.has_size if p.category else False,
+            "in_stock": p.in_stock,
+            "thumbnail": first["thumbnail"] if first else "",
+            "thumbnail_srcset": first["thumbnail_srcset"] if first else [],
+            "variants": swatches.get(p.id, []),
+            "summary": summary_data(p),
+        })
+    return cards
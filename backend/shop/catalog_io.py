@@ -0,0 +1,467 @@
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .bootstrap import schedule_storefront_rebuild
+from .cache import clear_category_map, touch_products
+from .images import schedule_renditions
+from .models import Category, Product, ProductVariant, SizeVariant
+from .search import update_search_vectors
+from .suggest import suggest_index
+from .summary import refresh_product_summaries
+from .versioning import bump_catalog_version
+
+# --- CATALOG CSV IMPORT / EXPORT ---
+# Ek row = ek SKU (Product -> colour variant -> size). Product/variant ke columns
+# har size row me repeat hote hain (colour khali = sirf product, bina variants). Export kiya hua sheet edit karke wapas import
+# karo: ids se rows match hoti hain, bina id wali rows naye product/variant/size banati hain.
+#
+# Import admin ke nested form ki tarah row-by-row save() nahi karta:
+# 1. Poora sheet parse + validate (galti ho to kuch nahi likha jata)
+# 2. Existing rows kuch queries me memory me, diff banta hai (dry-run yahin ruk jata hai)
+# 3. bulk_create / bulk_update (batch me), SKUs ek saath generate
+# 4. bulk operations signals nahi chalate, isliye caches/search/summary yahan se invalidate
+# Sheet me na hone wali rows delete NAHI hoti.
+
+COLUMNS = [
+    'product_id', 'category', 'product_name', 'description', 'fabric', 'base_price', 'original_price', 'is_active',
+    'variant_id', 'color_name', 'color_code', 'thumbnail', 'variant_stock',
+    'size_id', 'size', 'sku', 'stock', 'price_adjustment',
+]
+
+BATCH_SIZE = 1000
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n'}
+
+
+class CatalogImportError(ValueError):
+    """Sheet me galtiyan: kuch bhi save nahi hua. errors = ["line 5: ...", ...]"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} errors in sheet")
+        self.errors = errors
+
+
+# --- export ---
+
+EXPORT_VALUES = [
+    'id', 'category__slug', 'name', 'description', 'fabric', 'base_price', 'original_price', 'is_active',
+    'variants__id', 'variants__color_name', 'variants__color_code', 'variants__thumbnail', 'variants__stock',
+    'variants__sizes__id', 'variants__sizes__size', 'variants__sizes__sku', 'variants__sizes__stock', 'variants__sizes__price_adjustment',
+]
+
+
+def export_catalog(out, products=None):
+    """Products (default: saare) ko CSV me likhta hai - ek LEFT JOIN query, server-side cursor se."""
+    products = Product.objects.all() if products is None else products
+    rows = products.order_by('id', 'variants__id', 'variants__sizes__id').values_list(*EXPORT_VALUES)
+
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    count = 0
+    for row in rows.iterator(chunk_size=2000):
+        writer.writerow(['' if value is None else _export_value(value) for value in row])
+        count += 1
+    return count
+
+
+def _export_value(value):
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    return value
+
+
+# --- parsing ---
+
+def _decimal(value, field, errors, line):
+    if value == '':
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        errors.append(f"line {line}: {field} '{value}' is not a number")
+
+
+def _int(value, field, errors, line):
+    if value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        errors.append(f"line {line}: {field} '{value}' is not a whole number")
+
+
+def _bool(value, errors, line):
+    value = value.lower()
+    if value == '':
+        return None  # Naya product: default active, purana: jaisa hai
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    errors.append(f"line {line}: is_active '{value}' should be yes/no")
+
+
+# In me se kuch bhi bhara ho to row colour variant ki hai (color_name zaroori)
+VARIANT_FIELDS = (
+    'variant_id', 'color_code', 'thumbnail', 'variant_stock', 'size_id', 'size', 'sku', 'stock', 'price_adjustment',
+)
+
+
+def parse_rows(stream):
+    """CSV -> clean dicts (line number ke saath). Galtiyan jama hoti hain, raise nahi."""
+    reader = csv.DictReader(stream)
+    missing = {'category', 'product_name', 'color_name'} - set(reader.fieldnames or [])
+    if missing:
+        raise CatalogImportError([f"missing columns: {', '.join(sorted(missing))}"])
+
+    rows, errors = [], []
+    for line, raw in enumerate(reader, start=2):
+        raw = {key: (value or '').strip() for key, value in raw.items() if key}
+        if not any(raw.values()):
+            continue
+        row = {
+            'line': line,
+            'product_id': _int(raw.get('product_id', ''), 'product_id', errors, line),
+            'category': raw.get('category', ''),
+            'name': raw.get('product_name', ''),
+            'description': raw.get('description') or None,
+            'fabric': raw.get('fabric') or None,
+            'base_price': _decimal(raw.get('base_price', ''), 'base_price', errors, line),
+            'original_price': _decimal(raw.get('original_price', ''), 'original_price', errors, line),
+            'is_active': _bool(raw.get('is_active', ''), errors, line),
+            'variant_id': _int(raw.get('variant_id', ''), 'variant_id', errors, line),
+            'color_name': raw.get('color_name', ''),
+            'color_code': raw.get('color_code', ''),
+            'thumbnail': raw.get('thumbnail', ''),
+            'variant_stock': _int(raw.get('variant_stock', ''), 'variant_stock', errors, line),
+            'size_id': _int(raw.get('size_id', ''), 'size_id', errors, line),
+            'size': raw.get('size', '').upper(),
+            'sku': raw.get('sku', ''),
+            'stock': _int(raw.get('stock', ''), 'stock', errors, line),
+            'price_adjustment': _decimal(raw.get('price_adjustment', ''), 'price_adjustment', errors, line),
+        }
+        for field, label in (('category', 'category'), ('name', 'product_name')):
+            if not row[field]:
+                errors.append(f"line {line}: {label} is required")
+        # Khali colour = sirf product row (export bina variants wale product ko aise hi likhta hai)
+        if not row['color_name'] and any(row[field] not in (None, '') for field in VARIANT_FIELDS):
+            errors.append(f"line {line}: color_name is required")
+        rows.append(row)
+    return rows, errors
+
+
+# --- planning (diff) ---
+
+def _changes(obj, values):
+    """obj ke jo fields values se alag hain: {field: (old, new)}. None = sheet me khali (mat chhedo)."""
+    changed = {}
+    for field, new in values.items():
+        if new is None:
+            continue
+        old = getattr(obj, field)
+        if hasattr(old, 'name'):  # FieldFile
+            old = old.name or ''
+        if old != new:
+            changed[field] = (old, new)
+    return changed
+
+
+def _describe(kind, label, changed):
+    parts = ', '.join(f"{field}: {old!r} -> {new!r}" for field, (old, new) in changed.items())
+    return f"~ {kind} {label}: {parts}"
+
+
+def bulk_update_values(model, objs, fields):
+    """
+    UPDATE ... FROM (VALUES ...) - batch me ek statement.
+    Django ka bulk_update har batch ke liye CASE WHEN banata hai jo hazaaron rows par bahut dheema hai.
+    """
+    qn = connection.ops.quote_name
+    columns = [model._meta.get_field(field) for field in fields]
+    pk = model._meta.pk
+    assignments = ', '.join(
+        f"{qn(column.column)} = v.{qn(column.column)}::{column.db_type(connection)}" for column in columns
+    )
+    names = ', '.join(qn(name) for name in ['pk', *(column.column for column in columns)])
+    placeholder = '(' + ', '.join(['%s'] * (len(columns) + 1)) + ')'
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(objs), BATCH_SIZE):
+            batch = objs[start:start + BATCH_SIZE]
+            params = []
+            for obj in batch:
+                params.append(obj.pk)
+                params.extend(
+                    column.get_db_prep_save(getattr(obj, column.attname), connection) for column in columns
+                )
+            cursor.execute(
+                f"UPDATE {qn(model._meta.db_table)} t SET {assignments} "
+                f"FROM (VALUES {', '.join([placeholder] * len(batch))}) AS v({names}) "
+                f"WHERE t.{qn(pk.column)} = v.{qn('pk')}::{pk.db_type(connection)}",
+                params,
+            )
+
+
+class CatalogPlan:
+    """Sheet vs DB ka diff: kya banega, kya badlega. apply() hi DB me likhta hai."""
+
+    def __init__(self):
+        self.products = {}  # key -> Product (naye ke liye unsaved)
+        self.variants = {}  # key -> ProductVariant
+        self.sizes = {}  # key -> SizeVariant
+        self.created = {'products': [], 'variants': [], 'sizes': []}
+        self.updated = {'products': {}, 'variants': {}, 'sizes': {}}  # id(obj) -> (obj, fields)
+        self.changes = []  # Dry-run report ki lines
+        self.touched_products = set()  # Saved products ke ids jinke andar kuch badla
+
+    def summary(self):
+        return {
+            kind: {'create': len(self.created[kind]), 'update': len(self.updated[kind])}
+            for kind in ('products', 'variants', 'sizes')
+        }
+
+    def has_changes(self):
+        return any(self.created.values()) or any(self.updated.values())
+
+    def _update(self, kind, obj, changed, label):
+        if not changed:
+            return
+        entry = self.updated[kind].setdefault(id(obj), (obj, set()))
+        for field, (_, new) in changed.items():
+            setattr(obj, field, new)
+            entry[1].add(field)
+        self.changes.append(_describe(kind[:-1], label, changed))
+
+    def _create(self, kind, obj, label):
+        self.created[kind].append(obj)
+        self.changes.append(f"+ {kind[:-1]} {label}")
+
+    # --- apply ---
+
+    def apply(self):
+        """Sab kuch ek transaction me. Returns: summary()."""
+        with transaction.atomic():
+            # Postgres par bulk_create naye ids wapas deta hai, unhi se variants/sizes judte hain
+            Product.objects.bulk_create(self.created['products'], batch_size=BATCH_SIZE)
+            for variant in self.created['variants']:
+                variant.product_id = variant.product.id
+            ProductVariant.objects.bulk_create(self.created['variants'], batch_size=BATCH_SIZE)
+            for size in self.created['sizes']:
+                variant = size.variant  # variant_id set karne se cached variant hat jata hai, pehle nikaal lo
+                size.variant_id = variant.id
+                if not size.sku:
+                    # SizeVariant.save() jaisa hi format, par ek-ek query ke bina
+                    size.sku = f"{variant.product_id}-{variant.id}-{size.size}"
+            SizeVariant.objects.bulk_create(self.created['sizes'], batch_size=BATCH_SIZE)
+
+            for kind, model in (('products', Product), ('variants', ProductVariant), ('sizes', SizeVariant)):
+                by_fields = {}
+                for obj, fields in self.updated[kind].values():
+                    by_fields.setdefault(tuple(sorted(fields)), []).append(obj)
+                for fields, objs in by_fields.items():
+                    bulk_update_values(model, objs, fields)
+
+            product_ids = self.touched_products | {p.id for p in self.created['products']}
+            self._invalidate(product_ids)
+        return self.summary()
+
+    def _invalidate(self, product_ids):
+        """bulk_create/bulk_update signals nahi chalate - wahi kaam set-based."""
+        product_ids = list(product_ids)
+        if product_ids:
+            touch_products(id__in=product_ids)  # cached documents
+            update_search_vectors(id__in=product_ids)
+            refresh_product_summaries(product_ids)
+            transaction.on_commit(lambda: suggest_index.refresh_products(product_ids))
+        for variant, fields in self.updated['variants'].values():
+            if 'thumbnail' in fields:
+                schedule_renditions(variant)
+        for variant in self.created['variants']:
+            schedule_renditions(variant)
+        bump_catalog_version()
+        schedule_storefront_rebuild()  # Category product counts
+        clear_category_map()
+
+
+def plan_import(rows):
+    """Parsed rows -> CatalogPlan. Galat references par CatalogImportError."""
+    errors = []
+    categories = {}
+    for category in Category.objects.only('id', 'slug', 'name'):
+        categories.setdefault(category.slug.lower(), category.id)
+        categories.setdefault(category.name.lower(), category.id)
+
+    # Existing rows: sirf sheet me aaye products ke (3 queries)
+    product_ids = {row['product_id'] for row in rows if row['product_id']}
+    # Naam case-insensitive match hota hai (by_name ki keys lower), isliye query bhi Lower() par
+    names = {row['name'].lower() for row in rows if not row['product_id']}
+    existing_products = {
+        p.id: p for p in Product.objects.annotate(lname=Lower('name')).filter(
+            Q(id__in=product_ids) | Q(lname__in=names)
+        )
+    }
+    by_name = {}
+    for p in existing_products.values():
+        by_name.setdefault((p.category_id, p.name.lower()), []).append(p)
+    variants = {
+        v.id: v for v in ProductVariant.objects.filter(product_id__in=existing_products).order_by('id')
+    }
+    sizes = {s.id: s for s in SizeVariant.objects.filter(variant_id__in=variants).order_by('id')}
+    variants_by_colour = {}
+    for v in variants.values():
+        variants_by_colour.setdefault((v.product_id, v.color_name.lower()), v)
+    sizes_by_key = {}
+    sizes_by_sku = {}
+    for s in sizes.values():
+        sizes_by_key.setdefault((s.variant_id, s.size.upper()), s)
+        if s.sku:
+            sizes_by_sku.setdefault(s.sku, s)
+
+    plan = CatalogPlan()
+    product_values_seen = {}
+    for row in rows:
+        line = row['line']
+        category_id = categories.get(row['category'].lower())
+        if category_id is None:
+            errors.append(f"line {line}: unknown category '{row['category']}'")
+            continue
+
+        # --- product ---
+        if row['product_id']:
+            product = existing_products.get(row['product_id'])
+            if product is None:
+                errors.append(f"line {line}: product_id {row['product_id']} does not exist")
+                continue
+            key = ('id', product.id)
+        else:
+            matches = by_name.get((category_id, row['name'].lower()), [])
+            if len(matches) > 1:
+                errors.append(f"line {line}: several products named '{row['name']}', add product_id")
+                continue
+            product = matches[0] if matches else None
+            key = ('id', product.id) if product else ('new', category_id, row['name'].lower())
+
+        values = {
+            'category_id': category_id, 'name': row['name'], 'description': row['description'],
+            'fabric': row['fabric'], 'base_price': row['base_price'], 'original_price': row['original_price'],
+            'is_active': row['is_active'],
+        }
+        if key in product_values_seen:
+            first_values, first_line = product_values_seen[key]
+            if first_values != values:
+                errors.append(f"line {line}: product columns differ from line {first_line}")
+            product = plan.products.get(key)
+            if product is None:
+                continue
+        else:
+            product_values_seen[key] = (values, line)
+            if product is None:
+                if row['base_price'] is None:
+                    errors.append(f"line {line}: base_price is required for a new product")
+                    continue
+                product = Product(**{field: value for field, value in values.items() if value is not None})
+                plan._create('products', product, f"'{row['name']}'")
+            else:
+                plan._update('products', product, _changes(product, values), f"#{product.id}")
+            plan.products[key] = product
+        product_label = f"#{product.id}" if product.id else f"'{product.name}'"
+
+        # --- colour variant (khali colour = sirf product row) ---
+        if not row['color_name']:
+            continue
+        variant = None
+        if row['variant_id']:
+            variant = variants.get(row['variant_id'])
+            if variant is None or variant.product_id != product.id:
+                errors.append(f"line {line}: variant_id {row['variant_id']} does not belong to product {product_label}")
+                continue
+        elif product.id:
+            variant = variants_by_colour.get((product.id, row['color_name'].lower()))
+        vkey = ('id', variant.id) if variant else ('new', key, row['color_name'].lower())
+
+        variant_values = {
+            'color_name': row['color_name'], 'color_code': row['color_code'] or None,
+            'thumbnail': row['thumbnail'] or None, 'stock': row['variant_stock'],
+        }
+        if vkey in plan.variants:
+            variant = plan.variants[vkey]
+        elif variant is None:
+            variant = ProductVariant(product=product, **{
+                field: value for field, value in variant_values.items() if value is not None
+            })
+            plan._create('variants', variant, f"{product_label} / {row['color_name']}")
+            plan.variants[vkey] = variant
+        else:
+            plan._update('variants', variant, _changes(variant, variant_values), f"#{variant.id}")
+            plan.variants[vkey] = variant
+
+        # --- size (blank size = sirf colour row, size nahi) ---
+        if not row['size']:
+            continue
+        size_values = {
+            'size': row['size'], 'sku': row['sku'] or None,
+            'stock': row['stock'], 'price_adjustment': row['price_adjustment'],
+        }
+        size = None
+        if row['size_id']:
+            size = sizes.get(row['size_id'])
+            if size is None or size.variant_id != variant.id:
+                errors.append(f"line {line}: size_id {row['size_id']} does not belong to this colour variant")
+                continue
+        elif row['sku'] and row['sku'] in sizes_by_sku:
+            size = sizes_by_sku[row['sku']]
+            if size.variant_id != variant.id:
+                errors.append(f"line {line}: sku '{row['sku']}' belongs to another colour variant")
+                continue
+        elif variant.id:
+            size = sizes_by_key.get((variant.id, row['size']))
+        skey = ('id', size.id) if size else ('new', vkey, row['size'])
+        if skey in plan.sizes:
+            errors.append(f"line {line}: size {row['size']} repeated for {product_label} / {row['color_name']}")
+            continue
+        if size is None:
+            size = SizeVariant(variant=variant, **{
+                field: value for field, value in size_values.items() if value is not None
+            })
+            plan._create('sizes', size, f"{product_label} / {row['color_name']} / {row['size']}")
+        else:
+            changed = _changes(size, size_values)
+            plan._update('sizes', size, changed, f"{size.sku or size.id}")
+            if changed:
+                plan.touched_products.add(product.id)
+        plan.sizes[skey] = size
+
+    # Saved products jinke product/variant fields badle
+    for obj, _ in plan.updated['products'].values():
+        plan.touched_products.add(obj.id)
+    for obj, _ in plan.updated['variants'].values():
+        plan.touched_products.add(obj.product_id)
+    for variant in plan.created['variants']:
+        if variant.product.id:
+            plan.touched_products.add(variant.product.id)
+    for size in plan.created['sizes']:
+        if size.variant.product.id:
+            plan.touched_products.add(size.variant.product.id)
+
+    if errors:
+        raise CatalogImportError(errors)
+    return plan
+
+
+def import_catalog(stream, dry_run=False):
+    """
+    CSV stream se catalog import. Returns: (plan, applied).
+    dry_run=True par sirf diff (plan.changes / plan.summary()), DB me kuch nahi.
+    """
+    rows, errors = parse_rows(stream)
+    if errors:
+        raise CatalogImportError(errors)
+    plan = plan_import(rows)
+    if dry_run or not plan.has_changes():
+        return plan, False
+    plan.apply()
+    return plan, True
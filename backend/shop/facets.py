@@ -0,0 +1,174 @@
+from decimal import Decimal
+
+from django.apps import apps
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Exists, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Now
+
+from .models import Product, ProductVariant, SizeVariant
+
+# --- FACETED FILTERING ---
+# Ek "line" = product ka ek colour + size (SizeVariant). Jis variant me size
+# nahi hai, wo khud ek line hai (base price aur variant stock ke saath).
+# Effective price = product.base_price + size.price_adjustment
+
+# (key, min, max) -> min <= price < max
+PRICE_BUCKETS = [
+    ('under_1000', None, Decimal('1000')),
+    ('1000_2500', Decimal('1000'), Decimal('2500')),
+    ('2500_5000', Decimal('2500'), Decimal('5000')),
+    ('above_5000', Decimal('5000'), None),
+]
+
+
+def held_quantity(size_ref):
+    """
+    Ek SizeVariant (OuterRef(size_ref)) par live holds ka SUM (orders/reservations.py).
+    (size_variant, expires_at) INCLUDE quantity index se index-only aggregate, orders scan nahi.
+    """
+    # orders app shop ko import karta hai, isliye yahan model lazily
+    StockReservation = apps.get_model('orders', 'StockReservation')
+    held = StockReservation.objects.filter(
+        size_variant_id=OuterRef(size_ref), expires_at__gt=Now(),
+    ).values('size_variant_id').annotate(total=Sum('quantity')).values('total')
+    return Coalesce(Subquery(held), Value(0))
+
+
+def product_lines():
+    """
+    Outer product (OuterRef('pk')) ki saari lines, effective price/stock/size ke saath.
+    Sabhi annotations ek hi annotate() me taaki sizes ka LEFT JOIN ek hi baar bane.
+    Stock = available stock (live holds minus).
+    """
+    return ProductVariant.objects.filter(product_id=OuterRef('pk')).annotate(
+        line_price=F('product__base_price') + Coalesce(F('sizes__price_adjustment'), Value(Decimal('0'))),
+        line_stock=Coalesce(F('sizes__stock') - held_quantity('sizes__id'), F('stock')),
+        line_size=F('sizes__size'),
+    )
+
+
+def apply_facet_filters(queryset, min_price=None, max_price=None, fabric=None, color=None, size=None, in_stock=False):
+    """
+    Listing queryset par facet filters lagata hai.
+    Colour/size/price/stock ek hi line par match hone chahiye
+    (e.g. 'Red' + 'M' ka matlab Red colour ka M size available hai).
+    """
+    if fabric:
+        queryset = queryset.filter(fabric__iexact=fabric)
+
+    if not any([min_price is not None, max_price is not None, color, size, in_stock]):
+        return queryset
+
+    lines = product_lines()
+    if min_price is not None:
+        lines = lines.filter(line_price__gte=min_price)
+    if max_price is not None:
+        lines = lines.filter(line_price__lt=max_price)
+    if color:
+        lines = lines.filter(color_name__iexact=color)
+    if size:
+        lines = lines.filter(line_size__iexact=size)
+    if in_stock:
+        lines = lines.filter(line_stock__gt=0)
+
+    return queryset.filter(Exists(lines))
+
+
+def _bucket_case():
+    parts, params = [], []
+    for index, (_, low, high) in enumerate(PRICE_BUCKETS):
+        conds = []
+        if low is not None:
+            conds.append('price >= %s')
+            params.append(low)
+        if high is not None:
+            conds.append('price < %s')
+            params.append(high)
+        parts.append(f"WHEN {' AND '.join(conds)} THEN {index}")
+    return f"CASE {' '.join(parts)} END", params
+
+
+def _empty_facets():
+    return {
+        'total': 0,
+        'in_stock': 0,
+        'price': [
+            {'key': key, 'min_price': low, 'max_price': high, 'count': 0}
+            for key, low, high in PRICE_BUCKETS
+        ],
+        'fabric': [],
+        'color': [],
+        'size': [],
+    }
+
+
+def compute_facets(queryset, in_stock=False):
+    """
+    Filtered products ke liye saare facet counts EK query me (GROUPING SETS).
+    Har count distinct products ka hai, lines ka nahi.
+    in_stock=True ho to sirf stock wali lines gini jaati hain (sold-out size/colour nahi dikhenge).
+    """
+    facets = _empty_facets()
+    # Unknown category (.none()) ya khali id__in: SQL banta hi nahi (EmptyResultSet), seedha zero counts
+    if queryset.query.is_empty():
+        return facets
+    try:
+        product_sql, product_params = queryset.values('id').query.sql_with_params()
+    except EmptyResultSet:
+        return facets
+    bucket_sql, bucket_params = _bucket_case()
+
+    # Live holds (pending online payments) available stock se minus
+    StockReservation = apps.get_model('orders', 'StockReservation')
+
+    sql = f"""
+        WITH held AS (
+            SELECT size_variant_id, SUM(quantity) AS held
+            FROM {StockReservation._meta.db_table}
+            WHERE expires_at > NOW()
+            GROUP BY size_variant_id
+        ), lines AS (
+            SELECT p.id AS product_id,
+                   NULLIF(p.fabric, '') AS fabric,
+                   v.color_name AS color,
+                   s.size AS size,
+                   p.base_price + COALESCE(s.price_adjustment, 0) AS price,
+                   COALESCE(s.stock - COALESCE(h.held, 0), v.stock, 0) > 0 AS in_stock
+            FROM {Product._meta.db_table} p
+            LEFT JOIN {ProductVariant._meta.db_table} v ON v.product_id = p.id
+            LEFT JOIN {SizeVariant._meta.db_table} s ON s.variant_id = v.id
+            LEFT JOIN held h ON h.size_variant_id = s.id
+            WHERE p.id IN ({product_sql})
+              AND (NOT %s OR COALESCE(s.stock - COALESCE(h.held, 0), v.stock, 0) > 0)
+        ), bucketed AS (
+            SELECT lines.*, {bucket_sql} AS bucket FROM lines
+        )
+        SELECT GROUPING(fabric, color, size, bucket, in_stock) AS grp,
+               fabric, color, size, bucket, in_stock,
+               COUNT(DISTINCT product_id)
+        FROM bucketed
+        GROUP BY GROUPING SETS ((fabric), (color), (size), (bucket), (in_stock), ())
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*product_params, in_stock, *bucket_params])
+        rows = cursor.fetchall()
+
+    # GROUPING() bitmask: jo column group me hai uska bit 0 hota hai (fabric = sabse bada bit)
+    for grp, fabric, color, size, bucket, stocked, count in rows:
+        if grp == 0b01111 and fabric:
+            facets['fabric'].append({'value': fabric, 'count': count})
+        elif grp == 0b10111 and color:
+            facets['color'].append({'value': color, 'count': count})
+        elif grp == 0b11011 and size:
+            facets['size'].append({'value': size, 'count': count})
+        elif grp == 0b11101 and bucket is not None:
+            facets['price'][bucket]['count'] = count
+        elif grp == 0b11110 and stocked:
+            facets['in_stock'] = count
+        elif grp == 0b11111:
+            facets['total'] = count
+
+    for key in ('fabric', 'color', 'size'):
+        facets[key].sort(key=lambda item: (-item['count'], item['value']))
+    return facets
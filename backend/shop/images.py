@@ -0,0 +1,149 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from .media import media_url
+from .models import Banner, Category, ProductImage, ProductVariant
+
+logger = logging.getLogger(__name__)
+
+# --- RESPONSIVE IMAGE RENDITIONS ---
+# Upload hui original image (aksar kai MB ka JPEG) ke chhote WebP/AVIF versions
+# (320/640/1280 px) original ke paas hi "renditions/" folder me bante hain.
+# Resize CPU-heavy hai, isliye request me nahi: commit ke baad ek process pool
+# me chalta hai, aur result model ke `renditions` JSON me likha jata hai:
+#   {"source": "<original name>", "items": [{"name", "width", "format"}, ...]}
+# source se pata chalta hai ki renditions kis file ke hain (image badli to dobara banenge).
+
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_QUALITY = {'webp': 80, 'avif': 60}
+
+
+def rendition_formats():
+    from PIL import features
+    return [fmt for fmt in ('avif', 'webp') if features.check(fmt)]
+
+
+def rendition_name(name, width, fmt):
+    """
+    products/gallery/a.jpg -> products/gallery/renditions/a-jpg-640w.webp (deterministic).
+    Extension bhi naam me, taaki same folder ke a.jpg aur a.png ek dusre ki renditions na likhein.
+    """
+    folder, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    if ext:
+        stem = f"{stem}-{ext.lstrip('.').lower()}"
+    return os.path.join(folder, 'renditions', f"{stem}-{width}w.{fmt}")
+
+
+def generate_renditions(name):
+    """
+    Worker process me chalta hai: sirf storage padhta/likhta hai, DB nahi.
+    Original se bade size nahi banate (upscale bekaar hai), par sabse chhota hamesha banta hai.
+    Returns: [{"name", "width", "format"}]
+    """
+    from PIL import Image, ImageOps
+
+    with default_storage.open(name, 'rb') as f:
+        original = ImageOps.exif_transpose(Image.open(f))
+        original.load()
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'A' in original.getbands() else 'RGB')
+
+    widths = [w for w in RENDITION_WIDTHS if w < original.width] or [min(RENDITION_WIDTHS)]
+    items = []
+    for width in widths:
+        width = min(width, original.width)
+        height = round(original.height * width / original.width)
+        resized = original.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in rendition_formats():
+            target = rendition_name(name, width, fmt)
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=RENDITION_QUALITY[fmt])
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            # Storage naam badal sakta hai (e.g. beech me kisi ne wahi file bana di), jo mila wahi rakho
+            saved = default_storage.save(target, ContentFile(buffer.getvalue()))
+            items.append({"name": saved, "width": width, "format": fmt})
+    return items
+
+
+def srcset(renditions):
+    """Model ka renditions JSON -> [{"url", "width", "format"}] (frontend srcset/<picture> ke liye)."""
+    return [
+        {"url": media_url(item["name"]), "width": item["width"], "format": item["format"]}
+        for item in (renditions or {}).get("items", [])
+    ]
+
+
+def needs_renditions(instance, field):
+    name = getattr(instance, field).name
+    return bool(name) and (instance.renditions or {}).get("source") != name
+
+
+# --- model wiring ---
+
+IMAGE_FIELDS = {ProductVariant: 'thumbnail', ProductImage: 'image', Category: 'image', Banner: 'image'}
+
+
+def save_renditions(model, pk, name, items):
+    """Result ko row me likho (sirf agar image ab bhi wahi hai) aur dependent caches badlo."""
+    # cache -> serializers -> images: circular import se bachne ke liye yahan
+    from .bootstrap import schedule_storefront_rebuild
+    from .cache import touch_products
+    from .versioning import bump_catalog_version
+
+    field = IMAGE_FIELDS[model]
+    updated = model.objects.filter(pk=pk, **{field: name}).update(renditions={"source": name, "items": items})
+    if not updated:
+        return
+    # .update() signals nahi chalata, isliye invalidation yahan
+    if model is ProductVariant:
+        touch_products(variants__id=pk)
+    elif model is ProductImage:
+        touch_products(variants__images__id=pk)
+    elif model in (Category, Banner):
+        schedule_storefront_rebuild()
+    bump_catalog_version()
+
+
+_executor = None
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_RENDITION_WORKERS, initializer=_init_worker
+        )
+    return _executor
+
+
+def schedule_renditions(instance):
+    """post_save se: image nayi hai to commit ke baad pool me bhejo, request wait nahi karti."""
+    field = IMAGE_FIELDS[type(instance)]
+    if not needs_renditions(instance, field):
+        return
+    model, pk, name = type(instance), instance.pk, getattr(instance, field).name
+
+    def done(future):
+        # Pool ke management thread me chalta hai: apna DB connection, kaam ke baad band
+        try:
+            save_renditions(model, pk, name, future.result())
+        except Exception:
+            logger.exception("Rendition error (%s)", name)
+        finally:
+            connection.close()
+
+    transaction.on_commit(lambda: get_executor().submit(generate_renditions, name).add_done_callback(done))
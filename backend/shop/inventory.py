@@ -0,0 +1,123 @@
+import hmac
+
+from django.conf import settings
+from django.db import connection, transaction
+from ninja.security import APIKeyHeader
+
+from .cache import touch_products
+from .models import ProductVariant, SizeVariant
+from .summary import refresh_product_summaries
+from .versioning import bump_catalog_version
+
+# --- BULK STOCK SYNC (warehouse / marketplace) ---
+# Hazaaron SKUs ka stock ek request me: har entry {sku, delta} ya {sku, absolute}.
+# Poora batch ek transaction aur ek UPDATE ... FROM (VALUES ...) statement me:
+# - Rows id ke order me FOR UPDATE lock hoti hain (do parallel batches deadlock nahi karte)
+# - Delta se stock 0 se neeche jaata ho to wo SKU skip ('negative_stock'), baaki lagte hain
+# - FREE size wale variants ka ProductVariant.stock bhi ek UPDATE me same kiya jata hai
+# Python me row-by-row save()/select_for_update() nahi.
+
+MAX_ITEMS = 5000
+
+
+class InventoryKeyAuth(APIKeyHeader):
+    """Header X-API-Key, settings.INVENTORY_API_KEYS me se koi ek."""
+    param_name = "X-API-Key"
+
+    def authenticate(self, request, key):
+        for allowed in settings.INVENTORY_API_KEYS:
+            if key and hmac.compare_digest(key.encode(), allowed.encode()):
+                return True
+        return None
+
+
+APPLY_SQL = """
+    UPDATE {size} s
+    SET stock = CASE WHEN x.absolute IS NOT NULL THEN x.absolute ELSE x.old_stock + x.delta END
+    FROM (
+        SELECT s2.id, s2.stock AS old_stock, v.product_id, i.delta, i.absolute
+        FROM {size} s2
+        JOIN {variant} v ON v.id = s2.variant_id
+        JOIN (VALUES {values}) AS i(sku, delta, absolute) ON i.sku = s2.sku
+        WHERE s2.sku = ANY(%s)
+        ORDER BY s2.id
+        FOR UPDATE OF s2
+    ) x
+    WHERE s.id = x.id AND (x.absolute IS NOT NULL OR x.old_stock + x.delta >= 0)
+    RETURNING s.id, s.sku, x.old_stock, s.stock, s.size, x.product_id
+"""
+
+# FREE size (Suit/Saree) me variant ka master stock bhi wahi rehta hai
+SYNC_FREE_SQL = """
+    UPDATE {variant} v SET stock = s.stock
+    FROM {size} s
+    WHERE s.variant_id = v.id AND s.size = 'FREE' AND s.id = ANY(%s) AND v.stock <> s.stock
+"""
+
+
+def _tables():
+    return {'size': SizeVariant._meta.db_table, 'variant': ProductVariant._meta.db_table}
+
+
+def apply_stock_changes(entries):
+    """
+    entries: [{"sku", "delta" | "absolute"}] (schema validate kar chuka hai).
+    Returns: har entry ke liye {"sku", "status", "previous", "stock"} - same order me.
+    status: ok | invalid | not_found | duplicate_sku (DB me ek se zyada rows) | duplicate_entry | negative_stock
+    """
+    results = [{"sku": e["sku"], "status": None, "previous": None, "stock": None} for e in entries]
+    first = {}
+    for index, entry in enumerate(entries):
+        delta, absolute = entry.get("delta"), entry.get("absolute")
+        if (delta is None) == (absolute is None) or (absolute is not None and absolute < 0):
+            results[index]["status"] = "invalid"  # delta ya absolute, dono me se ek hi
+        elif entry["sku"] in first:
+            results[index]["status"] = "duplicate_entry"
+        else:
+            first[entry["sku"]] = index
+    if not first:
+        return results
+
+    # SKU unique constraint nahi hai: jo SKU ek se zyada rows par hai use chhedte nahi
+    skus = list(first)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT sku, COUNT(*) FROM {SizeVariant._meta.db_table} WHERE sku = ANY(%s) GROUP BY sku", [skus]
+        )
+        counts = dict(cursor.fetchall())
+    apply = []
+    for sku in skus:
+        if sku not in counts:
+            results[first[sku]]["status"] = "not_found"
+        elif counts[sku] > 1:
+            results[first[sku]]["status"] = "duplicate_sku"
+        else:
+            apply.append(entries[first[sku]])
+    if not apply:
+        return results
+
+    tables = _tables()
+    values = ', '.join(['(%s, %s::integer, %s::integer)'] * len(apply))
+    params = [p for e in apply for p in (e["sku"], e.get("delta"), e.get("absolute"))]
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(APPLY_SQL.format(values=values, **tables), params + [[e["sku"] for e in apply]])
+            updated = cursor.fetchall()
+            free_ids = [row[0] for row in updated if row[4] == 'FREE']
+            if free_ids:
+                cursor.execute(SYNC_FREE_SQL.format(**tables), [free_ids])
+
+        product_ids = {row[5] for row in updated}
+        if product_ids:
+            # .update()/raw SQL signals nahi chalata: documents, summary aur ETag yahan se
+            touch_products(id__in=product_ids)
+            refresh_product_summaries(product_ids)
+            bump_catalog_version()
+
+    for _, sku, previous, stock, *_ in updated:
+        results[first[sku]].update(status="ok", previous=previous, stock=stock)
+    for entry in apply:
+        result = results[first[entry["sku"]]]
+        if result["status"] is None:
+            result["status"] = "negative_stock"
+    return results
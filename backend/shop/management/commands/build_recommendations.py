@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from shop.recommendations import HALF_LIFE_DAYS, TOP_K, WINDOW_DAYS, build_recommendations
+
+
+class Command(BaseCommand):
+    help = "Orders se 'frequently bought together' table dobara banata hai (cron se raat me chalao)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K, help="Har product ke kitne related products")
+        parser.add_argument('--half-life', type=int, default=HALF_LIFE_DAYS, help="Kitne din me order ka weight aadha")
+        parser.add_argument('--window', type=int, default=WINDOW_DAYS, help="Kitne din purane orders tak dekhna hai")
+
+    def handle(self, *args, **options):
+        stats = build_recommendations(
+            k=options['top_k'], half_life_days=options['half_life'], window_days=options['window']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stats['co_purchase']} products co-purchase se, {stats['bestsellers']} category bestsellers se"
+        ))
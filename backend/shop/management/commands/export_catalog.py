@@ -0,0 +1,26 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from shop.catalog_io import export_catalog
+from shop.models import Product
+
+
+class Command(BaseCommand):
+    help = "Poora catalog (product -> colour -> size/SKU) CSV me export karta hai"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="CSV file ka path ('-' = stdout)")
+        parser.add_argument('--category', help="Sirf is category (slug) ke products")
+
+    def handle(self, *args, **options):
+        products = Product.objects.all()
+        if options['category']:
+            products = products.filter(category__slug=options['category'])
+
+        if options['path'] == '-':
+            count = export_catalog(sys.stdout, products)
+        else:
+            with open(options['path'], 'w', newline='', encoding='utf-8') as f:
+                count = export_catalog(f, products)
+        self.stderr.write(self.style.SUCCESS(f"✅ {count} rows exported"))
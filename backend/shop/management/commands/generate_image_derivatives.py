@@ -0,0 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from shop.images import IMAGE_FIELDS, _init_worker, generate_renditions, needs_renditions, save_renditions
+
+
+class Command(BaseCommand):
+    help = "Purani uploaded images (variant thumbnail, gallery, category, banner) ke WebP/AVIF renditions banata hai"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_RENDITION_WORKERS,
+                            help="Parallel worker processes")
+        parser.add_argument('--force', action='store_true', help="Jinke renditions bane hain unke bhi dobara banao")
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model, field in IMAGE_FIELDS.items():
+            for obj in model.objects.exclude(**{field: ''}).only('pk', field, 'renditions').iterator():
+                if options['force'] or needs_renditions(obj, field):
+                    jobs.append((model, obj.pk, getattr(obj, field).name))
+
+        if not jobs:
+            self.stdout.write(self.style.SUCCESS("✅ Sabhi images ke renditions pehle se bane hain"))
+            return
+
+        self.stdout.write(f"🖼️ {len(jobs)} images, {options['workers']} workers...")
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            futures = {pool.submit(generate_renditions, name): (model, pk, name) for model, pk, name in jobs}
+            for future in as_completed(futures):
+                model, pk, name = futures[future]
+                try:
+                    save_renditions(model, pk, name, future.result())
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"❌ {name}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {done} done, {failed} failed"))
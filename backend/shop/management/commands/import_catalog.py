@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.catalog_io import CatalogImportError, import_catalog
+
+
+class Command(BaseCommand):
+    help = "CSV sheet se catalog import (bulk insert/update). --dry-run sirf diff dikhata hai"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV file ka path")
+        parser.add_argument('--dry-run', action='store_true', help="Kuch save mat karo, sirf badlav dikhao")
+        parser.add_argument('--show', type=int, default=50, help="Kitni change lines print karni hain (0 = sab)")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as f:
+                plan, applied = import_catalog(f, dry_run=options['dry_run'])
+        except CatalogImportError as e:
+            for error in e.errors:
+                self.stderr.write(f"❌ {error}")
+            raise CommandError(f"Import cancelled: {e}")
+
+        changes = plan.changes if not options['show'] else plan.changes[:options['show']]
+        for change in changes:
+            self.stdout.write(change)
+        if len(changes) < len(plan.changes):
+            self.stdout.write(f"... aur {len(plan.changes) - len(changes)} changes")
+
+        summary = ', '.join(
+            f"{kind}: +{counts['create']} ~{counts['update']}" for kind, counts in plan.summary().items()
+        )
+        if applied:
+            self.stdout.write(self.style.SUCCESS(f"✅ Imported ({summary})"))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"🔍 Dry run, kuch save nahi hua ({summary})"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ Sheet aur catalog already same hain"))
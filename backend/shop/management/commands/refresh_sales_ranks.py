@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from shop.sales import rebuild_sales_history, refresh_sales_ranks
+from shop.versioning import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = "Bestseller ranks (7/30/90 din) daily buckets se dobara banata hai - raat ko cron se chalao"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Daily buckets bhi poori order history se dobara banao (setup/repair)")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            rebuild_sales_history()
+            self.stdout.write(self.style.SUCCESS("✅ Order history se sales buckets aur ranks dobara bane"))
+            return
+
+        count = refresh_sales_ranks()
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"✅ {count} products ke sales ranks refresh hue"))
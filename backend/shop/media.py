@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.encoding import filepath_to_uri
+
+# --- MEDIA URL BUILDER ---
+# Image/video ke absolute URLs request ke bina bante hain: settings.MEDIA_BASE_URL
+# (CDN ya origin) + MEDIA_URL ka prefix ek baar banta hai, phir har file ke liye
+# sirf string join. Isse serializers views, management commands, signals aur
+# cache rebuild - sab jagah se same URL dete hain.
+
+
+@lru_cache(maxsize=1)
+def media_prefix():
+    """
+    e.g. 'https://cdn.example.com/media/' (MEDIA_URL khud absolute ho to wahi).
+    MEDIA_BASE_URL khali ho to relative '/media/'.
+    """
+    if settings.MEDIA_URL.startswith(('http://', 'https://')):
+        return settings.MEDIA_URL.rstrip('/') + '/'
+    base = settings.MEDIA_BASE_URL.rstrip('/')
+    path = settings.MEDIA_URL.strip('/')
+    return f"{base}/{path}/" if path else f"{base}/"
+
+
+def media_url(file):
+    """FieldFile ya stored name -> URL (MEDIA_BASE_URL ho to absolute). Khali file par ""."""
+    name = getattr(file, 'name', file)
+    if not name:
+        return ""
+    if name.startswith(('http://', 'https://')):
+        return name
+    return media_prefix() + filepath_to_uri(name.lstrip('/'))
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Func, OuterRef, Subquery, TextField, Value
+
+
+def backfill_search_vectors(apps, schema_editor):
+    # Purane products ke liye search_vector ek hi UPDATE me bharo (shop/search.py jaisa hi expression)
+    Product = apps.get_model('shop', 'Product')
+    Category = apps.get_model('shop', 'Category')
+    ProductVariant = apps.get_model('shop', 'ProductVariant')
+
+    category_name = Subquery(Category.objects.filter(id=OuterRef('category_id')).values('name')[:1])
+    colour_names = Func(
+        ArraySubquery(ProductVariant.objects.filter(product_id=OuterRef('pk')).values('color_name')),
+        Value(' '),
+        function='array_to_string',
+        output_field=TextField(),
+    )
+    Product.objects.update(search_vector=(
+        SearchVector('name', weight='A', config='simple')
+        + SearchVector('fabric', category_name, weight='B', config='simple')
+        + SearchVector(colour_names, weight='C', config='simple')
+        + SearchVector('description', weight='D', config='simple')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_product_updated_at'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='product_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Purane products ke liye summaries ek INSERT ... SELECT me (shop/summary.py jaisa hi hisaab)
+BACKFILL_SQL = """
+INSERT INTO shop_productsummary
+    (product_id, min_price, max_price, total_stock, in_stock, review_count, avg_rating, rating_histogram, updated_at)
+SELECT p.id,
+       COALESCE(l.min_price, p.base_price),
+       COALESCE(l.max_price, p.base_price),
+       COALESCE(l.total_stock, 0),
+       COALESCE(l.total_stock, 0) > 0,
+       COALESCE(r.review_count, 0),
+       r.avg_rating,
+       COALESCE(r.histogram, '[0, 0, 0, 0, 0]'::jsonb),
+       NOW()
+FROM shop_product p
+LEFT JOIN (
+    SELECT v.product_id,
+           MIN(pp.base_price + COALESCE(s.price_adjustment, 0)) AS min_price,
+           MAX(pp.base_price + COALESCE(s.price_adjustment, 0)) AS max_price,
+           SUM(GREATEST(COALESCE(s.stock, v.stock), 0)) AS total_stock
+    FROM shop_productvariant v
+    JOIN shop_product pp ON pp.id = v.product_id
+    LEFT JOIN shop_sizevariant s ON s.variant_id = v.id
+    GROUP BY v.product_id
+) l ON l.product_id = p.id
+LEFT JOIN (
+    SELECT product_id,
+           COUNT(*) AS review_count,
+           ROUND(AVG(rating)::numeric, 2)::float8 AS avg_rating,
+           jsonb_build_array(
+               COUNT(*) FILTER (WHERE rating = 1), COUNT(*) FILTER (WHERE rating = 2),
+               COUNT(*) FILTER (WHERE rating = 3), COUNT(*) FILTER (WHERE rating = 4),
+               COUNT(*) FILTER (WHERE rating = 5)
+           ) AS histogram
+    FROM reviews_review
+    GROUP BY product_id
+) r ON r.product_id = p.id
+ON CONFLICT (product_id) DO NOTHING
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0007_image_renditions'),
+        ('reviews', '0002_review_likes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSummary',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='shop.product')),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('total_stock', models.IntegerField(default=0)),
+                ('in_stock', models.BooleanField(default=False)),
+                ('review_count', models.IntegerField(default=0)),
+                ('avg_rating', models.FloatField(null=True)),
+                ('rating_histogram', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['avg_rating'], name='summary_rating_idx')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
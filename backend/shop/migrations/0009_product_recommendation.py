@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:01
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0008_product_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductRecommendation',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommendation', serialize=False, to='shop.product')),
+                ('related_ids', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), default=list, size=None)),
+                ('scores', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), default=list, size=None)),
+                ('source', models.CharField(choices=[('co_purchase', 'Co-purchase'), ('bestsellers', 'Category Bestsellers')], default='co_purchase', max_length=20)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Purani order history se daily buckets aur ranks (shop/sales.py jaisa hi hisaab)
+BACKFILL_DAILY_SQL = """
+INSERT INTO shop_productsalesdaily (product_id, day, units, revenue)
+SELECT v.product_id, (o.created_at AT TIME ZONE %s)::date, SUM(oi.quantity), SUM(oi.price * oi.quantity)
+FROM orders_orderitem oi
+JOIN orders_order o ON o.id = oi.order_id
+JOIN shop_sizevariant s ON s.id = oi.size_variant_id
+JOIN shop_productvariant v ON v.id = s.variant_id
+WHERE o.status IN ('confirmed', 'shipped', 'delivered')
+GROUP BY 1, 2
+"""
+
+BACKFILL_RANKS_SQL = """
+INSERT INTO shop_productsalesrank
+    (product_id, category_id, units_7d, units_30d, units_90d, revenue_30d, category_rank, updated_at)
+SELECT id, category_id, units_7d, units_30d, units_90d, revenue_30d,
+       ROW_NUMBER() OVER (PARTITION BY category_id ORDER BY units_30d DESC, units_90d DESC, id DESC),
+       NOW()
+FROM (
+    SELECT p.id, p.category_id,
+           COALESCE(SUM(d.units) FILTER (WHERE d.day > t.today - 7), 0) AS units_7d,
+           COALESCE(SUM(d.units) FILTER (WHERE d.day > t.today - 30), 0) AS units_30d,
+           COALESCE(SUM(d.units), 0) AS units_90d,
+           COALESCE(SUM(d.revenue) FILTER (WHERE d.day > t.today - 30), 0) AS revenue_30d
+    FROM shop_product p
+    CROSS JOIN (SELECT (NOW() AT TIME ZONE %s)::date AS today) t
+    LEFT JOIN shop_productsalesdaily d ON d.product_id = p.id AND d.day > t.today - 90
+    GROUP BY p.id, p.category_id
+) windows
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0009_product_recommendation'),
+        ('orders', '0003_order_invoice_no'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSalesDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('units', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_days', to='shop.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('product', 'day'), name='sales_daily_product_day_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductSalesRank',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales_rank', serialize=False, to='shop.product')),
+                ('units_7d', models.IntegerField(default=0)),
+                ('units_30d', models.IntegerField(default=0)),
+                ('units_90d', models.IntegerField(default=0)),
+                ('revenue_30d', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('category_rank', models.PositiveIntegerField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_ranks', to='shop.category')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-units_30d'], name='sales_rank_30d_idx'), models.Index(fields=['category', 'category_rank'], name='sales_rank_category_idx')],
+            },
+        ),
+        migrations.RunSQL(
+            [(BACKFILL_DAILY_SQL, [settings.TIME_ZONE]), (BACKFILL_RANKS_SQL, [settings.TIME_ZONE])],
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0010_sales_rank'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sizevariant',
+            index=models.Index(fields=['sku'], name='sizevariant_sku_idx'),
+        ),
+    ]
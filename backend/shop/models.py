@@ -1,4 +1,7 @@
 from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
 
 class Announcement(models.Model):
@@ -7,6 +10,7 @@ class Announcement(models.Model):
     is_active = models.BooleanField(default=True)
     background_color = models.CharField(max_length=20, default="#000000")
     text_color = models.CharField(max_length=20, default="#ffffff")
+    updated_at = models.DateTimeField(auto_now=True)
     def __str__(self): return self.text
 
 class Category(models.Model):
@@ -14,6 +18,9 @@ class Category(models.Model):
     has_size = models.BooleanField(default=False)
     image = models.ImageField(upload_to='categories/', null=True, blank=True)
     slug = models.SlugField(unique=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # ✅ WebP/AVIF resized versions (shop/images.py bharta hai)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     
     def save(self, *args, **kwargs):
         if not self.slug: self.slug = slugify(self.name)
@@ -25,6 +32,9 @@ class Banner(models.Model):
     image = models.ImageField(upload_to='banners/')
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # ✅ WebP/AVIF resized versions (shop/images.py bharta hai)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
 class Product(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
@@ -35,6 +45,25 @@ class Product(models.Model):
     original_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # ✅ Content version: product ya uske variants/sizes/images badalne par aage badhta hai
+    # (shop/signals.py), isi se cached JSON document ki key banti hai
+    updated_at = models.DateTimeField(auto_now=True)
+    # ✅ Full-text search ke liye (name, fabric, category, colours, description) - shop/search.py maintain karta hai
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        # ✅ Keyset pagination ke liye composite indexes (sort key + id tie-breaker)
+        # Category page aur poori listing dono ke liye alag, taaki page N bhi page 1 jitna sasta rahe
+        indexes = [
+            models.Index(fields=['is_active', 'category', 'created_at', 'id'], name='product_cat_newest_idx'),
+            models.Index(fields=['is_active', 'category', 'base_price', 'id'], name='product_cat_price_idx'),
+            models.Index(fields=['is_active', 'created_at', 'id'], name='product_newest_idx'),
+            models.Index(fields=['is_active', 'base_price', 'id'], name='product_price_idx'),
+            # Search: tsvector ke liye GIN, aur typo wale search ke liye pg_trgm GIN
+            GinIndex(fields=['search_vector'], name='product_search_vector_idx'),
+            GinIndex(fields=['name'], name='product_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self): return self.name
 
 class ProductVariant(models.Model):
@@ -45,11 +74,15 @@ class ProductVariant(models.Model):
     video = models.FileField(upload_to='products/videos/', null=True, blank=True)
     # Note: Stock ab SizeVariant handle karega, ye field sirf reference ke liye hai
     stock = models.IntegerField(default=10, help_text="Suits/Saree ke liye master stock")
+    # ✅ WebP/AVIF resized versions (shop/images.py bharta hai)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     def __str__(self): return f"{self.product.name} - {self.color_name}"
 
 class ProductImage(models.Model):
     variant = models.ForeignKey(ProductVariant, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='products/gallery/')
+    # ✅ WebP/AVIF resized versions (shop/images.py bharta hai)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
 class SizeVariant(models.Model):
     variant = models.ForeignKey(ProductVariant, on_delete=models.CASCADE, related_name='sizes')
@@ -57,10 +90,112 @@ class SizeVariant(models.Model):
     stock = models.IntegerField(default=0)
     price_adjustment = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     sku = models.CharField(max_length=50, blank=True) # Length increased for safety
+
+    class Meta:
+        # ✅ Stock sync API SKU se rows dhundhta hai (shop/inventory.py)
+        indexes = [models.Index(fields=['sku'], name='sizevariant_sku_idx')]
     
     def save(self, *args, **kwargs):
         if not self.sku:
-            self.sku = f"{self.variant.product.id}-{self.variant.id}-{self.size}"
+            self.sku = f"{self.variant.product_id}-{self.variant_id}-{self.size}"
         super().save(*args, **kwargs)
 
-    def __str__(self): return f"{self.variant.product.name} ({self.size})"
\ No newline at end of file
+    def __str__(self): return f"{self.variant.product.name} ({self.size})"
+
+class ProductSummary(models.Model):
+    """
+    Product ke denormalized aggregates (shop/summary.py refresh karta hai).
+    Listing me har card ke liye variants/reviews ginne ki zarurat nahi.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True) # Sabse sasta size (base + adjustment)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    total_stock = models.IntegerField(default=0) # Saare colour/size ka stock
+    in_stock = models.BooleanField(default=False)
+    review_count = models.IntegerField(default=0)
+    avg_rating = models.FloatField(null=True)
+    rating_histogram = models.JSONField(default=list) # [1★, 2★, 3★, 4★, 5★] counts
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['avg_rating'], name='summary_rating_idx'),
+        ]
+
+    def __str__(self): return f"Summary: {self.product_id}"
+
+class ProductRecommendation(models.Model):
+    """
+    "Frequently bought together" - har product ke top-k related products (shop/recommendations.py batch job bharta hai).
+    Serve karte waqt sirf ek primary key lookup.
+    """
+    SOURCE_CHOICES = [('co_purchase', 'Co-purchase'), ('bestsellers', 'Category Bestsellers')]
+
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='recommendation')
+    related_ids = ArrayField(models.IntegerField(), default=list) # Score ke order me
+    scores = ArrayField(models.FloatField(), default=list)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='co_purchase')
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self): return f"Recommendations: {self.product_id}"
+
+class ProductSalesDaily(models.Model):
+    """
+    Product ki ek din ki bikri (confirmed/shipped/delivered orders). Order status badalne par
+    sirf us order ki lines +/- hoti hain (shop/sales.py), purani history dobara nahi padhte.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='sales_days')
+    day = models.DateField() # Order ki date (local)
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'day'], name='sales_daily_product_day_uniq'),
+        ]
+
+    def __str__(self): return f"{self.product_id} @ {self.day}: {self.units}"
+
+class ProductSalesRank(models.Model):
+    """
+    Rolling 7/30/90 din ki bikri + category ke andar rank (daily buckets se banta hai).
+    sort=bestselling isi ke units_30d par chalta hai, request par koi aggregate nahi.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='sales_rank')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='sales_ranks')
+    units_7d = models.IntegerField(default=0)
+    units_30d = models.IntegerField(default=0)
+    units_90d = models.IntegerField(default=0)
+    revenue_30d = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    category_rank = models.PositiveIntegerField(null=True) # 1 = category ka sabse zyada bikne wala (30 din)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-units_30d'], name='sales_rank_30d_idx'),
+            models.Index(fields=['category', 'category_rank'], name='sales_rank_category_idx'),
+        ]
+
+    def __str__(self): return f"Sales: {self.product_id} ({self.units_30d} / 30d)"
+
+class CatalogVersion(models.Model):
+    """
+    Poore catalog ka ek counter (sirf ek row, id=1).
+    Shop ke kisi bhi model ke save/delete par +1 hota hai (shop/signals.py),
+    isi se listing endpoints ka ETag / Last-Modified banta hai.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self): return f"Catalog v{self.version}"
+
+class StorefrontSnapshot(models.Model):
+    """
+    Home page bootstrap (categories + counts, banners, announcements) ka precomputed JSON.
+    Sirf ek row (id=1), shop/bootstrap.py save hone par dobara banata hai.
+    """
+    payload = models.JSONField(default=dict)
+    version = models.CharField(max_length=40, blank=True) # Payload ka hash (ETag)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self): return f"Storefront {self.version}"
@@ -0,0 +1,122 @@
+import base64
+import json
+from decimal import Decimal
+
+from django.db.models import Q
+
+# --- KEYSET (CURSOR) PAGINATION ---
+# OFFSET wali pagination me page N ke liye DB ko pehle ke saare rows skip karne padte hain.
+# Yahan hum last row ki sort value + id ko cursor me rakhte hain, taaki har page
+# seedha index se "WHERE (key, id) > (last_key, last_id)" jaisa range scan ho.
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# sort name -> (field, descending)
+# id hamesha tie-breaker hai, isliye order hamesha unique aur stable rehta hai.
+SORTS = {
+    'newest': ('created_at', True),
+    'price_low': ('base_price', False),
+    'price_high': ('base_price', True),
+    'id': ('id', False),
+    # Search ke liye (shop/search.py search_rank annotate karta hai)
+    'relevance': ('search_rank', True),
+    'similarity': ('search_rank', True),
+    # ProductSummary se (shop/summary.py annotate karta hai)
+    'rating': ('rating_sort', True),
+    'reviews': ('reviews_sort', True),
+    # ProductSalesRank se (shop/sales.py annotate karta hai)
+    'bestselling': ('sales_sort', True),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def clamp_page_size(limit):
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _to_json(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(sort, key, pk):
+    """Last row ki (sort, key, id) ko opaque base64 string me pack karta hai."""
+    raw = json.dumps([sort, _to_json(key), pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort, key, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort, key, int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def cursor_sort(cursor):
+    """Cursor kis sort ke liye bana tha (ya None agar cursor nahi hai)."""
+    if not cursor:
+        return None
+    return decode_cursor(cursor)[0]
+
+
+def keyset_order(sort):
+    field, desc = SORTS[sort]
+    if field == 'id':
+        return ('-id',) if desc else ('id',)
+    prefix = '-' if desc else ''
+    return (f'{prefix}{field}', f'{prefix}id')
+
+
+def keyset_filter(sort, key, pk):
+    """
+    (field, id) ke baad wali rows ka Q banata hai.
+    Leading 'field >= key' wala condition index range scan ke liye hai,
+    OR wala hissa sirf same key pe id se tie todta hai.
+    """
+    field, desc = SORTS[sort]
+    op = 'lt' if desc else 'gt'
+    if field == 'id':
+        return Q(**{f'id__{op}': pk})
+    bound = 'lte' if desc else 'gte'
+    return Q(**{f'{field}__{bound}': key}) & (
+        Q(**{f'{field}__{op}': key}) | Q(**{field: key, f'id__{op}': pk})
+    )
+
+
+def paginate_keyset(queryset, sort, cursor=None, limit=None):
+    """
+    Queryset ka ek page laata hai.
+    Returns: (rows, next_cursor, has_more)
+    """
+    if sort not in SORTS:
+        sort = 'id'
+    page_size = clamp_page_size(limit)
+
+    if cursor:
+        cursor_sort, key, pk = decode_cursor(cursor)
+        if cursor_sort != sort:
+            raise InvalidCursor("Cursor does not match the requested sort")
+        queryset = queryset.filter(keyset_filter(sort, key, pk))
+
+    # Ek row extra laate hain taaki bina COUNT(*) ke pata chale ki aage aur data hai ya nahi
+    rows = list(queryset.order_by(*keyset_order(sort))[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        field = SORTS[sort][0]
+        next_cursor = encode_cursor(sort, getattr(last, field), last.pk)
+    return rows, next_cursor, has_more
@@ -0,0 +1,144 @@
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Product, ProductRecommendation, ProductVariant, SizeVariant
+from .sales import COUNTED_STATUSES
+from .versioning import bump_catalog_version
+
+# --- "FREQUENTLY BOUGHT TOGETHER" RECOMMENDER ---
+# Orders x products ka sparse incidence matrix X (ek order me product tha = 1,
+# purane orders ka weight recency decay se kam). Co-occurrence = X^T X, jise
+# Postgres khud self-join + GROUP BY se banata hai (sirf non-zero pairs), phir
+# cosine normalisation (co / sqrt(pop_a * pop_b)) taaki har jagah sirf sabse
+# popular product na aaye. Har product ke top-k ROW_NUMBER() se nikal kar
+# ProductRecommendation me ek row me rakhte hain - serve karna sirf PK lookup hai.
+# Jinke co-purchase kam hain unki list same category ke bestsellers se poori hoti hai.
+
+TOP_K = 12
+HALF_LIFE_DAYS = 90  # 90 din purana order aadha weight
+WINDOW_DAYS = 365
+
+
+def _tables():
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    return {
+        'order': Order._meta.db_table,
+        'item': OrderItem._meta.db_table,
+        'size': SizeVariant._meta.db_table,
+        'variant': ProductVariant._meta.db_table,
+        'product': Product._meta.db_table,
+    }
+
+
+BASKETS_SQL = """
+    baskets AS (
+        SELECT o.id AS order_id, v.product_id,
+               MAX(EXP(-LN(2) * EXTRACT(EPOCH FROM (NOW() - o.created_at)) / 86400.0 / %(half_life)s)) AS weight,
+               SUM(oi.quantity) AS units
+        FROM {item} oi
+        JOIN {order} o ON o.id = oi.order_id
+        JOIN {size} s ON s.id = oi.size_variant_id
+        JOIN {variant} v ON v.id = s.variant_id
+        WHERE o.status = ANY(%(statuses)s)
+          AND o.created_at >= NOW() - make_interval(days => %(window)s)
+        GROUP BY o.id, v.product_id
+    )
+"""
+
+CO_PURCHASE_SQL = """
+    WITH {baskets},
+    popularity AS (
+        SELECT product_id, SUM(weight) AS pop FROM baskets GROUP BY product_id
+    ),
+    pairs AS (
+        SELECT a.product_id, b.product_id AS other_id, SUM(LEAST(a.weight, b.weight)) AS co
+        FROM baskets a
+        JOIN baskets b ON b.order_id = a.order_id AND b.product_id <> a.product_id
+        GROUP BY a.product_id, b.product_id
+    ),
+    ranked AS (
+        SELECT pairs.product_id, pairs.other_id,
+               pairs.co / SQRT(pa.pop * pb.pop) AS score,
+               ROW_NUMBER() OVER (
+                   PARTITION BY pairs.product_id ORDER BY pairs.co / SQRT(pa.pop * pb.pop) DESC, pairs.other_id
+               ) AS rn
+        FROM pairs
+        JOIN popularity pa ON pa.product_id = pairs.product_id
+        JOIN popularity pb ON pb.product_id = pairs.other_id
+        JOIN {product} p ON p.id = pairs.other_id AND p.is_active
+    )
+    SELECT product_id, ARRAY_AGG(other_id ORDER BY rn), ARRAY_AGG(score ORDER BY rn)
+    FROM ranked WHERE rn <= %(k)s
+    GROUP BY product_id
+"""
+
+BESTSELLERS_SQL = """
+    WITH {baskets},
+    ranked AS (
+        SELECT p.category_id, b.product_id, SUM(b.units * b.weight) AS score,
+               ROW_NUMBER() OVER (PARTITION BY p.category_id ORDER BY SUM(b.units * b.weight) DESC, b.product_id) AS rn
+        FROM baskets b
+        JOIN {product} p ON p.id = b.product_id AND p.is_active
+        GROUP BY p.category_id, b.product_id
+    )
+    SELECT category_id, ARRAY_AGG(product_id ORDER BY rn), ARRAY_AGG(score ORDER BY rn)
+    FROM ranked WHERE rn <= %(k)s
+    GROUP BY category_id
+"""
+
+
+def _fetch(sql, params):
+    tables = _tables()
+    baskets = BASKETS_SQL.format(**tables)
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(baskets=baskets, **tables), params)
+        return {key: list(zip(ids, scores)) for key, ids, scores in cursor.fetchall()}
+
+
+def build_recommendations(k=TOP_K, half_life_days=HALF_LIFE_DAYS, window_days=WINDOW_DAYS):
+    """Poori table dobara banata hai. Returns: {"co_purchase": n, "bestsellers": n} (kitne products ki list kis source se bani)."""
+    params = {'half_life': half_life_days, 'window': window_days, 'statuses': list(COUNTED_STATUSES), 'k': k + 1}
+    neighbours = _fetch(CO_PURCHASE_SQL, params)
+    bestsellers = _fetch(BESTSELLERS_SQL, params)
+
+    rows = []
+    stats = {'co_purchase': 0, 'bestsellers': 0}
+    for pid, category_id in Product.objects.filter(is_active=True).values_list('id', 'category_id'):
+        picks = neighbours.get(pid, [])[:k]
+        source = 'co_purchase' if picks else 'bestsellers'
+        # Kam neighbours ho to category bestsellers se list poori karo (score 0 = fallback)
+        seen = {pid, *(other for other, _ in picks)}
+        for other, _ in bestsellers.get(category_id, []):
+            if len(picks) >= k:
+                break
+            if other not in seen:
+                picks.append((other, 0.0))
+                seen.add(other)
+        if not picks:
+            continue
+        stats[source] += 1
+        rows.append(ProductRecommendation(
+            product_id=pid,
+            related_ids=[other for other, _ in picks],
+            scores=[round(score, 6) for _, score in picks],
+            source=source,
+        ))
+
+    with transaction.atomic():
+        ProductRecommendation.objects.all().delete()
+        ProductRecommendation.objects.bulk_create(rows, batch_size=1000)
+        # /related bhi catalog ETag ke peeche hai, isliye version badlo
+        bump_catalog_version()
+    return stats
+
+
+def related_product_ids(product, limit=TOP_K):
+    """Precomputed list (ek PK lookup). Batch ke baad bane product ke liye same category ke popular products."""
+    recommendation = ProductRecommendation.objects.filter(product_id=product.id).first()
+    if recommendation and recommendation.related_ids:
+        return recommendation.related_ids[:limit], recommendation.source
+    fallback = Product.objects.filter(is_active=True, category_id=product.category_id).exclude(id=product.id)
+    fallback = fallback.order_by(F('sales_rank__category_rank').asc(nulls_last=True), '-created_at', '-id')
+    return list(fallback.values_list('id', flat=True)[:limit]), 'bestsellers'
@@ -0,0 +1,171 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Product, ProductSalesDaily, ProductSalesRank, ProductVariant, SizeVariant
+from .versioning import bump_catalog_version
+
+# --- BESTSELLER RANKING ---
+# Do level ka materialization:
+# 1. ProductSalesDaily: (product, din) ki bikri. Order counted status me aaya to
+#    uski lines +, bahar gaya (cancel/return) to - (ek INSERT ... ON CONFLICT, history scan nahi)
+# 2. ProductSalesRank: daily buckets se rolling 7/30/90 din + category rank.
+#    Order badalne par sirf us order ke products, raat ko (refresh_sales_ranks) sab
+#    products taaki window aage khisak jaye.
+# Listing ka sort=bestselling sirf ProductSalesRank ka one-to-one join hai.
+
+COUNTED_STATUSES = ('confirmed', 'shipped', 'delivered')
+
+# sort name -> (annotation, expression); pagination.SORTS me bhi ye naam hai
+SALES_SORTS = {
+    'bestselling': ('sales_sort', Coalesce(F('sales_rank__units_30d'), Value(0))),
+}
+
+
+def _tables():
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    return {
+        'item': OrderItem._meta.db_table,
+        'size': SizeVariant._meta.db_table,
+        'variant': ProductVariant._meta.db_table,
+        'product': Product._meta.db_table,
+        'daily': ProductSalesDaily._meta.db_table,
+        'rank': ProductSalesRank._meta.db_table,
+    }
+
+
+# Orders ka batch (admin bulk action bhi): har order apne created_at wale din ke bucket me
+RECORD_ORDERS_SQL = """
+    INSERT INTO {daily} (product_id, day, units, revenue)
+    SELECT v.product_id, (o.created_at AT TIME ZONE %(tz)s)::date,
+           %(sign)s * SUM(oi.quantity), %(sign)s * SUM(oi.price * oi.quantity)
+    FROM {item} oi
+    JOIN {order} o ON o.id = oi.order_id
+    JOIN {size} s ON s.id = oi.size_variant_id
+    JOIN {variant} v ON v.id = s.variant_id
+    WHERE oi.order_id = ANY(%(order_ids)s)
+    GROUP BY 1, 2
+    ON CONFLICT (product_id, day) DO UPDATE
+        SET units = {daily}.units + EXCLUDED.units, revenue = {daily}.revenue + EXCLUDED.revenue
+    RETURNING product_id
+"""
+
+REFRESH_RANKS_SQL = """
+    INSERT INTO {rank} (product_id, category_id, units_7d, units_30d, units_90d, revenue_30d, updated_at)
+    SELECT p.id, p.category_id,
+           COALESCE(SUM(d.units) FILTER (WHERE d.day > %(today)s - 7), 0),
+           COALESCE(SUM(d.units) FILTER (WHERE d.day > %(today)s - 30), 0),
+           COALESCE(SUM(d.units), 0),
+           COALESCE(SUM(d.revenue) FILTER (WHERE d.day > %(today)s - 30), 0),
+           NOW()
+    FROM {product} p
+    LEFT JOIN {daily} d ON d.product_id = p.id AND d.day > %(today)s - 90
+    {where}
+    GROUP BY p.id
+    ON CONFLICT (product_id) DO UPDATE SET
+        category_id = EXCLUDED.category_id, units_7d = EXCLUDED.units_7d, units_30d = EXCLUDED.units_30d,
+        units_90d = EXCLUDED.units_90d, revenue_30d = EXCLUDED.revenue_30d, updated_at = EXCLUDED.updated_at
+    RETURNING category_id
+"""
+
+CATEGORY_RANK_SQL = """
+    UPDATE {rank} r SET category_rank = ranked.rn
+    FROM (
+        SELECT product_id, ROW_NUMBER() OVER (
+            PARTITION BY category_id ORDER BY units_30d DESC, units_90d DESC, product_id DESC
+        ) AS rn
+        FROM {rank}
+        {where}
+    ) ranked
+    WHERE r.product_id = ranked.product_id AND r.category_rank IS DISTINCT FROM ranked.rn
+"""
+
+# Pehli baar / --rebuild: poori order history se daily buckets
+REBUILD_DAILY_SQL = """
+    INSERT INTO {daily} (product_id, day, units, revenue)
+    SELECT v.product_id, (o.created_at AT TIME ZONE %(tz)s)::date,
+           SUM(oi.quantity), SUM(oi.price * oi.quantity)
+    FROM {item} oi
+    JOIN {order} o ON o.id = oi.order_id
+    JOIN {size} s ON s.id = oi.size_variant_id
+    JOIN {variant} v ON v.id = s.variant_id
+    WHERE o.status = ANY(%(statuses)s)
+    GROUP BY 1, 2
+"""
+
+
+def refresh_sales_ranks(product_ids=None):
+    """
+    Daily buckets se rolling windows dobara (None = saare products, nightly job).
+    Jin categories ke products badle unka category_rank bhi. Returns: kitne products refresh hue.
+    """
+    tables = _tables()
+    params = {'today': timezone.localdate()}
+    where = ''
+    if product_ids is not None:
+        params['ids'] = list(set(product_ids))
+        if not params['ids']:
+            return 0
+        where = 'WHERE p.id = ANY(%(ids)s)'
+
+    with connection.cursor() as cursor:
+        cursor.execute(REFRESH_RANKS_SQL.format(where=where, **tables), params)
+        categories = [row[0] for row in cursor.fetchall()]
+        if categories:
+            cursor.execute(
+                CATEGORY_RANK_SQL.format(where='WHERE category_id = ANY(%(categories)s)', **tables),
+                {'categories': list(set(categories))},
+            )
+    return len(categories)
+
+
+def record_order_sales(order_ids, sign):
+    """Orders counted status me aaye (+1) ya bahar gaye (-1): unki lines unke din ke bucket me (ek statement)."""
+    tables = {**_tables(), 'order': apps.get_model('orders', 'Order')._meta.db_table}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(RECORD_ORDERS_SQL.format(**tables), {
+                'tz': settings.TIME_ZONE, 'sign': sign, 'order_ids': list(order_ids),
+            })
+            product_ids = list(set(row[0] for row in cursor.fetchall()))
+        # Listing ETag yahan nahi badalta (har order par global version row likhni padti) -
+        # sort=bestselling nightly refresh_sales_ranks ke bump ke saath taaza hota hai
+        refresh_sales_ranks(product_ids)
+
+
+def orders_status_changed(previous_statuses, status):
+    """
+    orders/transitions.py se ({order_id: pichla status}, naya status): sirf counted set ke
+    andar/bahar jaane wale orders, commit ke baad ek batch me.
+    """
+    is_counted = status in COUNTED_STATUSES
+    order_ids = [
+        order_id for order_id, previous in previous_statuses.items()
+        if (previous in COUNTED_STATUSES) != is_counted
+    ]
+    if order_ids:
+        sign = 1 if is_counted else -1
+        transaction.on_commit(lambda: record_order_sales(order_ids, sign))
+
+
+def rebuild_sales_history():
+    """Daily buckets order history se dobara (sirf setup/repair ke liye), phir saare ranks."""
+    tables = {**_tables(), 'order': apps.get_model('orders', 'Order')._meta.db_table}
+    with transaction.atomic():
+        ProductSalesDaily.objects.all().delete()
+        with connection.cursor() as cursor:
+            cursor.execute(REBUILD_DAILY_SQL.format(**tables), {
+                'tz': settings.TIME_ZONE, 'statuses': list(COUNTED_STATUSES),
+            })
+        refresh_sales_ranks()
+        bump_catalog_version()
+
+
+def apply_sales_sort(queryset, sort):
+    if sort in SALES_SORTS:
+        name, expression = SALES_SORTS[sort]
+        queryset = queryset.annotate(**{name: expression})
+    return queryset
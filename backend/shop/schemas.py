@@ -13,17 +13,35 @@ class SizeVariantSchema(Schema):
     price: float # Base price + Adjustment
     sku: str     # Auto-generated SKU
 
+# 2.5 Responsive image version (srcset ke liye: "url 640w")
+class RenditionSchema(Schema):
+    url: str
+    width: int
+    format: str # 'webp' | 'avif'
+
 # 3. Color Variant details (Circles aur Media ke liye)
 class VariantSchema(Schema):
     id: int
     color_name: str
     color_code: str
     thumbnail: str
+    thumbnail_srcset: List[RenditionSchema] = [] # Chhote WebP/AVIF versions
     video: Optional[str] = None # Preserved
     stock: int # Suits/Saree ke liye common stock
     images: List[str] # Gallery links
+    image_srcsets: List[List[RenditionSchema]] = [] # images ke same order me
     sizes: List[SizeVariantSchema] # Size wise details
 
+# 3.5 Product summary (price range, stock, rating - ProductSummary table se)
+class ProductSummarySchema(Schema):
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    total_stock: int
+    in_stock: bool
+    review_count: int
+    avg_rating: Optional[float] = None
+    rating_histogram: List[int] # [1★, 2★, 3★, 4★, 5★]
+
 # 4. Main Product Schema (Jo customer ko dikhega)
 class ProductSchema(Schema):
     id: int
@@ -37,5 +55,139 @@ class ProductSchema(Schema):
     
     # List of Variants (Ab circles aur gallery isi se banegi)
     variants: List[VariantSchema]
+    summary: Optional[ProductSummarySchema] = None # Listing time par judta hai
     
-    # Note: 'supplier' humne yahan bhi nahi rakha, taaki wo frontend par na jaye ✅
\ No newline at end of file
+    # Note: 'supplier' humne yahan bhi nahi rakha, taaki wo frontend par na jaye ✅
+
+# 5. Paginated listing (Keyset cursor ke saath)
+class ProductPageSchema(Schema):
+    items: List[ProductSchema]
+    page_size: int # Ek page me maximum kitne products
+    next_cursor: Optional[str] = None # Agla page laane ke liye opaque token
+    has_more: bool
+
+# 6. Facet filters (Query params: /products aur /products/facets dono me)
+class ProductFilterSchema(Schema):
+    min_price: Optional[float] = None # Effective size price >= min_price
+    max_price: Optional[float] = None # Effective size price < max_price
+    fabric: Optional[str] = None
+    color: Optional[str] = None
+    size: Optional[str] = None
+    in_stock: bool = False
+    min_rating: Optional[float] = None # Average rating >= min_rating
+
+# 7. Facet counts (Filter sidebar ke liye)
+class FacetValueSchema(Schema):
+    value: str
+    count: int
+
+class PriceBucketSchema(Schema):
+    key: str
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    count: int
+
+class ProductFacetsSchema(Schema):
+    total: int # Filters ke baad kitne products bache
+    in_stock: int
+    price: List[PriceBucketSchema]
+    fabric: List[FacetValueSchema]
+    color: List[FacetValueSchema]
+    size: List[FacetValueSchema]
+
+# 8. Product card (Listing grid ke liye halka projection, bina gallery/video/SKU)
+class CardVariantSchema(Schema):
+    id: int
+    color_name: str
+    color_code: str
+    thumbnail: str
+    thumbnail_srcset: List[RenditionSchema] = []
+
+class ProductCardSchema(Schema):
+    id: int
+    name: str
+    category_name: str
+    base_price: float
+    original_price: Optional[float] = None
+    has_size: bool
+    in_stock: bool
+    thumbnail: str # Pehla available thumbnail
+    thumbnail_srcset: List[RenditionSchema] = []
+    variants: List[CardVariantSchema] # Colour swatches
+    summary: Optional[ProductSummarySchema] = None
+
+class ProductCardPageSchema(Schema):
+    items: List[ProductCardSchema]
+    page_size: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+# 9. Batch fetch (Cart/Wishlist rehydration)
+class ProductBatchItemSchema(Schema):
+    id: int
+    status: str # 'ok' | 'not_found' | 'inactive'
+    product: Optional[ProductSchema] = None # Sirf 'ok' par
+
+class ProductBatchSchema(Schema):
+    items: List[ProductBatchItemSchema] # Wahi order jo ids ka tha
+
+class RelatedProductsSchema(Schema):
+    source: str # 'co_purchase' | 'bestsellers'
+    items: List[ProductCardSchema] # Score ke order me
+
+# 10. Storefront bootstrap (Home page ka ek hi response)
+class StorefrontCategorySchema(Schema):
+    id: int
+    name: str
+    has_size: bool
+    slug: str
+    image: str
+    srcset: List[RenditionSchema] = []
+    active_products: int
+
+class StorefrontAnnouncementSchema(Schema):
+    text: str
+    link: Optional[str] = None
+    background_color: str
+    text_color: str
+
+class StorefrontBannerSchema(Schema):
+    id: int
+    title: Optional[str] = None
+    image: str
+    srcset: List[RenditionSchema] = []
+
+class StorefrontSchema(Schema):
+    version: str # Payload hash, ETag bhi yahi hai
+    categories: List[StorefrontCategorySchema]
+    announcements: List[StorefrontAnnouncementSchema]
+    banners: List[StorefrontBannerSchema]
+
+# 11. Typeahead suggestions (Header search box)
+class SuggestionSchema(Schema):
+    id: int
+    name: str
+    thumbnail: str
+    base_price: float
+
+class SuggestSchema(Schema):
+    items: List[SuggestionSchema]
+
+# 12. Warehouse stock sync (POST /inventory/bulk)
+class StockChangeSchema(Schema):
+    sku: str
+    delta: Optional[int] = None # +5 aaya, -2 bika
+    absolute: Optional[int] = None # Ginti ke baad seedha naya stock
+
+class StockBatchSchema(Schema):
+    items: List[StockChangeSchema]
+
+class StockResultSchema(Schema):
+    sku: str
+    status: str # 'ok' | 'invalid' | 'not_found' | 'duplicate_sku' | 'duplicate_entry' | 'negative_stock'
+    previous: Optional[int] = None
+    stock: Optional[int] = None
+
+class StockBatchResultSchema(Schema):
+    updated: int
+    items: List[StockResultSchema] # Wahi order jo request ka tha
@@ -0,0 +1,82 @@
+import re
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db.models import F, FloatField, Func, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Cast
+
+from .models import Category, Product, ProductVariant
+
+# --- PRODUCT SEARCH (PostgreSQL Full-Text + Trigram) ---
+# Product.search_vector me name, fabric, category, colours aur description ka
+# weighted tsvector pehle se bana rehta hai (GIN index ke saath), isliye search
+# me sequential scan nahi hota. Agar full-text se kuch na mile (typo wagairah),
+# to pg_trgm word similarity wala fallback chalta hai.
+
+# 'simple' config: Hinglish naam (Anarkali, Banarasi) ko English stemmer na bigaade
+SEARCH_CONFIG = 'simple'
+
+# Ye sorts search mode khud tay karta hai, client se nahi aate
+SEARCH_SORTS = ('relevance', 'similarity')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector_expression():
+    """Product row ke liye weighted tsvector (A: naam, B: fabric/category, C: colours, D: description)."""
+    category_name = Subquery(Category.objects.filter(id=OuterRef('category_id')).values('name')[:1])
+    colour_names = Func(
+        ArraySubquery(ProductVariant.objects.filter(product_id=OuterRef('pk')).values('color_name')),
+        Value(' '),
+        function='array_to_string',
+        output_field=TextField(),
+    )
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('fabric', category_name, weight='B', config=SEARCH_CONFIG)
+        + SearchVector(colour_names, weight='C', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(**lookup):
+    """Matching products ka search_vector ek set-based UPDATE se dobara banata hai."""
+    return Product.objects.filter(**lookup).update(search_vector=search_vector_expression())
+
+
+def _prefix_query(term):
+    # Har word ko prefix match banao ("ana sil" -> ana:* & sil:*), taaki typing ke beech bhi results aayein
+    tokens = TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return SearchQuery(' & '.join(f'{t}:*' for t in tokens), search_type='raw', config=SEARCH_CONFIG)
+
+
+def full_text_matches(queryset, term):
+    query = _prefix_query(term)
+    if query is None:
+        return queryset.none()
+    # float4 rank ko double me cast kiya taaki cursor me exact value round-trip ho
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+    )
+
+
+def fuzzy_matches(queryset, term):
+    # name %> term : pg_trgm GIN index (gin_trgm_ops) isi operator ko use karta hai
+    return queryset.filter(name__trigram_word_similar=term).annotate(
+        search_rank=Cast(TrigramWordSimilarity(term, 'name'), FloatField())
+    )
+
+
+def apply_search(queryset, term, sort=None, cursor_sort=None):
+    """
+    Search filter lagata hai aur (queryset, sort) return karta hai.
+    Bina explicit sort ke results rank se sort hote hain ('relevance'),
+    aur fallback me similarity se ('similarity'). Cursor se pata chalta hai
+    ki pichla page kis mode me tha, taaki agle page par dobara check na karna pade.
+    """
+    matches = full_text_matches(queryset, term)
+    if cursor_sort == 'similarity' or (cursor_sort != 'relevance' and not matches.exists()):
+        return fuzzy_matches(queryset, term), sort or 'similarity'
+    return matches, sort or 'relevance'
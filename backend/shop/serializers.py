@@ -0,0 +1,53 @@
+from .images import srcset
+from .media import media_url
+
+# --- MAIN PRODUCT LOGIC (Safe Mode) ---
+
+def serialize_product(p):
+    """
+    Helper function jo Product Model ko JSON data mein convert karta hai.
+    Images ke absolute URLs media_url() se bante hain, isliye cache/export me bhi chalta hai.
+    """
+    variants_data = []
+    
+    for v in p.variants.all():
+        sizes_data = []
+        
+        # 1. Size Logic (prefetch se aata hai, alag .exists() query ki zarurat nahi)
+        for s in v.sizes.all():
+            sizes_data.append({
+                "id": s.id,
+                "size": s.size,
+                "stock": s.stock,  # Request par live holds minus (shop/cache.py with_live_stock)
+                "price": float(p.base_price + (s.price_adjustment or 0)),
+                "sku": s.sku or "" 
+            })
+        
+        # 2. Variant Data Pack karna
+        variants_data.append({
+            "id": v.id,
+            "color_name": v.color_name,
+            "color_code": v.color_code,
+            "thumbnail": media_url(v.thumbnail),
+            "thumbnail_srcset": srcset(v.renditions),
+            "video": media_url(v.video) or None,
+            "stock": v.stock,
+            "images": [
+                media_url(img.image)
+                for img in v.images.all() if img.image
+            ],
+            "image_srcsets": [srcset(img.renditions) for img in v.images.all() if img.image],
+            "sizes": sizes_data
+        })
+
+    return {
+        "id": p.id,
+        "name": p.name,
+        "category_name": p.category.name if p.category else "Uncategorized",
+        "description": p.description or "",
+        "fabric": p.fabric or "",
+        "base_price": float(p.base_price),
+        "original_price": float(p.original_price) if p.original_price else None,
+        "has_size": p.category.has_size if p.category else False,
+        "variants": variants_data
+    }
@@ -0,0 +1,105 @@
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+from .models import Announcement, Banner, Category, Product, ProductVariant, ProductImage, SizeVariant
+from .cache import touch_products, clear_category_map
+from .search import update_search_vectors
+from .versioning import bump_catalog_version
+from .bootstrap import schedule_storefront_rebuild
+from .suggest import suggest_index
+from .images import schedule_renditions
+from .summary import schedule_summary_refresh
+
+# ✅ Product khud save hota hai to updated_at (auto_now) apne aap badal jata hai.
+# Baaki models ke change par parent product ka version yahan se badhate hain,
+# taaki uska cached JSON document agli request par dobara bane.
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    # Naam/fabric/description badle to search vector bhi update ho
+    update_search_vectors(id=instance.id)
+
+@receiver([post_save, post_delete], sender=ProductVariant)
+def variant_changed(sender, instance, **kwargs):
+    touch_products(id=instance.product_id)
+    update_search_vectors(id=instance.product_id) # Colour names search me hain
+
+@receiver([post_save, post_delete], sender=SizeVariant)
+def size_changed(sender, instance, **kwargs):
+    touch_products(variants__id=instance.variant_id)
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def image_changed(sender, instance, **kwargs):
+    touch_products(variants__id=instance.variant_id)
+
+@receiver(post_save, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    # Category ka naam / has_size har product document (aur search vector) me hai
+    touch_products(category_id=instance.id)
+    update_search_vectors(category_id=instance.id)
+
+@receiver([post_save, post_delete], sender=Category)
+def category_map_changed(sender, **kwargs):
+    # Slug/naam -> id map dobara banega
+    clear_category_map()
+
+# ✅ Koi bhi catalog change -> CatalogVersion +1 (listing endpoints ka ETag badal jata hai)
+@receiver([post_save, post_delete], sender=Announcement)
+@receiver([post_save, post_delete], sender=Banner)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductVariant)
+@receiver([post_save, post_delete], sender=SizeVariant)
+@receiver([post_save, post_delete], sender=ProductImage)
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version()
+
+# ✅ Home page bootstrap blob (categories + active product counts, banners, announcements)
+@receiver([post_save, post_delete], sender=Announcement)
+@receiver([post_save, post_delete], sender=Banner)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+def storefront_changed(sender, **kwargs):
+    schedule_storefront_rebuild()
+
+# ✅ Is worker ka typeahead index turant update (baaki workers watermark refresh se)
+@receiver(post_save, sender=Product)
+def suggest_product_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: suggest_index.refresh_products([instance.id]))
+
+@receiver(post_delete, sender=Product)
+def suggest_product_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: suggest_index.remove_product(instance.id))
+
+@receiver([post_save, post_delete], sender=ProductVariant)
+def suggest_variant_changed(sender, instance, **kwargs):
+    # Colour naam / thumbnail
+    transaction.on_commit(lambda: suggest_index.refresh_products([instance.product_id]))
+
+# ✅ Nayi upload hui image ke WebP/AVIF renditions (commit ke baad process pool me)
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Banner)
+def image_uploaded(sender, instance, **kwargs):
+    schedule_renditions(instance)
+
+# ✅ ProductSummary (price range, total stock) - reviews wala hissa reviews/signals.py me
+@receiver(post_save, sender=Product)
+def summary_product_saved(sender, instance, **kwargs):
+    schedule_summary_refresh(instance.id) # base_price badal sakta hai
+
+@receiver([post_save, post_delete], sender=ProductVariant)
+def summary_variant_changed(sender, instance, **kwargs):
+    schedule_summary_refresh(instance.product_id)
+
+@receiver([post_save, post_delete], sender=SizeVariant)
+def summary_size_changed(sender, instance, **kwargs):
+    # Variant pehle se loaded ho to wahi, warna sirf product_id (poora variant row load nahi).
+    # variant_id se lookup - delete ke baad bhi chalta hai (size row ab DB me nahi)
+    if SizeVariant.variant.is_cached(instance):
+        product_id = instance.variant.product_id
+    else:
+        product_id = ProductVariant.objects.filter(pk=instance.variant_id).values_list('product_id', flat=True).first()
+    if product_id is not None:
+        schedule_summary_refresh(product_id)
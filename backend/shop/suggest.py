@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.db import connection
+
+from .media import media_url
+from .models import Product, ProductVariant
+from .search import TOKEN_RE
+
+logger = logging.getLogger(__name__)
+
+# --- TYPEAHEAD SUGGEST INDEX ---
+# Header search box har keystroke par suggestions maangta hai. Full search
+# (DB + poora product document) ki jagah har worker ke memory me ek chhota
+# sorted array rehta hai: (token, product_id) tuples. Prefix match = bisect se
+# pehli matching position aur wahan se aage jab tak token prefix se shuru ho.
+#
+# Refresh - sab ek background thread me, /suggest request sirf memory padhti hai (DB query nahi):
+# - Server start (backend/asgi.py) ya pehli suggest request par thread chalu, poora index banata hai
+#   (tab tak suggestions khali aate hain)
+# - Har REFRESH_INTERVAL par sirf updated_at > watermark wale products dobara (1 query)
+# - Har FULL_REBUILD_INTERVAL par poora rebuild (delete hue products bhi nikal jaate hain)
+# - Isi worker me save/delete hua to signals turant us product ko update karte hain
+# Management commands (migrate etc.) me thread nahi chalta.
+
+REFRESH_INTERVAL = 30  # seconds
+FULL_REBUILD_INTERVAL = 60 * 10
+# Lambe transactions ka updated_at commit se pehle ka ho sakta hai, isliye thoda peeche se padhte hain
+REFRESH_OVERLAP = timedelta(minutes=2)
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+# Kis field me token mila uska weight (naam sabse important)
+NAME, CATEGORY, FABRIC, COLOUR = 4, 2, 2, 1
+
+
+def _tokens(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._keys = []  # sorted [(token, product_id, weight)]
+        self._docs = {}  # product_id -> {"id", "name", "thumbnail", "base_price"}
+        self._keys_by_product = {}  # product_id -> [keys] (remove karne ke liye)
+        self._watermark = None
+        self._built_at = 0.0
+
+    # --- loading ---
+
+    def _load(self, products):
+        """products queryset se {pid: (doc, keys)} banata hai (2 queries)."""
+        rows = list(products.values('id', 'name', 'fabric', 'base_price', 'is_active', 'category__name', 'updated_at'))
+        variants = {}
+        for v in ProductVariant.objects.filter(product_id__in=[r['id'] for r in rows]).order_by('id').values(
+            'product_id', 'color_name', 'thumbnail'
+        ):
+            variants.setdefault(v['product_id'], []).append(v)
+
+        loaded = {}
+        for r in rows:
+            if not r['is_active']:
+                loaded[r['id']] = None
+                continue
+            colours = variants.get(r['id'], [])
+            weights = {}
+            for text, weight in [(r['name'], NAME), (r['category__name'], CATEGORY), (r['fabric'], FABRIC)] + [
+                (v['color_name'], COLOUR) for v in colours
+            ]:
+                for token in _tokens(text):
+                    weights[token] = max(weights.get(token, 0), weight)
+
+            thumbnail = next((v['thumbnail'] for v in colours if v['thumbnail']), '')
+            doc = {
+                "id": r['id'],
+                "name": r['name'],
+                "thumbnail": media_url(thumbnail),
+                "base_price": float(r['base_price']),
+            }
+            loaded[r['id']] = (doc, [(token, r['id'], weight) for token, weight in weights.items()])
+
+        latest = max((r['updated_at'] for r in rows), default=None)
+        return loaded, latest
+
+    def rebuild(self):
+        loaded, latest = self._load(Product.objects.all())
+        keys, docs, by_product = [], {}, {}
+        for pid, entry in loaded.items():
+            if entry:
+                docs[pid], by_product[pid] = entry
+                keys.extend(entry[1])
+        keys.sort()
+        with self._lock:
+            self._keys, self._docs, self._keys_by_product = keys, docs, by_product
+            self._watermark = latest
+            self._built_at = time.monotonic()
+
+    def _apply(self, loaded):
+        with self._lock:
+            for pid, entry in loaded.items():
+                for key in self._keys_by_product.pop(pid, []):
+                    i = bisect_left(self._keys, key)
+                    if i < len(self._keys) and self._keys[i] == key:
+                        del self._keys[i]
+                self._docs.pop(pid, None)
+                if entry:
+                    self._docs[pid], self._keys_by_product[pid] = entry
+                    for key in entry[1]:
+                        insort(self._keys, key)
+
+    def refresh_products(self, product_ids):
+        """Kuch products ko index me dobara daalo (ya hatao agar delete/inactive hue)."""
+        if not self._built_at:
+            return
+        loaded, _ = self._load(Product.objects.filter(id__in=product_ids))
+        for pid in product_ids:
+            loaded.setdefault(pid, None)  # DB me nahi mila = delete ho gaya
+        self._apply(loaded)
+
+    def remove_product(self, product_id):
+        if self._built_at:
+            self._apply({product_id: None})
+
+    def refresh(self):
+        """Background thread ka ek round: rebuild due hai to poora, warna sirf badle hue products."""
+        now = time.monotonic()
+        if not self._built_at or now - self._built_at >= FULL_REBUILD_INTERVAL:
+            self.rebuild()
+            return
+        since = self._watermark - REFRESH_OVERLAP if self._watermark else None
+        changed = Product.objects.all() if since is None else Product.objects.filter(updated_at__gt=since)
+        if changed.exists():
+            loaded, latest = self._load(changed)
+            self._apply(loaded)
+            if latest and (self._watermark is None or latest > self._watermark):
+                self._watermark = latest
+
+    # --- background thread ---
+
+    def start(self):
+        """Refresh thread chalu karo (dobara call karna safe hai)."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='suggest-index', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Suggest index refresh fail hua, agle round me dobara")
+            finally:
+                connection.close()  # Thread ka DB connection beech ke intervals me khula na rahe
+            time.sleep(REFRESH_INTERVAL)
+
+    # --- query ---
+
+    def suggest(self, term, limit=DEFAULT_LIMIT):
+        """Har word prefix ki tarah match hona chahiye ("red ban" -> Red Banarasi ...). Top-k docs."""
+        if self._thread is None:
+            self.start()
+        tokens = _tokens(term)
+        if not tokens:
+            return []
+
+        with self._lock:
+            scores = None
+            for token in dict.fromkeys(tokens):
+                matched = {}
+                i = bisect_left(self._keys, (token,))
+                while i < len(self._keys) and self._keys[i][0].startswith(token):
+                    _, pid, weight = self._keys[i]
+                    # Poora word match, sirf prefix se thoda upar
+                    score = weight * 2 if self._keys[i][0] == token else weight
+                    matched[pid] = max(matched.get(pid, 0), score)
+                    i += 1
+                if scores is None:
+                    scores = matched
+                else:
+                    scores = {pid: s + matched[pid] for pid, s in scores.items() if pid in matched}
+                if not scores:
+                    return []
+
+            # Score zyada pehle, barabari par naya product (bada id) pehle
+            top = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:limit]
+            return [self._docs[pid] for pid, _ in top]
+
+
+suggest_index = SuggestIndex()
+
+
+def suggest(term, limit=None):
+    limit = max(1, min(limit or DEFAULT_LIMIT, MAX_LIMIT))
+    return suggest_index.suggest(term, limit)
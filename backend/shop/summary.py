@@ -0,0 +1,113 @@
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .facets import held_quantity
+from .models import Product, ProductSummary, ProductVariant
+
+# --- PRODUCT SUMMARY (denormalized aggregates) ---
+# Price range, total stock aur rating summary har product ke liye ek row me.
+# SizeVariant / ProductVariant / Product / Review ke save-delete par sirf us
+# product ki row dobara banti hai: do GROUP BY queries + ek bulk upsert.
+
+SUMMARY_FIELDS = (
+    'min_price', 'max_price', 'total_stock', 'in_stock',
+    'review_count', 'avg_rating', 'rating_histogram',
+)
+
+# Listing querysets me .select_related('summary').only(..., *SUMMARY_ONLY)
+SUMMARY_ONLY = tuple(f'summary__{field}' for field in SUMMARY_FIELDS)
+
+# sort name -> (annotation, expression); pagination.SORTS me bhi ye naam hain
+SUMMARY_SORTS = {
+    'rating': ('rating_sort', Coalesce(F('summary__avg_rating'), Value(0.0))),
+    'reviews': ('reviews_sort', Coalesce(F('summary__review_count'), Value(0))),
+}
+
+
+def refresh_product_summaries(product_ids):
+    """Diye gaye products ki summary rows set-based dobara banao."""
+    product_ids = list(set(product_ids))
+    base_prices = dict(Product.objects.filter(id__in=product_ids).values_list('id', 'base_price'))
+    if not base_prices:
+        return 0
+
+    # Ek line = colour + size (size na ho to variant khud), facets.product_lines jaisa hi
+    line_price = F('product__base_price') + Coalesce(F('sizes__price_adjustment'), Value(Decimal('0')))
+    lines = {
+        row['product_id']: row
+        for row in ProductVariant.objects.filter(product_id__in=base_prices).values('product_id').annotate(
+            min_price=Min(line_price),
+            max_price=Max(line_price),
+            # Available stock: live holds (pending online payments) minus
+            total_stock=Sum(Greatest(Coalesce(F('sizes__stock') - held_quantity('sizes__id'), F('stock')), Value(0))),
+        )
+    }
+
+    # reviews app shop ko import karta hai, isliye yahan model lazily
+    Review = apps.get_model('reviews', 'Review')
+    reviews = {
+        row['product_id']: row
+        for row in Review.objects.filter(product_id__in=base_prices).values('product_id').annotate(
+            count=Count('id'),
+            avg=Avg('rating'),
+            **{f'r{star}': Count('id', filter=Q(rating=star)) for star in range(1, 6)},
+        )
+    }
+
+    summaries = []
+    for pid, base_price in base_prices.items():
+        line = lines.get(pid, {})
+        review = reviews.get(pid, {})
+        total_stock = line.get('total_stock') or 0
+        summaries.append(ProductSummary(
+            product_id=pid,
+            min_price=line.get('min_price') or base_price,
+            max_price=line.get('max_price') or base_price,
+            total_stock=total_stock,
+            in_stock=total_stock > 0,
+            review_count=review.get('count', 0),
+            avg_rating=round(review['avg'], 2) if review.get('avg') is not None else None,
+            rating_histogram=[review.get(f'r{star}', 0) for star in range(1, 6)],
+        ))
+
+    ProductSummary.objects.bulk_create(
+        summaries, update_conflicts=True, unique_fields=['product'], update_fields=[*SUMMARY_FIELDS, 'updated_at'],
+    )
+    return len(summaries)
+
+
+def schedule_summary_refresh(product_id):
+    transaction.on_commit(lambda: refresh_product_summaries([product_id]))
+
+
+def summary_data(product):
+    """select_related('summary') wale product se API dict (row na ho to None)."""
+    summary = getattr(product, 'summary', None)
+    if summary is None:
+        return None
+    return {
+        "min_price": float(summary.min_price) if summary.min_price is not None else None,
+        "max_price": float(summary.max_price) if summary.max_price is not None else None,
+        "total_stock": summary.total_stock,
+        "in_stock": summary.in_stock,
+        "review_count": summary.review_count,
+        "avg_rating": summary.avg_rating,
+        "rating_histogram": summary.rating_histogram,
+    }
+
+
+def with_summaries(docs, products):
+    """Cached product documents me listing time par summary jodo (documents cache me summary nahi hoti)."""
+    by_id = {p.id: summary_data(p) for p in products}
+    return [{**doc, "summary": by_id.get(doc["id"])} for doc in docs]
+
+
+def apply_summary_sort(queryset, sort):
+    if sort in SUMMARY_SORTS:
+        name, expression = SUMMARY_SORTS[sort]
+        queryset = queryset.annotate(**{name: expression})
+    return queryset
@@ -1,3 +1,489 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .catalog_io import COLUMNS, CatalogImportError, export_catalog, import_catalog
+from .models import Announcement, Category, Product, ProductVariant, SizeVariant
+from .suggest import SuggestIndex, suggest_index
+
+
+class ListingQueryCountTests(TestCase):
+    """Listing ki queries products ki ginti se nahi badhni chahiye (N+1 na ho)."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Kurti Sets", has_size=True)
+
+    def add_products(self, count):
+        for i in range(count):
+            product = Product.objects.create(
+                category=self.category, name=f"Cotton Kurti {i}", description="Daily wear", base_price=999
+            )
+            variant = ProductVariant.objects.create(
+                product=product, color_name="Red", color_code="#ff0000", thumbnail="products/thumbnails/red.jpg"
+            )
+            SizeVariant.objects.create(variant=variant, size="M", stock=5)
+
+    def count_queries(self, url):
+        cache.clear()  # Cold cache: documents dobara bante hain
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_listing_queries_do_not_grow_with_results(self):
+        url = f"/api/shop/products?category={self.category.slug}&limit=50"
+
+        self.add_products(3)
+        small, data = self.count_queries(url)
+        self.assertEqual(len(data["items"]), 3)
+
+        self.add_products(7)
+        large, data = self.count_queries(url)
+        self.assertEqual(len(data["items"]), 10)
+
+        self.assertEqual(small, large)
+
+    def test_card_queries_do_not_grow_with_results(self):
+        url = "/api/shop/products/cards?category=kurti sets&limit=50"
+
+        self.add_products(3)
+        small, _ = self.count_queries(url)
+        self.add_products(7)
+        large, data = self.count_queries(url)
+
+        self.assertEqual(len(data["items"]), 10)
+        self.assertEqual(small, large)
+
+    def test_unknown_category_returns_empty_page(self):
+        self.add_products(2)
+        response = self.client.get("/api/shop/products?category=does-not-exist")
+        self.assertEqual(response.json()["items"], [])
+
+
+class FacetTests(TestCase):
+    """Filter sidebar counts."""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Kurti Sets", has_size=True)
+        for name, price, fabric, stock in [("Cotton Kurti", 999, "Cotton", 5), ("Silk Kurti", 2999, "Silk", 0)]:
+            product = Product.objects.create(
+                category=self.category, name=name, description="Daily wear", base_price=price, fabric=fabric
+            )
+            variant = ProductVariant.objects.create(product=product, color_name="Red", color_code="#ff0000")
+            SizeVariant.objects.create(variant=variant, size="M", stock=stock)
+
+    def test_counts(self):
+        data = self.client.get(f"/api/shop/products/facets?category={self.category.slug}").json()
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["in_stock"], 1)
+        self.assertEqual({f["value"]: f["count"] for f in data["fabric"]}, {"Cotton": 1, "Silk": 1})
+        self.assertEqual({b["key"]: b["count"] for b in data["price"]}["1000_2500"], 0)
+
+    def test_unknown_category_returns_empty_facets(self):
+        response = self.client.get("/api/shop/products/facets?category=does-not-exist")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["total"], data["in_stock"], data["fabric"]), (0, 0, []))
+        self.assertEqual([b["count"] for b in data["price"]], [0, 0, 0, 0])
+
+
+class CatalogImportTests(TestCase):
+    """CSV import: diff, apply, naam se match, galat rows, export -> import round trip."""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Kurti Sets", has_size=True)
+
+    def sheet(self, *rows):
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({"category": self.category.slug, **row})
+        out.seek(0)
+        return out
+
+    def new_product_rows(self, name="Cotton Kurti"):
+        product = {"product_name": name, "base_price": "999", "color_name": "Red", "color_code": "#ff0000"}
+        return [{**product, "size": "m", "stock": "5"}, {**product, "size": "L", "stock": "3", "price_adjustment": "50"}]
+
+    def test_dry_run_reports_without_writing(self):
+        plan, applied = import_catalog(self.sheet(*self.new_product_rows()), dry_run=True)
+
+        self.assertFalse(applied)
+        self.assertEqual(plan.summary(), {
+            'products': {'create': 1, 'update': 0},
+            'variants': {'create': 1, 'update': 0},
+            'sizes': {'create': 2, 'update': 0},
+        })
+        self.assertEqual(len(plan.changes), 4)
+        self.assertFalse(Product.objects.exists())
+
+    def test_apply_creates_then_updates(self):
+        _, applied = import_catalog(self.sheet(*self.new_product_rows()))
+        self.assertTrue(applied)
+        product = Product.objects.get()
+        variant = product.variants.get()
+        sizes = {s.size: s for s in variant.sizes.all()}
+        self.assertEqual({size: s.stock for size, s in sizes.items()}, {"M": 5, "L": 3})
+        self.assertEqual(sizes["M"].sku, f"{product.id}-{variant.id}-M")
+
+        # Same naam (alag case) aur size id: update, naya product nahi
+        plan, applied = import_catalog(self.sheet(
+            {"product_name": "COTTON KURTI", "base_price": "1099", "color_name": "red", "size_id": sizes["M"].id,
+             "size": "M", "stock": "9"},
+        ))
+        self.assertTrue(applied)
+        self.assertEqual(plan.summary()['products'], {'create': 0, 'update': 1})
+        self.assertEqual(Product.objects.count(), 1)
+        product.refresh_from_db()
+        sizes["M"].refresh_from_db()
+        sizes["L"].refresh_from_db()
+        self.assertEqual((product.base_price, sizes["M"].stock, sizes["L"].stock), (1099, 9, 3))
+
+    def test_errors_save_nothing(self):
+        rows = [
+            {"category": "no-such-category", "product_name": "Silk Saree", "base_price": "1999", "color_name": "Blue"},
+            {"product_name": "No Price", "color_name": "Blue"},
+            {"product_name": "Repeat", "base_price": "10", "color_name": "Blue", "size": "M"},
+            {"product_name": "Repeat", "base_price": "10", "color_name": "Blue", "size": "M"},
+            {"product_name": "Good", "base_price": "10", "color_name": "Blue", "size": "S", "stock": "x"},
+        ]
+        with self.assertRaises(CatalogImportError) as raised:
+            import_catalog(self.sheet(*rows[4:]))
+        self.assertEqual(raised.exception.errors, ["line 2: stock 'x' is not a whole number"])
+
+        with self.assertRaises(CatalogImportError) as raised:
+            import_catalog(self.sheet(*rows[:4]))
+        errors = raised.exception.errors
+        self.assertEqual(len(errors), 3)
+        self.assertIn("line 2: unknown category", errors[0])
+        self.assertIn("line 3: base_price is required", errors[1])
+        self.assertIn("line 5: size M repeated", errors[2])
+        self.assertFalse(Product.objects.exists())
+
+    def test_export_import_round_trip(self):
+        import_catalog(self.sheet(*self.new_product_rows()))
+        Product.objects.create(category=self.category, name="No Colours Yet", description="", base_price=499)
+
+        exported = io.StringIO()
+        self.assertEqual(export_catalog(exported), 3)
+        exported.seek(0)
+        plan, applied = import_catalog(exported)
+        self.assertFalse(applied)
+        self.assertEqual(plan.changes, [])
+
+        # Export edit karke wapas: sirf wahi badla
+        exported.seek(0)
+        edited = io.StringIO(exported.getvalue().replace(",Red,#ff0000,", ",Maroon,#ff0000,"))
+        plan, applied = import_catalog(edited)
+        self.assertTrue(applied)
+        self.assertEqual(plan.summary()['variants'], {'create': 0, 'update': 1})
+        self.assertEqual(ProductVariant.objects.get().color_name, "Maroon")
+        self.assertEqual(Product.objects.count(), 2)
+
+
+@override_settings(INVENTORY_API_KEYS=["warehouse-key"])
+class InventorySyncTests(TestCase):
+    """/inventory/bulk: har SKU ka status, FREE size variant sync, error par poora batch rollback."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Suits", has_size=True)
+        product = Product.objects.create(category=category, name="Cotton Suit", description="", base_price=1499)
+        self.variant = ProductVariant.objects.create(product=product, color_name="Red", color_code="#ff0000", stock=4)
+        self.m = SizeVariant.objects.create(variant=self.variant, size="M", sku="SUIT-M", stock=5)
+        self.free = SizeVariant.objects.create(variant=self.variant, size="FREE", sku="SUIT-FREE", stock=4)
+        other = ProductVariant.objects.create(product=product, color_name="Blue", color_code="#0000ff")
+        SizeVariant.objects.create(variant=other, size="M", sku="DUP", stock=1)
+        SizeVariant.objects.create(variant=other, size="L", sku="DUP", stock=1)
+
+    def post(self, items, key="warehouse-key"):
+        return self.client.post(
+            "/api/shop/inventory/bulk", json.dumps({"items": items}), content_type="application/json",
+            HTTP_X_API_KEY=key,
+        )
+
+    def test_wrong_key_rejected(self):
+        self.assertEqual(self.post([{"sku": "SUIT-M", "delta": 1}], key="nope").status_code, 401)
+
+    def test_per_sku_statuses(self):
+        response = self.post([
+            {"sku": "SUIT-M", "delta": -2},
+            {"sku": "SUIT-FREE", "delta": -10},
+            {"sku": "MISSING", "absolute": 3},
+            {"sku": "DUP", "absolute": 3},
+            {"sku": "SUIT-M", "delta": 1},
+            {"sku": "SUIT-FREE", "delta": 1, "absolute": 2},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual(
+            [(item["sku"], item["status"]) for item in data["items"]],
+            [("SUIT-M", "ok"), ("SUIT-FREE", "negative_stock"), ("MISSING", "not_found"), ("DUP", "duplicate_sku"),
+             ("SUIT-M", "duplicate_entry"), ("SUIT-FREE", "invalid")],
+        )
+        self.assertEqual((data["items"][0]["previous"], data["items"][0]["stock"]), (5, 3))
+        self.m.refresh_from_db()
+        self.free.refresh_from_db()
+        self.assertEqual((self.m.stock, self.free.stock), (3, 4))
+        self.assertEqual(list(SizeVariant.objects.filter(sku="DUP").values_list("stock", flat=True)), [1, 1])
+
+    def test_free_size_syncs_variant_stock(self):
+        self.post([{"sku": "SUIT-FREE", "absolute": 9}, {"sku": "SUIT-M", "absolute": 2}])
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.stock, 9)  # Sirf FREE size variant ka master stock
+
+        self.post([{"sku": "SUIT-FREE", "delta": -3}])
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.stock, 6)
+
+    def test_error_rolls_back_whole_batch(self):
+        with mock.patch("shop.inventory.refresh_product_summaries", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.post([{"sku": "SUIT-M", "absolute": 0}, {"sku": "SUIT-FREE", "absolute": 0}])
+        self.m.refresh_from_db()
+        self.free.refresh_from_db()
+        self.variant.refresh_from_db()
+        self.assertEqual((self.m.stock, self.free.stock, self.variant.stock), (5, 4, 4))
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor se saare pages: koi product chhoota ya dohraya nahi, same price par id se tie."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Kurti Sets", has_size=True)
+        self.products = [
+            Product.objects.create(category=category, name=f"Kurti {i}", description="", base_price=price)
+            for i, price in enumerate([800, 500, 999, 500, 800, 500, 999])
+        ]
+
+    def walk(self, sort, limit=2):
+        ids, cursor, pages = [], None, 0
+        while True:
+            url = f"/api/shop/products?sort={sort}&limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+            data = self.client.get(url).json()
+            pages += 1
+            ids += [item["id"] for item in data["items"]]
+            self.assertEqual(data["has_more"], data["next_cursor"] is not None)
+            if not data["has_more"]:
+                return ids, pages
+            cursor = data["next_cursor"]
+
+    def test_price_low_ties_broken_by_id(self):
+        ids, pages = self.walk("price_low")
+        expected = [p.id for p in sorted(self.products, key=lambda p: (p.base_price, p.id))]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_price_high_walks_backwards(self):
+        ids, _ = self.walk("price_high", limit=3)
+        expected = [p.id for p in sorted(self.products, key=lambda p: (-p.base_price, -p.id))]
+        self.assertEqual(ids, expected)
+
+    def test_newest_and_default_sort(self):
+        ids, _ = self.walk("newest")
+        self.assertEqual(ids, [p.id for p in reversed(self.products)])
+        ids, _ = self.walk("id", limit=5)
+        self.assertEqual(ids, [p.id for p in self.products])
+
+    def test_bad_cursor_rejected(self):
+        response = self.client.get("/api/shop/products?sort=price_low&cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+
+        cursor = self.client.get("/api/shop/products?sort=price_low&limit=2").json()["next_cursor"]
+        response = self.client.get(f"/api/shop/products?sort=newest&cursor={cursor}")
+        self.assertEqual(response.status_code, 400)
+
+
+class ProductDocumentCacheTests(TestCase):
+    """Cached product JSON: dobara nahi banta, par product / variant / size / category badalte hi naya."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Kurti Sets", has_size=True)
+        self.product = Product.objects.create(
+            category=self.category, name="Cotton Kurti", description="Daily wear", base_price=999
+        )
+        self.variant = ProductVariant.objects.create(product=self.product, color_name="Red", color_code="#ff0000")
+        self.size = SizeVariant.objects.create(variant=self.variant, size="M", stock=5)
+
+    def detail(self):
+        return self.client.get(f"/api/shop/products/{self.product.id}").json()
+
+    def test_cached_document_is_reused(self):
+        self.detail()
+        with CaptureQueriesContext(connection) as ctx:
+            self.detail()
+        sql = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn('"shop_productimage"', sql)  # Prefetch nahi chala, document cache se
+
+    def test_size_and_variant_changes_rebuild_document(self):
+        self.detail()
+        self.size.price_adjustment = 100
+        self.size.save()
+        self.assertEqual(self.detail()["variants"][0]["sizes"][0]["price"], 1099.0)
+
+        self.variant.color_name = "Maroon"
+        self.variant.save()
+        self.assertEqual(self.detail()["variants"][0]["color_name"], "Maroon")
+
+        self.size.delete()
+        self.assertEqual(self.detail()["variants"][0]["sizes"], [])
+
+        self.variant.delete()
+        self.assertEqual(self.detail()["variants"], [])
+
+    def test_product_and_category_changes_rebuild_document(self):
+        self.detail()
+        self.product.name = "Silk Kurti"
+        self.product.save()
+        self.assertEqual(self.detail()["name"], "Silk Kurti")
+
+        self.category.name = "Kurtis"
+        self.category.save()
+        self.assertEqual(self.detail()["category_name"], "Kurtis")
+
+
+class SearchTests(TestCase):
+    """Full-text rank (naam > fabric/category > colour > description), prefix match aur typo fallback."""
+
+    def setUp(self):
+        category = Category.objects.create(name="Kurti Sets", has_size=True)
+        self.in_name = Product.objects.create(
+            category=category, name="Banarasi Silk Kurti", description="Festive wear", base_price=2999
+        )
+        self.in_fabric = Product.objects.create(
+            category=category, name="Festive Kurti", description="", fabric="Silk", base_price=1999
+        )
+        self.in_description = Product.objects.create(
+            category=category, name="Cotton Kurti", description="Silk jaisa soft cotton", base_price=999
+        )
+        self.anarkali = Product.objects.create(
+            category=category, name="Anarkali Suit", description="Flared", base_price=1499
+        )
+        ProductVariant.objects.create(product=self.anarkali, color_name="Mustard", color_code="#e1ad01")
+
+    def search(self, term, **params):
+        query = "&".join(f"{k}={v}" for k, v in {"search": term, **params}.items())
+        return [item["id"] for item in self.client.get(f"/api/shop/products?{query}").json()["items"]]
+
+    def test_ranked_by_field_weight(self):
+        self.assertEqual(self.search("silk"), [self.in_name.id, self.in_fabric.id, self.in_description.id])
+
+    def test_prefix_and_colour_match(self):
+        self.assertEqual(self.search("anar"), [self.anarkali.id])
+        self.assertEqual(self.search("mustard"), [self.anarkali.id])  # Variant save search vector update karta hai
+        self.assertEqual(self.search("banarasi kur"), [self.in_name.id])
+
+    def test_explicit_sort_overrides_rank(self):
+        self.assertEqual(
+            self.search("silk", sort="price_low"), [self.in_description.id, self.in_fabric.id, self.in_name.id]
+        )
+
+    def test_typo_falls_back_to_trigram_similarity(self):
+        # Full-text me "anarkalli" kuch nahi, pg_trgm word similarity se Anarkali
+        self.assertEqual(self.search("anarkalli"), [self.anarkali.id])
+
+
+class StorefrontBootstrapTests(TestCase):
+    """Home page bootstrap: precomputed payload, version ETag par 304, change par naya version."""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category = Category.objects.create(name="Kurti Sets", has_size=True)
+            Product.objects.create(category=self.category, name="Active", description="", base_price=999)
+            Product.objects.create(category=self.category, name="Hidden", description="", base_price=999,
+                                   is_active=False)
+            Announcement.objects.create(text="Free shipping above 1499")
+            Announcement.objects.create(text="Old sale", is_active=False)
+
+    def test_payload(self):
+        data = self.client.get("/api/shop/bootstrap").json()
+        self.assertEqual(
+            [(c["slug"], c["active_products"]) for c in data["categories"]], [(self.category.slug, 1)]
+        )
+        self.assertEqual([a["text"] for a in data["announcements"]], ["Free shipping above 1499"])
+        self.assertEqual(data["banners"], [])
+
+    def test_etag_304_until_something_changes(self):
+        first = self.client.get("/api/shop/bootstrap")
+        etag = first["ETag"]
+        self.assertEqual(etag.strip('"'), first.json()["version"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get("/api/shop/bootstrap", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 1)  # Sirf snapshot row
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(text="Diwali sale")
+        changed = self.client.get("/api/shop/bootstrap", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertIn("Diwali sale", [a["text"] for a in changed.json()["announcements"]])
+
+
+class SuggestIndexTests(TestCase):
+    """Typeahead index: prefix lookup, weights, aur background refresh rounds (thread ke bina)."""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Sarees", has_size=False)
+        self.banarasi = self.add("Banarasi Silk Saree", fabric="Silk")
+        self.red = self.add("Festive Saree", colour="Red Banarasi")
+        self.add("Hidden Banarasi", is_active=False)
+        self.index = SuggestIndex()
+        self.index.rebuild()
+
+    def add(self, name, fabric=None, colour="Blue", is_active=True):
+        product = Product.objects.create(
+            category=self.category, name=name, description="", fabric=fabric, base_price=1999, is_active=is_active
+        )
+        ProductVariant.objects.create(product=product, color_name=colour, color_code="#000000")
+        return product
+
+    def ids(self, term, limit=8):
+        with mock.patch.object(self.index, 'start'):
+            return [doc["id"] for doc in self.index.suggest(term, limit)]
+
+    def test_prefix_lookup_and_weights(self):
+        # Naam me match (weight 4) colour match (1) se upar, inactive product nahi
+        self.assertEqual(self.ids("bana"), [self.banarasi.id, self.red.id])
+        self.assertEqual(self.ids("red ban"), [self.red.id])  # Har word match hona chahiye
+        self.assertEqual(self.ids("saree"), [self.red.id, self.banarasi.id])  # Barabari par naya pehle
+        self.assertEqual(self.ids("saree", limit=1), [self.red.id])
+        self.assertEqual(self.ids("kurti"), [])
+        self.assertEqual(self.ids("  "), [])
+
+    def test_refresh_picks_up_changes_since_watermark(self):
+        added = self.add("Chanderi Saree")
+        self.index.refresh()
+        self.assertEqual(self.ids("chand"), [added.id])
+
+        Product.objects.filter(id=added.id).update(is_active=False, updated_at=added.updated_at + timedelta(seconds=1))
+        self.index.refresh()
+        self.assertEqual(self.ids("chand"), [])
+
+    def test_signal_paths_update_single_products(self):
+        self.banarasi.name = "Kanjivaram Saree"
+        self.banarasi.save()
+        self.index.refresh_products([self.banarasi.id])
+        self.assertEqual(self.ids("kanji"), [self.banarasi.id])
+        self.assertEqual(self.ids("bana"), [self.red.id])
+
+        self.index.remove_product(self.red.id)
+        self.assertEqual(self.ids("bana"), [])
+
+    def test_endpoint_reads_memory_only(self):
+        suggest_index.rebuild()
+        with mock.patch.object(suggest_index, 'start'), CaptureQueriesContext(connection) as ctx:
+            data = self.client.get("/api/shop/suggest?q=banarasi silk").json()
+        self.assertEqual([item["id"] for item in data["items"]], [self.banarasi.id])
+        self.assertEqual(len(ctx.captured_queries), 0)
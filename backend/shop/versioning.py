@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .models import CatalogVersion
+
+# --- CATALOG VERSION (ETag / Last-Modified) ---
+# Next.js har 10 second me catalog endpoints revalidate karta hai. Poori query +
+# serialization ki jagah hum pehle sirf ek row (CatalogVersion) padhte hain:
+# version same hai to seedha 304 Not Modified, view chalta hi nahi.
+# Sirf catalog edits (admin, import, inventory sync, nightly ranks) version badhate hain -
+# checkout / holds nahi, warna har order par ETag badalta aur ye ek row hotspot banti.
+
+CATALOG_VERSION_ID = 1
+
+
+def bump_catalog_version():
+    """Commit ke baad version +1 (hot row ka lock poore transaction tak na ruke)."""
+    def bump():
+        updated = CatalogVersion.objects.filter(id=CATALOG_VERSION_ID).update(
+            version=F('version') + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            CatalogVersion.objects.get_or_create(id=CATALOG_VERSION_ID, defaults={'version': 1})
+    transaction.on_commit(bump)
+
+
+def _current(request):
+    # etag aur last_modified dono ke liye ek hi query (request par cache)
+    if not hasattr(request, '_catalog_version'):
+        request._catalog_version = CatalogVersion.objects.filter(id=CATALOG_VERSION_ID).first()
+    return request._catalog_version
+
+
+def catalog_etag(request, *args, **kwargs):
+    row = _current(request)
+    return f"catalog-{row.version}" if row else None
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    row = _current(request)
+    return row.updated_at if row else None
+
+
+# Usage: @decorate_view(catalog_conditional) ninja operation ke upar
+catalog_conditional = condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
@@ -5,7 +5,7 @@ import { useParams } from "next/navigation";
 import { Loader2, LayoutGrid } from "lucide-react";
 import ProductCard from "@/components/ProductCard";
 // ✅ lib/api से प्रोफेशनल फंक्शन इम्पोर्ट किया
-import { getProducts } from "@/lib/api";
+import { getProductCards } from "@/lib/api";
 
 const CategoryPage = () => {
   const params = useParams();
@@ -13,16 +13,19 @@ const CategoryPage = () => {
 
   const [products, setProducts] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchCategoryProducts = async () => {
       try {
         setLoading(true);
-        // ✅ Purane lambe fetch ki jagah sirf ek line ka function use kiya
-        const data = await getProducts(categoryName);
+        // ✅ Grid ke liye sirf card data (gallery/video/SKU nahi)
+        const data = await getProductCards(categoryName);
         
         // Backend ab modular hai, isliye seenGroups ki zarurat nahi
-        setProducts(data); 
+        setProducts(data.items); 
+        setNextCursor(data.hasMore ? data.nextCursor : null);
 
       } catch (error) {
         console.error("Error fetching category products:", error);
@@ -33,6 +36,16 @@ const CategoryPage = () => {
     if (categoryName) fetchCategoryProducts();
   }, [categoryName]);
 
+  // ✅ Agla page (cursor se) laakar list ke neeche jodo
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    const data = await getProductCards(categoryName, "", "", nextCursor);
+    setProducts((prev) => [...prev, ...data.items]);
+    setNextCursor(data.hasMore ? data.nextCursor : null);
+    setLoadingMore(false);
+  };
+
   if (loading) return (
     <div className="min-h-screen flex flex-col justify-center items-center bg-white gap-4">
       <Loader2 className="animate-spin text-primary" size={40} />
@@ -70,6 +83,19 @@ const CategoryPage = () => {
             </div>
           )}
         </div>
+
+        {nextCursor && (
+          <div className="flex justify-center mt-12">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-8 py-3 rounded-full border border-gray-300 text-xs font-bold uppercase tracking-widest text-gray-700 hover:bg-black hover:text-white transition-all disabled:opacity-50 flex items-center gap-2"
+            >
+              {loadingMore && <Loader2 className="animate-spin" size={14} />}
+              Load More
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
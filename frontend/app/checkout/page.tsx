@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useCartStore } from "@/store/useCartStore"; 
 import { ShieldCheck, Truck, Banknote, ChevronLeft, AlertCircle, Loader2, User, Smartphone, Tag, Ticket, X } from "lucide-react";
 import Link from "next/link";
@@ -21,6 +21,9 @@ export default function CheckoutPage() {
   const [couponError, setCouponError] = useState("");
   
   const [loading, setLoading] = useState(false); 
+
+  // ✅ Retry / double-tap par same order dobara na bane: same cart+details = same Idempotency-Key
+  const idempotencyRef = useRef<{ body: string; key: string } | null>(null);
   
   // ✅ 1. Hardcoded API URL (Django Backend)
   const API_URL = "https://www.nandanicollection.com/api";
@@ -55,17 +58,61 @@ export default function CheckoutPage() {
   }, [user]);
 
   // --- CALCULATION LOGIC ---
-  const subtotal = cart.reduce((acc: number, item: any) => {
+  const cartItems = () => cart.map((item: any) => ({
+      product_id: item.id,
+      variant_id: item.variant_id, 
+      size_id: item.size_id || null, 
+      quantity: item.quantity,
+      price: typeof item.price === "string" ? parseInt(item.price.replace(/[^\d]/g, "")) : Number(item.price),
+      size: item.size || "Standard", 
+      color: item.color || "Default"
+  }));
+
+  // ✅ Server quote (/orders/quote): prices, coupon, shipping ek request me, amounts paise me
+  const [quote, setQuote] = useState<any>(null);
+
+  const fetchQuote = async (code: string | null) => {
+    const response = await fetch(`${API_URL}/orders/quote`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ items: cartItems(), coupon_code: code }),
+    });
+    return response.json();
+  };
+
+  const appliedCode = appliedCoupon ? appliedCoupon.coupon_code : null;
+
+  // Cart ya coupon badla to quote dobara
+  useEffect(() => {
+    if (cart.length === 0) return;
+    let cancelled = false;
+    fetchQuote(appliedCode)
+      .then((result) => {
+        if (cancelled || !result.quote) return;
+        setQuote(result);
+        if (appliedCode && !result.coupon_code) {
+          // Cart badalne se coupon ki condition toot gayi
+          setAppliedCoupon(null);
+          setIsCouponApplied(false);
+          setCouponError(result.coupon_message || "Coupon ab apply nahi hota.");
+        }
+      })
+      .catch(() => {});
+    return () => { cancelled = true; };
+  }, [cart, appliedCode]);
+
+  // Quote aane tak local estimate (order hamesha server price par hi banta hai)
+  const localSubtotal = cart.reduce((acc: number, item: any) => {
     const price = typeof item.price === "string" 
       ? parseInt(item.price.replace(/[^\d]/g, "")) 
       : Number(item.price);
     return acc + (price || 0) * (item.quantity || 1);
   }, 0);
 
-  // Dynamic Discount Calculation from Backend Data
-  const discount = appliedCoupon ? Number(appliedCoupon.discount_amount) : 0; 
-  const shipping = subtotal > 1499 ? 0 : 99;
-  const total = subtotal - discount + shipping;
+  const subtotal = quote ? quote.subtotal_paise / 100 : localSubtotal;
+  const discount = quote ? quote.discount_paise / 100 : 0; 
+  const shipping = quote ? quote.shipping_paise / 100 : (localSubtotal > 1499 ? 0 : 99);
+  const total = quote ? quote.total_paise / 100 : subtotal - discount + shipping;
 
   // --- APPLY COUPON LOGIC ---
   const handleApplyCoupon = async () => {
@@ -74,19 +121,15 @@ export default function CheckoutPage() {
     setCouponError("");
 
     try {
-      const response = await fetch(`${API_URL}/coupons/validate-coupon`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ code: couponCode, cart_total: subtotal }),
-      });
-      const result = await response.json();
+      const result = await fetchQuote(couponCode);
 
-      if (result.success) {
-        setAppliedCoupon(result);
+      if (result.coupon_code) {
+        setQuote(result);
+        setAppliedCoupon({ coupon_code: result.coupon_code });
         setIsCouponApplied(true);
         setCouponError("");
       } else {
-        setCouponError(result.message);
+        setCouponError(result.coupon_message || result.message || "Galat coupon code hai bhai.");
         setAppliedCoupon(null);
         setIsCouponApplied(false);
       }
@@ -122,23 +165,20 @@ export default function CheckoutPage() {
       total_amount: total,
       shipping_charges: shipping,
       coupon_code: appliedCoupon ? appliedCoupon.coupon_code : null,
-      items: cart.map((item: any) => ({
-          product_id: item.id,
-          variant_id: item.variant_id, 
-          size_id: item.size_id || null, 
-          quantity: item.quantity,
-          price: typeof item.price === "string" ? parseInt(item.price.replace(/[^\d]/g, "")) : Number(item.price),
-          size: item.size || "Standard", 
-          color: item.color || "Default"
-      }))
+      quote: quote ? quote.quote : null, // ✅ Signed server quote, backend dobara hisaab nahi karta
+      items: cartItems()
     };
 
     try {
       // Step 1: Django Backend me Order Create karna
+      const body = JSON.stringify(orderData);
+      if (!idempotencyRef.current || idempotencyRef.current.body !== body) {
+        idempotencyRef.current = { body, key: crypto.randomUUID() };
+      }
       const response = await fetch(`${API_URL}/orders/create`, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(orderData),
+        headers: { "Content-Type": "application/json", "Idempotency-Key": idempotencyRef.current.key },
+        body,
       });
 
       const result = await response.json();
@@ -152,7 +192,7 @@ export default function CheckoutPage() {
               method: "POST",
               headers: { "Content-Type": "application/json" },
               body: JSON.stringify({
-                amount: total, 
+                amount: result.total_paise / 100, // ✅ Server ka final amount
                 transactionId: `NDN-${result.order_id}`, // Apne order ID ko PhonePe transaction ID bana diya
                 name: form.name,
                 mobile: form.phone
@@ -10,6 +10,7 @@ import confetti from "canvas-confetti";
 import { generateProfessionalInvoice } from "@/lib/invoice";
 // ✅ 2. Import API Function
 import { getOrderDetails } from "@/lib/api";
+import { useAuth } from "@/context/AuthContext";
 
 interface WheelItem {
   id: number;
@@ -20,6 +21,7 @@ interface WheelItem {
 function SuccessContent() {
   const searchParams = useSearchParams();
   const rawOrderId = searchParams.get("id");
+  const { token } = useAuth();
   const [copied, setCopied] = useState(false);
   const API_URL = "https://www.nandanicollection.com/api";
 
@@ -70,12 +72,6 @@ function SuccessContent() {
           confetti({ particleCount: 150, spread: 70, origin: { y: 0.6 } });
         }
 
-        // ✅ 3. FETCH ORDER DETAILS USING OUR NEW API FUNCTION
-        const orderData = await getOrderDetails(rawOrderId);
-        if (orderData) {
-          setOrderDetails(orderData);
-        }
-
       } catch (err) {
         console.error("Initialization failed", err);
       }
@@ -84,6 +80,14 @@ function SuccessContent() {
     initPage();
   }, [rawOrderId, API_URL]);
 
+  // ✅ 3. FETCH ORDER DETAILS (invoice ke liye) - sirf login wale customer ka apna order
+  useEffect(() => {
+    if (!rawOrderId || !token) return;
+    getOrderDetails(rawOrderId, token).then((orderData) => {
+      if (orderData) setOrderDetails(orderData);
+    });
+  }, [rawOrderId, token]);
+
   const handleCopy = (text: string, type: 'order' | 'coupon') => {
     navigator.clipboard.writeText(text);
     if (type === 'order') setCopied(true);
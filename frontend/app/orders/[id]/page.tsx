@@ -29,14 +29,13 @@ export default function OrderTrackingPage() {
 
   useEffect(() => {
     if (token && id) {
-      fetch(`${API_URL}/orders/my-orders`, {
+      // ✅ Sirf yahi order (poori history nahi), backend check karta hai ki order isi customer ka hai
+      fetch(`${API_URL}/orders/my-orders/${encodeURIComponent(id)}`, {
         headers: { "Authorization": `Bearer ${token}` }
       })
-      .then(res => res.json())
+      .then(res => (res.ok ? res.json() : null))
       .then(data => {
-        // ID match logic
-        const found = Array.isArray(data) ? data.find((o: any) => o.id.toString() === id) : null;
-        setOrder(found);
+        setOrder(data);
         setLoading(false);
       })
       .catch((err) => {
@@ -50,6 +49,51 @@ export default function OrderTrackingPage() {
     }
   }, [id, token]);
 
+  // ✅ Live status: reload ki zarurat nahi, backend status badalte hi push karta hai (SSE)
+  // URL me JWT nahi: pehle is order ka chhota signed token lo (access logs me login token na jaye)
+  const orderLoaded = !!order;
+  useEffect(() => {
+    if (!token || !id || !orderLoaded) return;
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let stopped = false;
+
+    const connect = async () => {
+      try {
+        const res = await fetch(`${API_URL}/orders/my-orders/${encodeURIComponent(id)}/events-token`, {
+          headers: { "Authorization": `Bearer ${token}` }
+        });
+        if (!res.ok || stopped) return;
+        const { token: eventsToken } = await res.json();
+        source = new EventSource(`${API_URL}/orders/${encodeURIComponent(id)}/events?token=${encodeURIComponent(eventsToken)}`);
+        source.addEventListener("status", (e) => {
+          const data = JSON.parse((e as MessageEvent).data);
+          setOrder((prev: any) => (prev && prev.status !== data.status ? { ...prev, status: data.status } : prev));
+          // Cancelled / returned ke baad kuch nahi badalta
+          if (data.status === "cancelled" || data.status === "returned") {
+            stopped = true;
+            source?.close();
+          }
+        });
+        source.onerror = () => {
+          // Browser khud reconnect karta hai; token expire (401) par stream band ho jaati hai - naya token lo
+          if (source?.readyState === EventSource.CLOSED && !stopped) {
+            retry = setTimeout(connect, 5000);
+          }
+        };
+      } catch (err) {
+        console.error(err);
+      }
+    };
+    connect();
+
+    return () => {
+      stopped = true;
+      clearTimeout(retry);
+      source?.close();
+    };
+  }, [id, token, orderLoaded]);
+
   // --- LOADING STATE ---
   if (loading) return (
     <div className="h-screen flex items-center justify-center bg-white">
@@ -11,40 +11,54 @@ export default function MyOrdersPage() {
   const router = useRouter();
   const [orders, setOrders] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  // ✅ Cursor pagination: agla page sirf "Load more" par
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // ✅ FIX: Server par env variable fail na ho isliye Hardcode kiya
   const API_URL = "https://www.nandanicollection.com/api";
 
+  // Halka summary mode (items ke bina, sirf ginti)
+  const fetchOrders = async (cursor: string | null) => {
+    const url = `${API_URL}/orders/my-orders/summary${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ""}`;
+    const response = await fetch(url, {
+      headers: { 
+          "Authorization": `Bearer ${token}`,
+          "Content-Type": "application/json"
+      }
+    });
+    
+    if (!response.ok) {
+       throw new Error("Failed to fetch orders");
+    }
+    
+    const data = await response.json();
+    setOrders(prev => [...(cursor ? prev : []), ...(Array.isArray(data.items) ? data.items : [])]);
+    setNextCursor(data.has_more ? data.next_cursor : null);
+  };
+
   useEffect(() => {
     if (user && token) {
-      const fetchOrders = async () => {
-        try {
-          // ✅ Corrected URL
-          const response = await fetch(`${API_URL}/orders/my-orders`, {
-            headers: { 
-                "Authorization": `Bearer ${token}`,
-                "Content-Type": "application/json"
-            }
-          });
-          
-          if (!response.ok) {
-             throw new Error("Failed to fetch orders");
-          }
-          
-          const data = await response.json();
-          setOrders(Array.isArray(data) ? data : []);
-        } catch (err) {
-          console.error("Order fetch failed:", err);
-        } finally {
-          setLoading(false);
-        }
-      };
-      fetchOrders();
+      fetchOrders(null)
+        .catch(err => console.error("Order fetch failed:", err))
+        .finally(() => setLoading(false));
     } else {
       setLoading(false);
     }
   }, [user, token]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      await fetchOrders(nextCursor);
+    } catch (err) {
+      console.error("Order fetch failed:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="h-screen flex flex-col items-center justify-center gap-4 bg-white">
@@ -120,7 +134,7 @@ export default function MyOrdersPage() {
                     <Truck size={24} strokeWidth={1.5} />
                   </div>
                   <div className="flex-1">
-                    <p className="text-sm font-black text-gray-900">{order.items?.length || 0} Products Ordered</p>
+                    <p className="text-sm font-black text-gray-900">{order.item_count || 0} Products Ordered</p>
                     <div className="flex items-center gap-2 text-gray-400 text-[10px] font-bold uppercase mt-1">
                         <Clock size={12} /> {new Date(order.created_at).toLocaleDateString('en-IN', { day: 'numeric', month: 'short' })}
                     </div>
@@ -136,6 +150,16 @@ export default function MyOrdersPage() {
                 </div>
               </div>
             ))}
+
+            {nextCursor && (
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="w-full bg-white border border-gray-100 rounded-2xl py-4 text-[10px] font-black text-gray-500 uppercase tracking-[0.2em] hover:text-black transition-colors flex items-center justify-center gap-2"
+              >
+                {loadingMore ? <Loader2 className="animate-spin" size={14} /> : "Load More Orders"}
+              </button>
+            )}
           </div>
         )}
       </div>
@@ -39,6 +39,27 @@ export async function POST(req: Request) {
     const baseUrl = process.env.NEXT_PUBLIC_API_URL || "https://nandanicollection.com";
 
     if (resData.state === "COMPLETED") {
+      // 3. Backend ko batana: pending order confirm, stock hold permanent ho jata hai
+      // (na ho paya to bhi sweeper PhonePe se status dekh kar confirm karta hai, orders/phonepe.py)
+      const orderId = transactionId.replace(/^NDN-/, "");
+      const backendUrl = process.env.BACKEND_API_URL || "https://www.nandanicollection.com/api";
+      let confirmRes: Response | null = null;
+      try {
+        confirmRes = await fetch(`${backendUrl}/orders/${orderId}/payment-confirmed`, {
+          method: "POST",
+          headers: { "X-Payment-Secret": process.env.PAYMENT_CONFIRM_SECRET?.trim() || "" },
+        });
+      } catch (confirmError) {
+        console.error("PAYMENT CONFIRM ERROR:", orderId, confirmError);
+      }
+      if (!confirmRes?.ok) {
+        if (confirmRes) {
+          console.error("PAYMENT CONFIRM ERROR:", orderId, confirmRes.status, await confirmRes.text());
+        }
+        // ✅ Paise kat chuke hain: "failed" nahi, "confirming" page. Backend sweeper PhonePe se status
+        // dobara check karke confirm karta hai (409 = stock bik gaya, order cancel, refund hoga)
+        return Response.redirect(`${baseUrl}/checkout/confirming?id=${transactionId}`, 303);
+      }
       return Response.redirect(`${baseUrl}/checkout/success?id=${transactionId}`, 303);
     } else {
       return Response.redirect(`${baseUrl}/checkout/failed`, 303);
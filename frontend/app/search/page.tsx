@@ -6,14 +6,13 @@ import Link from "next/link";
 import Image from "next/image"; 
 import { ShoppingBag, Loader2, SearchX, ChevronDown } from "lucide-react";
 import { useCartStore } from "@/store/useCartStore";
-import { getProducts } from "@/lib/api";
+import { getProducts, getProductFacets } from "@/lib/api";
 
 function SearchContent() {
   const searchParams = useSearchParams();
   const query = searchParams.get("q") || ""; 
   
   const [products, setProducts] = useState<any[]>([]);
-  const [filteredProducts, setFilteredProducts] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   
   const addItem = useCartStore((state: any) => state.addItem);
@@ -42,7 +41,18 @@ function SearchContent() {
     return p > getPrice(product) ? p : null;
   };
 
-  const [priceFilters, setPriceFilters] = useState({ under2500: false, above2500: false });
+  // ✅ Price buckets + counts ab backend (facets) se aate hain, filter bhi server par lagta hai
+  const [priceBuckets, setPriceBuckets] = useState<any[]>([]);
+  const [selectedBucket, setSelectedBucket] = useState<string>("");
+
+  // FACETS: query badalne par sidebar ke counts
+  useEffect(() => {
+    setSelectedBucket("");
+    if (!query.trim()) { setPriceBuckets([]); return; }
+    getProductFacets(undefined, query).then((facets) => {
+      setPriceBuckets((facets?.price || []).filter((b: any) => b.count > 0));
+    });
+  }, [query]);
 
   // FETCH LOGIC
   useEffect(() => {
@@ -50,10 +60,14 @@ function SearchContent() {
       if (!query.trim()) { setProducts([]); setLoading(false); return; }
       try {
         setLoading(true);
-        const data = await getProducts(undefined, query);
+        const filters: Record<string, string> = {};
+        const bucket = priceBuckets.find((b) => b.key === selectedBucket);
+        if (bucket?.min_price != null) filters.min_price = String(bucket.min_price);
+        if (bucket?.max_price != null) filters.max_price = String(bucket.max_price);
+
+        const data = await getProducts(undefined, query, "", "", filters);
         console.log("[Search Debug] API Full Response:", data);
-        setProducts(data);
-        setFilteredProducts(data);
+        setProducts(data.items);
       } catch (error) { 
         console.error("[Search Error] Fetch failed:", error); 
       } finally { 
@@ -61,24 +75,17 @@ function SearchContent() {
       }
     };
     fetchSearchResults();
-  }, [query, API_URL]);
+  }, [query, selectedBucket, API_URL]);
 
-  // FILTER LOGIC
-  useEffect(() => {
-    let updatedList = [...products];
-    if (priceFilters.under2500 || priceFilters.above2500) {
-      updatedList = products.filter((p) => {
-        const price = getPrice(p);
-        const matchUnder = priceFilters.under2500 && price >= 500 && price <= 2500;
-        const matchAbove = priceFilters.above2500 && price > 2500;
-        return matchUnder || matchAbove;
-      });
-    }
-    setFilteredProducts(updatedList);
-  }, [priceFilters, products]);
+  const handleFilterChange = (bucketKey: string) => {
+    setSelectedBucket((prev) => (prev === bucketKey ? "" : bucketKey));
+  };
 
-  const handleFilterChange = (filterName: string) => {
-    setPriceFilters((prev) => ({ ...prev, [filterName]: !prev[filterName as keyof typeof priceFilters] }));
+  const bucketLabel = (b: any) => {
+    const low = Number(b.min_price), high = Number(b.max_price);
+    if (b.min_price == null) return `Under ₹${high.toLocaleString()}`;
+    if (b.max_price == null) return `Above ₹${low.toLocaleString()}`;
+    return `₹${low.toLocaleString()} - ₹${high.toLocaleString()}`;
   };
 
   if (loading) return (
@@ -103,28 +110,26 @@ function SearchContent() {
           <div className="sticky top-24">
             <h3 className="font-serif font-bold text-lg mb-4 flex items-center justify-between border-b border-gray-100 pb-2">Price Range <ChevronDown size={16} /></h3>
             <div className="space-y-4 text-gray-600 text-sm mt-4">
-              <label className="flex items-center gap-3 cursor-pointer group">
-                <input type="checkbox" className="w-4 h-4 rounded border-gray-300 text-[#8B3E48] focus:ring-[#8B3E48] cursor-pointer" checked={priceFilters.under2500} onChange={() => handleFilterChange('under2500')} /> 
-                <span className="group-hover:text-gray-900 transition-colors">₹500 - ₹2500</span>
-              </label>
-              <label className="flex items-center gap-3 cursor-pointer group">
-                <input type="checkbox" className="w-4 h-4 rounded border-gray-300 text-[#8B3E48] focus:ring-[#8B3E48] cursor-pointer" checked={priceFilters.above2500} onChange={() => handleFilterChange('above2500')} /> 
-                <span className="group-hover:text-gray-900 transition-colors">Above ₹2500</span>
-              </label>
+              {priceBuckets.map((b) => (
+                <label key={b.key} className="flex items-center gap-3 cursor-pointer group">
+                  <input type="checkbox" className="w-4 h-4 rounded border-gray-300 text-[#8B3E48] focus:ring-[#8B3E48] cursor-pointer" checked={selectedBucket === b.key} onChange={() => handleFilterChange(b.key)} /> 
+                  <span className="group-hover:text-gray-900 transition-colors">{bucketLabel(b)} <span className="text-gray-400">({b.count})</span></span>
+                </label>
+              ))}
             </div>
           </div>
         </div>
 
         {/* Results Grid */}
         <div className="flex-1">
-          {filteredProducts.length === 0 ? (
+          {products.length === 0 ? (
             <div className="text-center py-20 flex flex-col items-center gap-4">
               <SearchX size={64} className="text-gray-100" />
               <p className="text-gray-400 font-serif text-xl italic">Maaf kijiye! Hamen is search ke liye koi matching product nahi mila.</p>
             </div>
           ) : (
             <div className="grid grid-cols-2 lg:grid-cols-3 gap-x-4 md:gap-x-8 gap-y-12">
-              {filteredProducts.map((product, index) => {
+              {products.map((product, index) => {
                 const finalPrice = getPrice(product);
                 const originalPrice = getOriginalPrice(product);
                 const imageUrl = getImageUrl(product);
@@ -9,10 +9,15 @@ import { motion, AnimatePresence } from "framer-motion";
 import { useState, useEffect } from "react"; // ✅ useEffect import किया
 
 export default function WishlistPage() {
-  const { wishlist, removeFromWishlist, clearWishlist } = useWishlistStore() as any;
+  const { wishlist, removeFromWishlist, clearWishlist, syncWithServer } = useWishlistStore() as any;
   const { cart } = useCartStore() as any; // ✅ addItem की जगह cart ले लिया
   const [movedItem, setMovedItem] = useState<string | null>(null);
 
+  // ✅ Page khulte hi saare saved products ek batch request se refresh
+  useEffect(() => {
+    syncWithServer();
+  }, [syncWithServer]);
+
   // ✅ SMART LOGIC: अगर कोई आइटम कार्ट में आ गया है, तो उसे विशलिस्ट से हटा दो
   useEffect(() => {
     // चेक करो कि विशलिस्ट का कौन सा आइटम कार्ट में मौजूद है
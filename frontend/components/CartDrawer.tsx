@@ -7,7 +7,7 @@ import Image from "next/image"; // ✅ Next.js Image Component for better perfor
 import { useEffect, useState } from "react";
 
 export default function CartDrawer() {
-  const { cart, isOpen, toggleCart, removeItem, updateQuantity } = useCartStore() as any;
+  const { cart, isOpen, toggleCart, removeItem, updateQuantity, syncWithServer } = useCartStore() as any;
   
   // Hydration Fix
   const [mounted, setMounted] = useState(false);
@@ -15,6 +15,11 @@ export default function CartDrawer() {
     setMounted(true);
   }, []);
 
+  // ✅ Drawer khulne par saari lines ka taaza stock/price (ek batch request)
+  useEffect(() => {
+    if (isOpen) syncWithServer();
+  }, [isOpen, syncWithServer]);
+
   if (!mounted) return null;
 
   // ✅ HTTPS FIX: Toast की तरह यहाँ भी इमेज एरर से बचने के लिए
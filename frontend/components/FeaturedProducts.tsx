@@ -22,7 +22,7 @@ const FeaturedProducts = () => {
         setLoading(true);
         // ✅ 'newest' sort ke saath fetch kiya
         const data = await getProducts(undefined, undefined, 'newest');
-        setProducts(data.slice(0, 4)); 
+        setProducts(data.items.slice(0, 4)); 
       } catch (error) {
         console.error("Error fetching featured products:", error);
       } finally {
@@ -50,7 +50,7 @@ const Header = () => {
   }, []);
 
   const getImageUrl = (item: any) => {
-    const imgPath = item?.variants?.[0]?.thumbnail;
+    const imgPath = item?.thumbnail || item?.variants?.[0]?.thumbnail;
     if (!imgPath) {
       return "https://placehold.co/600x800.png?text=No+Image";
     }
@@ -87,10 +87,11 @@ const Header = () => {
         return;
       }
       try {
-        const response = await fetch(`${API_URL}/api/shop/products?search=${encodeURIComponent(searchTerm)}`);
+        // ✅ Halka typeahead endpoint (in-memory index), poora product search nahi
+        const response = await fetch(`${API_URL}/api/shop/suggest?limit=5&q=${encodeURIComponent(searchTerm)}`);
         if (response.ok) {
             const data = await response.json();
-            setSuggestions(data.slice(0, 5)); 
+            setSuggestions(data.items || []); 
         }
       } catch (error) { console.error(error); }
     };
@@ -1,6 +1,7 @@
 "use client";
 import { useState, useEffect } from "react";
 import Link from "next/link";
+import { useRouter } from "next/navigation";
 import Image from "next/image"; 
 import { ShoppingCart, Heart, Star } from "lucide-react"; 
 import { useCartStore } from "@/store/useCartStore"; 
@@ -10,6 +11,7 @@ import CartToast from "@/components/CartToast";
 
 export default function ProductCard({ product }: { product: any }) {
   const { addItem } = useCartStore() as any; 
+  const router = useRouter();
   // ✅ Wishlist Actions
   const { wishlist, addToWishlist, removeFromWishlist } = useWishlistStore() as any;
   
@@ -64,15 +66,25 @@ export default function ProductCard({ product }: { product: any }) {
         console.error("Error fetching card reviews:", err);
       }
     };
-    fetchReviews();
+    // ✅ Listing me summary (avg rating + count) pehle se aata hai, har card ke reviews download nahi karne
+    if (!product.summary) fetchReviews();
   }, [product]);
 
   // Rating Calculation
-  const averageRating = reviews.length > 0 
-    ? (reviews.reduce((acc, rev) => acc + rev.rating, 0) / reviews.length).toFixed(1)
-    : null;
-
-  const totalStock = product.variants?.reduce((acc: number, v: any) => acc + (v.stock || 0), 0) || 0;
+  const summary = product.summary;
+  const reviewCount = summary ? summary.review_count : reviews.length;
+  const averageRating = summary
+    ? (summary.avg_rating != null ? Number(summary.avg_rating).toFixed(1) : null)
+    : reviews.length > 0 
+      ? (reviews.reduce((acc, rev) => acc + rev.rating, 0) / reviews.length).toFixed(1)
+      : null;
+
+  // ✅ Summary ka total_stock; card payload me in_stock flag; purane payload me variants ka jod
+  const totalStock = summary
+    ? summary.total_stock
+    : product.in_stock !== undefined
+      ? (product.in_stock ? 1 : 0)
+      : product.variants?.reduce((acc: number, v: any) => acc + (v.stock || 0), 0) || 0;
 
   // ✅ Wishlist Toggle Handler (Solidified)
   const toggleWishlist = (e: React.MouseEvent) => {
@@ -89,6 +101,12 @@ export default function ProductCard({ product }: { product: any }) {
     e.preventDefault(); e.stopPropagation(); 
     if (totalStock === 0 || !selectedVariant) return;
 
+    // Card payload me sizes nahi hote: size wale product ke liye detail page par size chunwao
+    if (product.has_size && !selectedVariant.sizes) {
+      router.push(`/product/${product.id}`);
+      return;
+    }
+
     const defaultSize = selectedVariant.sizes?.[0] || null;
     const currentStock = defaultSize ? defaultSize.stock : selectedVariant.stock;
     const price = defaultSize ? (Number(product.base_price) + Number(defaultSize.price_adjustment || 0)) : Number(product.base_price);
@@ -151,12 +169,12 @@ export default function ProductCard({ product }: { product: any }) {
           <div>
             <h3 className="text-gray-900 font-serif text-[15px] font-bold truncate group-hover:text-black transition-colors leading-tight">{product.name}</h3>
             
-            {reviews.length > 0 && (
+            {reviewCount > 0 && (
               <div className="flex items-center gap-2 mt-1">
                 <div className="flex items-center bg-green-600 text-white px-1.5 py-0.5 rounded text-[10px] font-bold">
                    {averageRating} <Star size={8} fill="white" className="ml-0.5" />
                 </div>
-                <span className="text-[10px] text-gray-400 font-medium">({reviews.length})</span>
+                <span className="text-[10px] text-gray-400 font-medium">({reviewCount})</span>
               </div>
             )}
 
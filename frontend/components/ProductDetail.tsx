@@ -104,7 +104,7 @@ export default function ProductDetail({ product }: { product: Product }) {
         setLoadingRelated(true);
         const category = product.category_name || "";
         const data = await getProducts(category);
-        setRelatedProducts(data.filter((p: any) => p.id !== product.id).slice(0, 4));
+        setRelatedProducts(data.items.filter((p: any) => p.id !== product.id).slice(0, 4));
 
         const res = await fetch(`${API_URL}/api/reviews/${product.id}`);
         if (res.ok) {
@@ -2,33 +2,65 @@
 const API_BASE_URL = "https://www.nandanicollection.com/api";
 
 // 1. Get Products (No Slash at end)
-export async function getProducts(category: string = "", search: string = "", sort: string = "") {
-  let url = `${API_BASE_URL}/shop/products?`; 
+// ✅ Backend ab cursor pagination bhejta hai: { items, next_cursor, has_more }
+// ✅ filters: server-side facets (min_price, max_price, fabric, color, size, in_stock)
+export async function getProducts(category: string = "", search: string = "", sort: string = "", cursor: string = "", filters: Record<string, string> = {}) {
+  return fetchProductPage("/shop/products", category, search, sort, cursor, filters);
+}
+
+// 1.1 Product Cards: grid pages ke liye halka payload (sirf naam, price, thumbnail, swatches, in_stock)
+export async function getProductCards(category: string = "", search: string = "", sort: string = "", cursor: string = "", filters: Record<string, string> = {}) {
+  return fetchProductPage("/shop/products/cards", category, search, sort, cursor, filters);
+}
+
+async function fetchProductPage(path: string, category: string, search: string, sort: string, cursor: string, filters: Record<string, string>) {
+  let url = `${API_BASE_URL}${path}?`; 
   
-  const params = new URLSearchParams();
+  const params = new URLSearchParams(filters);
   if (category) params.append('category', category);
   if (search) params.append('search', search);
   if (sort) params.append('sort', sort);
+  if (cursor) params.append('cursor', cursor);
   
+  const empty = { items: [] as any[], nextCursor: null as string | null, hasMore: false };
+
   try {
     const res = await fetch(url + params.toString(), { 
         next: { revalidate: 10 },
         headers: { 'Content-Type': 'application/json' }
     });
-    if (!res.ok) return [];
+    if (!res.ok) return empty;
     
     const data = await res.json();
     
     // ✅ IMAGE REPAIR: Backend agar 'image' key bhej raha hai to use 'thumbnail' me copy kar do
     // Taki Search Page confuse na ho
-    return data.map((p: any) => ({
+    const items = (data.items || []).map((p: any) => ({
       ...p,
       thumbnail: p.thumbnail || p.image || p.product_image || (p.variants?.[0]?.images?.[0]?.image) || null
     }));
 
+    return { items, nextCursor: data.next_cursor || null, hasMore: Boolean(data.has_more) };
+
   } catch (e) { 
-    console.error("getProducts error:", e);
-    return []; 
+    console.error(`${path} error:`, e);
+    return empty; 
+  }
+}
+
+// 1.5 Facet counts (Filter sidebar ke liye, poora catalog download kiye bina)
+export async function getProductFacets(category: string = "", search: string = "", filters: Record<string, string> = {}) {
+  const params = new URLSearchParams(filters);
+  if (category) params.append('category', category);
+  if (search) params.append('search', search);
+
+  try {
+    const res = await fetch(`${API_BASE_URL}/shop/products/facets?${params.toString()}`, { next: { revalidate: 10 } });
+    if (!res.ok) return null;
+    return await res.json();
+  } catch (e) {
+    console.error("getProductFacets error:", e);
+    return null;
   }
 }
 
@@ -48,30 +80,51 @@ export async function getProductDetail(id: string) {
   } catch (e) { return null; }
 }
 
+// 2.1 Batch Products (Cart/Wishlist rehydrate: N requests ki jagah ek)
+// Returns: [{ id, status: 'ok' | 'not_found' | 'inactive', product }]
+export async function getProductsBatch(ids: number[]) {
+  const unique = Array.from(new Set(ids.filter(Boolean)));
+  if (unique.length === 0) return [];
+  try {
+    const res = await fetch(`${API_BASE_URL}/shop/products/batch?ids=${unique.join(',')}`, { cache: 'no-store' });
+    if (!res.ok) return null;
+    const data = await res.json();
+    return data.items || [];
+  } catch (e) {
+    console.error("getProductsBatch error:", e);
+    return null;
+  }
+}
+
 // 3. Shop Data (No Slash at end)
 export async function getShopData() {
   try {
-    const [cats, announcements, banners] = await Promise.all([
-        fetch(`${API_BASE_URL}/shop/categories`).then(r => r.ok ? r.json() : []),
-        fetch(`${API_BASE_URL}/shop/announcements`).then(r => r.ok ? r.json() : []),
-        fetch(`${API_BASE_URL}/shop/banners`).then(r => r.ok ? r.json() : [])
-    ]);
+    // ✅ Teen alag calls ki jagah ek precomputed bootstrap (ETag ke saath, 304 par body nahi aati)
+    const res = await fetch(`${API_BASE_URL}/shop/bootstrap`, { next: { revalidate: 10 } });
+    if (!res.ok) return { categories: [], announcements: [], banners: [], version: null };
+    const data = await res.json();
     
     return { 
-        categories: cats, 
-        announcements: announcements, 
-        banners: banners 
+        categories: data.categories || [], 
+        announcements: data.announcements || [], 
+        banners: data.banners || [],
+        version: data.version || null
     };
   } catch (e) { 
-    return { categories: [], announcements: [], banners: [] }; 
+    return { categories: [], announcements: [], banners: [], version: null }; 
   }
 }
 
 // 4. ✅ Get Order Details (For Invoice and Success Page)
-export async function getOrderDetails(orderId: string) {
+// Sirf login wale customer ka apna order (/orders/my-orders/{id}), public order lookup band hai
+export async function getOrderDetails(orderId: string, token: string | null) {
+  if (!token) return null;
   try {
-    // Ye order fetch karne ka API call hai
-    const res = await fetch(`${API_BASE_URL}/orders/${orderId}`, { cache: 'no-store' });
+    const id = orderId.replace(/^NDN-/, "");
+    const res = await fetch(`${API_BASE_URL}/orders/my-orders/${encodeURIComponent(id)}`, {
+      cache: 'no-store',
+      headers: { "Authorization": `Bearer ${token}` },
+    });
     
     if (!res.ok) return null;
     
@@ -1,5 +1,6 @@
 import { create } from "zustand";
 import { persist } from "zustand/middleware";
+import { getProductsBatch } from "@/lib/api";
 
 interface CartState {
   cart: any[];
@@ -9,6 +10,7 @@ interface CartState {
   updateQuantity: (variantId: number, sizeId: number | null, quantity: number) => void;
   toggleCart: () => void;
   clearCart: () => void;
+  syncWithServer: () => Promise<void>;
 }
 
 export const useCartStore = create<CartState>()(
@@ -74,6 +76,28 @@ export const useCartStore = create<CartState>()(
 
       toggleCart: () => set((state) => ({ isOpen: !state.isOpen })),
       clearCart: () => set({ cart: [] }),
+
+      // ✅ Cart lines ka stock/price ek batch request se update karo
+      // Product hat gaya ho ya variant/size ab na ho to line cart se nikal jaati hai
+      syncWithServer: async () => {
+        const items = await getProductsBatch(get().cart.map((item: any) => item.id));
+        if (!items) return;
+        const products = new Map(items.filter((i: any) => i.status === "ok").map((i: any) => [i.id, i.product]));
+
+        set((state) => ({
+          cart: state.cart.flatMap((item: any) => {
+            const product: any = products.get(item.id);
+            const variant = product?.variants?.find((v: any) => v.id === item.variant_id);
+            if (!variant) return [];
+            const size = item.size_id ? variant.sizes?.find((s: any) => s.id === item.size_id) : null;
+            if (item.size_id && !size) return [];
+
+            const stock = size ? size.stock : variant.stock;
+            const price = size ? size.price : Number(product.base_price);
+            return [{ ...item, stock, price, quantity: Math.max(1, Math.min(item.quantity, stock)) }];
+          }),
+        }));
+      },
     }),
     {
       name: "nandani-cart-v3",
@@ -1,5 +1,6 @@
 import { create } from "zustand";
 import { persist } from "zustand/middleware";
+import { getProductsBatch } from "@/lib/api";
 
 interface WishlistState {
   wishlist: any[];
@@ -7,6 +8,7 @@ interface WishlistState {
   removeFromWishlist: (productId: number) => void;
   isInWishlist: (productId: number) => boolean;
   clearWishlist: () => void;
+  syncWithServer: () => Promise<void>;
 }
 
 export const useWishlistStore = create<WishlistState>()(
@@ -37,6 +39,18 @@ export const useWishlistStore = create<WishlistState>()(
 
       // पूरी विशलिस्ट खाली करना
       clearWishlist: () => set({ wishlist: [] }),
+
+      // ✅ Saved products ko ek batch request se taaza karo (price/stock), hataye gaye products nikaal do
+      syncWithServer: async () => {
+        const items = await getProductsBatch(get().wishlist.map((item: any) => item.id));
+        if (!items) return; // Network error: purana data hi rehne do
+        const fresh = new Map(items.map((i: any) => [i.id, i]));
+        set((state) => ({
+          wishlist: state.wishlist
+            .filter((item) => (fresh.get(item.id) as any)?.status === "ok")
+            .map((item) => ({ ...item, ...(fresh.get(item.id) as any).product })),
+        }));
+      },
     }),
     {
       name: "nandani-wishlist-v1", // यूनिक नाम ताकि कार्ट से न टकराए